@@ -12,7 +12,26 @@ class Config:
     APP_HEIGHT = 960
 
     API_BASE_URL = os.getenv("API_BASE_URL")
-    DB_PATH = os.path.join(os.path.dirname(__file__), "..", "storage", "data", "app_database.db")
+    # Everything the app keeps on the device lives under STORAGE_ROOT
+    STORAGE_ROOT = os.getenv("STORAGE_ROOT") or os.path.join(os.path.dirname(__file__), "..", "storage")
+    DB_PATH = os.path.join(STORAGE_ROOT, "data", "app_database.db")
+    # Copies of API responses kept between launches and revalidated with ETags
+    RESPONSE_CACHE_PATH = os.path.join(STORAGE_ROOT, "data", "response_cache.db")
+
+    # Saved detections, shown by the gallery and detection history
+    DETECTED_IMAGES_DIR = os.path.join(STORAGE_ROOT, "data", "images", "detected")
+    DETECTION_IMAGE_FORMAT = os.getenv("DETECTION_IMAGE_FORMAT", "jpeg").lower()  # "jpeg" or "webp"
+    DETECTION_IMAGE_QUALITY = int(os.getenv("DETECTION_IMAGE_QUALITY", 85))  # 1-100
+    DETECTION_MAX_DIMENSION = int(os.getenv("DETECTION_MAX_DIMENSION", 0))  # Longest side in pixels; 0 keeps the original size
+    DETECTION_STORE_ONLY_ANNOTATED = os.getenv("DETECTION_STORE_ONLY_ANNOTATED", "false").lower() == "true"  # Don't keep images without a crack
+
+    # On-device inference: images picked together are classified in batches of up to
+    # INFERENCE_MAX_BATCH, waiting at most INFERENCE_BATCH_WAIT_MS for a batch to fill
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 8))
+    INFERENCE_BATCH_WAIT_MS = float(os.getenv("INFERENCE_BATCH_WAIT_MS", 5))
+
+    # Seconds a bulk import waits for one batch of thumbnails to upload (generous for slow connections)
+    BULK_UPLOAD_TIMEOUT = float(os.getenv("BULK_UPLOAD_TIMEOUT", 120))
 
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
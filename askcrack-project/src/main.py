@@ -5,6 +5,7 @@ from views.auth.register_page import RegisterPage
 from views.auth.otp_page import OTPPage
 from views.auth.welcome_page import WelcomePage
 from views.auth.new_password_page import ForgotPasswordPage
+from services.api_client import response_cache
 
 def main(page: ft.Page):
     # """Main function to run the app"""
@@ -40,6 +41,7 @@ def main(page: ft.Page):
         elif page.route == "/logout":
             page.client_storage.remove("auth_token")
             page.client_storage.remove("user_info")
+            response_cache.clear()  # Stored responses belong to the signed-out user
             page.go("/login")
 
         else:
@@ -1,5 +1,29 @@
-from .api_client import get_request
+from utils.time_utils import human_time, parse_iso
+from .api_client import synced_get_request
+
+# Matches the server's feed length
+RECENT_ACTIVITY_LIMIT = 20
+
+def merge_activity(stored: dict, delta: dict) -> dict:
+    """Fold newly shared cracks into a stored activity feed."""
+    items = {item["crack_id"]: item for item in stored.get("activities", [])}
+    items.update({item["crack_id"]: item for item in delta.get("activities", [])})
+
+    activities = sorted(items.values(), key=lambda item: (parse_iso(item["detected_at"]), item["crack_id"]), reverse=True)
+    return {
+        **stored,
+        "activities": activities[:RECENT_ACTIVITY_LIMIT],
+        "overview": delta.get("overview", stored.get("overview")),
+        "server_time": delta["server_time"],
+    }
 
 async def fetch_recent_activity_service(user_id: int):
     """Fetch recent activity for a given user."""
-    return await get_request(f"/activities/{user_id}")
\ No newline at end of file
+    response = await synced_get_request(f"/activities/{user_id}", merge_activity)
+
+    # Stored items keep the age they had when fetched; recompute it
+    for item in response.get("activities", []):
+        if item.get("detected_at"):
+            item["time_ago"] = human_time(parse_iso(item["detected_at"]))
+
+    return response
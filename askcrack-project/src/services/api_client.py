@@ -1,14 +1,26 @@
 import httpx
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 from config import Config
+from .response_cache import ResponseCache
 
 # Base API URL
 api_url = Config.API_BASE_URL
 
+# Stored responses for cached_get_request / synced_get_request
+response_cache = ResponseCache(Config.RESPONSE_CACHE_PATH)
+
+def asset_url(path: str | None) -> str | None:
+    """Turn a server-relative asset path (e.g. "/blobs/<key>") into a full URL."""
+    if not path:
+        return None
+
+    return f"{api_url}{path}"
+
 async def post_request(
     endpoint: str,
     data: Dict[str, Any],
-    headers: Dict[str, str] = None
+    headers: Dict[str, str] = None,
+    timeout: float = 10
 ) -> Dict[str, Any]:
     """
     Reusable POST request helper with consistent error handling.
@@ -17,11 +29,12 @@ async def post_request(
         endpoint: API endpoint (e.g., "/otp/send-otp")
         data: JSON payload to send
         headers: Optional HTTP headers
+        timeout: Seconds to wait for the server (raise for large uploads)
     
     Returns:
         dict: Response JSON or error info
     """
-    async with httpx.AsyncClient(timeout=10) as client:
+    async with httpx.AsyncClient(timeout=timeout) as client:
         try:
             response = await client.post(f"{api_url}{endpoint}", json=data, headers=headers)
             response.raise_for_status()
@@ -71,3 +84,90 @@ async def get_request(
                 "success": False,
                 "error": f"Network error: {e}",
             }
+
+async def get_bytes(url: str) -> bytes | None:
+    """Download a file (e.g. an asset_url image). None if it could not be fetched."""
+    async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.content
+
+        except httpx.HTTPError as e:
+            print(f"Error downloading {url}: {e}")
+            return None
+
+async def _conditional_get(endpoint: str, etag: str | None, params: Dict[str, Any] = None):
+    """GET with If-None-Match. Returns the response, or an error dict like get_request."""
+    headers = {"If-None-Match": etag} if etag else None
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            response = await client.get(f"{api_url}{endpoint}", params=params, headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+
+        except httpx.HTTPStatusError as e:
+            return {
+                "success": False,
+                "status_code": e.response.status_code,
+                "error": e.response.text,
+            }
+
+        except httpx.RequestError as e:
+            return {
+                "success": False,
+                "error": f"Network error: {e}",
+            }
+
+async def cached_get_request(endpoint: str) -> Dict[str, Any]:
+    """
+    GET helper that keeps the last response and revalidates it with its
+    ETag, so an unchanged resource costs a bodyless 304. Falls back to the
+    stored copy when offline.
+    """
+    cached = response_cache.get(endpoint)
+    etag, stored = cached if cached else (None, None)
+
+    response = await _conditional_get(endpoint, etag)
+    if isinstance(response, dict):
+        return stored if stored is not None and "status_code" not in response else response
+
+    if response.status_code == 304 and stored is not None:
+        return stored
+
+    body = response.json()
+    response_cache.put(endpoint, response.headers.get("etag"), body)
+    return body
+
+async def synced_get_request(
+    endpoint: str,
+    merge: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    GET helper for endpoints that accept `since=`. Asks only for what changed
+    after the stored copy's server_time, folds it in with `merge(stored, delta)`
+    and stores the result. Falls back to the stored copy when offline.
+
+    Args:
+        endpoint: API endpoint (e.g., "/activities/1")
+        merge: Combines the stored payload with a delta ("full": False) response
+    """
+    cached = response_cache.get(endpoint)
+    etag, stored = cached if cached else (None, None)
+    params = {"since": stored["server_time"]} if stored and stored.get("server_time") else None
+
+    response = await _conditional_get(endpoint, etag, params)
+    if isinstance(response, dict):
+        return stored if stored is not None and "status_code" not in response else response
+
+    if response.status_code == 304 and stored is not None:
+        return stored
+
+    body = response.json()
+    merged = merge(stored, body) if stored is not None and body.get("full") is False else body
+
+    # Keep the delta's ETag: an unchanged resource returns the same delta next time, as a 304
+    response_cache.put(endpoint, response.headers.get("etag"), merged)
+    return merged
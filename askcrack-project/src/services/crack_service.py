@@ -1,22 +1,64 @@
-from .api_client import post_request
+from config import Config
+from utils.time_utils import parse_iso
+from .api_client import post_request, synced_get_request
 
-async def fetch_cracks_service(group_id: int):
-    """Service to fetch cracks for a specific group."""
-    payload = {"group_id": group_id}
+def merge_cracks(stored: dict, delta: dict) -> dict:
+    """Apply added and removed cracks to a stored first page, newest first."""
+    removed = set(delta.get("removed_ids", []))
+    cracks = {crack["id"]: crack for crack in stored.get("cracks", []) if crack["id"] not in removed}
+    cracks.update({crack["id"]: crack for crack in delta.get("cracks", [])})
+
+    ordered = sorted(cracks.values(), key=lambda crack: (parse_iso(crack["detected_at"]), crack["id"]), reverse=True)
+    # next_cursor still points past the oldest crack the first page was built from
+    return {**stored, "cracks": ordered, "server_time": delta["server_time"]}
+
+async def fetch_cracks_service(
+    group_id: int,
+    cursor: str = None,
+    limit: int = 30,
+    severity: str = None,
+    date_from: str = None,
+    date_to: str = None,
+):
+    """Service to fetch one page of cracks for a specific group (newest first)."""
+    payload = {
+        "group_id": group_id,
+        "cursor": cursor,
+        "limit": limit,
+        "severity": severity,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
     response = await post_request("/cracks/fetch-cracks", payload)
     return response
 
-async def add_crack_service(user_id: int, image_base64: str, probability: float, severity: str):
+async def sync_group_cracks_service(group_id: int):
+    """Service to fetch the first page of a group's cracks, only downloading what changed since the last visit."""
+    return await synced_get_request(f"/cracks/group/{group_id}", merge_cracks)
+
+async def add_crack_service(user_id: int, image_base64: str, probability: float, severity: str, annotations: dict = None):
     """Service to add a new crack."""
     payload = {
         "user_id": user_id,
         "image_base64": image_base64,
         "probability": probability,
         "severity": severity,
+        "annotations": annotations,
     }
     response = await post_request("/cracks/add-crack", payload)
     return response
 
+async def bulk_add_cracks_service(user_id: int, group_id: int, cracks: list):
+    """Service to add a batch of imported cracks to one group."""
+    payload = {
+        "user_id": user_id,
+        "group_id": group_id,
+        "cracks": cracks,
+    }
+    # A batch carries many thumbnails for the server to store, so it can outlast the usual 10s timeout
+    response = await post_request("/cracks/bulk-add", payload, timeout=Config.BULK_UPLOAD_TIMEOUT)
+    return response
+
 async def delete_crack_from_group_service(crack_id: int, group_id: int):
     """Service to delete a crack from a specific group."""
     payload = {
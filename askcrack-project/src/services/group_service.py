@@ -1,18 +1,41 @@
 import httpx
 from typing import List, Dict, Any
-from .api_client import get_request, post_request
+from .api_client import cached_get_request, post_request, synced_get_request
+
+def merge_user_groups(stored: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply changed and left groups to a stored group list."""
+    removed = set(delta.get("removed_ids", []))
+    groups = {group["id"]: group for group in stored.get("groups", []) if group["id"] not in removed}
+    groups.update({group["id"]: group for group in delta.get("groups", [])})
+
+    return {**stored, "groups": list(groups.values()), "server_time": delta["server_time"]}
 
 async def fetch_user_groups(user_id: int) -> Dict[str, List[Any]]:
     """Fetches groups the user is a member of from the API."""
-    return await get_request(f"/groups/user-groups/{user_id}")
+    return await synced_get_request(f"/groups/user-groups/{user_id}", merge_user_groups)
 
 async def fetch_groups(user_id: int) -> Dict[str, List[Any]]:
     """Fetches a list of groups from the API."""
     return await post_request("/groups/all", {"user_id": user_id})
 
+async def fetch_group_directory(
+    user_id: int,
+    query: str | None = None,
+    cursor: str | None = None,
+    limit: int = 30
+) -> Dict[str, Any]:
+    """Fetches one page of joinable groups, optionally filtered by name prefix."""
+    data = {
+        "user_id": user_id,
+        "query": query,
+        "cursor": cursor,
+        "limit": limit
+    }
+    return await post_request("/groups/directory", data)
+
 async def fetch_group_info(group_id: int) -> Dict[str, Any]:
     """Fetches detailed information about a specific group via the API."""
-    return await get_request(f"/groups/group-info/{group_id}")
+    return await cached_get_request(f"/groups/group-info/{group_id}")
 
 async def create_group(
     name: str,
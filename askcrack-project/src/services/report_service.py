@@ -0,0 +1,23 @@
+from typing import Any, Dict
+from .api_client import get_request, post_request
+
+async def request_report(
+    user_id: int,
+    scope: str = "user",
+    scope_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None
+) -> Dict[str, Any]:
+    """Queues an inspection report ("user" or "group" scope) via the API."""
+    data = {
+        "user_id": user_id,
+        "scope": scope,
+        "scope_id": scope_id,
+        "date_from": date_from,
+        "date_to": date_to
+    }
+    return await post_request("/reports/request", data)
+
+async def fetch_report(report_id: int) -> Dict[str, Any]:
+    """Fetches a report's status and progress from the API."""
+    return await get_request(f"/reports/{report_id}")
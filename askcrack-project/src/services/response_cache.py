@@ -0,0 +1,67 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    API responses stored in a small SQLite file, keyed by endpoint, with the
+    ETag they were served with. Survives app restarts. Any storage error is
+    treated as a cache miss so the app keeps working without it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "endpoint TEXT PRIMARY KEY, etag TEXT, body TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, endpoint: str) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        """Return (etag, body) for an endpoint, or None."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT etag, body FROM responses WHERE endpoint = ?", (endpoint,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print("Response cache read failed:", e)
+            return None
+
+        if row is None:
+            return None
+
+        return row[0], json.loads(row[1])
+
+    def put(self, endpoint: str, etag: Optional[str], body: Dict[str, Any]):
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (endpoint, etag, body, stored_at) VALUES (?, ?, ?, ?)",
+                    (endpoint, etag, json.dumps(body), time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            print("Response cache write failed:", e)
+
+    def clear(self):
+        """Drop every stored response (e.g. on logout)."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+        except sqlite3.Error as e:
+            print("Response cache clear failed:", e)
@@ -0,0 +1,136 @@
+"""
+Crack annotations stored as vector data next to each saved detection.
+
+A detection is the plain image plus a small JSON record with the same name
+(`<image>.json`): the probability, simplified crack outlines and bounding
+boxes in the saved image's pixels. Overlays are drawn when an image is shown,
+so the style can change without re-running detection. Images saved before
+annotations existed have the overlay burned in and no record; they are shown
+as they are.
+"""
+import base64
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ANNOTATION_VERSION = 1
+CONTOUR_TOLERANCE_PX = 2.0  # approxPolyDP tolerance; outlines stay within this many pixels of the original
+
+OUTLINE_COLOR = (200, 0, 0)
+BOX_COLOR = (100, 255, 100)
+
+
+def annotation_path(image_path) -> Path:
+    return Path(image_path).with_suffix(".json")
+
+def find_cracks(img, scale: float = 1.0) -> tuple[list, list]:
+    """
+    Crack outlines (simplified polylines) and bounding boxes in img's pixels.
+    scale is how much the photo was shrunk, so the filters match the original size.
+    """
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY_INV, max(3, int(99 * scale) | 1), 15
+    )
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=2)
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    # Same minimum crack size in the original image's pixels
+    valid_contours = [cnt for cnt in contours if cv2.contourArea(cnt) > 200 * scale * scale]
+
+    outlines = [cv2.approxPolyDP(cnt, CONTOUR_TOLERANCE_PX, True).reshape(-1, 2).tolist() for cnt in valid_contours]
+    boxes = [list(cv2.boundingRect(cnt)) for cnt in valid_contours]
+    return outlines, boxes
+
+def build_annotation(img, prob: float, threshold: float, scale: float = 1.0) -> dict:
+    """The annotation record for a detection; outlines are only traced when prob reaches the threshold."""
+    height, width = img.shape[:2]
+    outlines, boxes = find_cracks(img, scale) if prob >= threshold else ([], [])
+
+    return {
+        "version": ANNOTATION_VERSION,
+        "probability": round(prob, 4),
+        "threshold": threshold,
+        "width": width,
+        "height": height,
+        "contours": outlines,
+        "boxes": boxes,
+    }
+
+def save_annotation(image_path, record: dict):
+    with open(annotation_path(image_path), "w", encoding="utf-8") as f:
+        json.dump(record, f, separators=(",", ":"))
+
+def load_annotation(image_path) -> dict | None:
+    """The record saved with an image, or None for images without one."""
+    try:
+        with open(annotation_path(image_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def draw_annotation(img, record: dict, label: bool = True):
+    """Draw a record's outlines, boxes and (unless label is False) label onto img (any size; coordinates are scaled)."""
+    sx = img.shape[1] / record["width"]
+    sy = img.shape[0] / record["height"]
+    prob = record["probability"]
+
+    if prob >= record["threshold"]:
+        outlines = [np.round(np.array(outline, dtype=np.float32) * (sx, sy)).astype(np.int32) for outline in record["contours"] if outline]
+        cv2.polylines(img, outlines, True, OUTLINE_COLOR, 3)
+        for x, y, w, h in record["boxes"]:
+            cv2.rectangle(img, (round(x * sx), round(y * sy)), (round((x + w) * sx), round((y + h) * sy)), BOX_COLOR, 3)
+
+        text, color = f"Crack: {prob*100:.1f}%", (0, 0, 255) if prob > 0.8 else (0, 165, 255) if prob > 0.4 else (0, 255, 0)
+    else:
+        text, color = f"No Crack ({prob*100:.1f}%)", (0, 255, 0)
+
+    if label:
+        cv2.putText(img, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1.0, color, 2)
+    return img
+
+def render_annotated_base64(image_path, size=(1200, 1200), label: bool = True) -> str:
+    """A saved detection fitted within size with its annotations drawn on, as base64 JPEG ("" if unreadable)."""
+    try:
+        data = Path(image_path).read_bytes()
+    except OSError as e:
+        print(f"Error loading {image_path}: {e}")
+        return ""
+
+    return annotate_image_base64(data, load_annotation(image_path), size, label)
+
+def annotate_image_base64(data: bytes, record: dict | None, size=(1200, 1200), label: bool = True) -> str:
+    """Encoded image bytes fitted within size with record drawn on (if any), as base64 JPEG ("" if unreadable)."""
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        print("Error decoding image for annotation")
+        return ""
+
+    height, width = img.shape[:2]
+    scale = min(size[0] / width, size[1] / height, 1.0)
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+
+    if record:
+        try:
+            img = draw_annotation(img.copy(), record, label)
+        except (KeyError, TypeError, ValueError, ZeroDivisionError, cv2.error) as e:
+            print(f"Ignoring invalid annotation record: {e}")  # Show the plain image
+
+    success, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return base64.b64encode(encoded.tobytes()).decode() if success else ""
+
+def delete_detection(image_path):
+    """Delete a saved detection and its annotation record."""
+    Path(image_path).unlink(missing_ok=True)
+    annotation_path(image_path).unlink(missing_ok=True)
+
+def rename_detection(image_path, new_path):
+    """Rename a saved detection, keeping its annotation record with it."""
+    Path(image_path).rename(new_path)
+    if annotation_path(image_path).exists():
+        annotation_path(image_path).rename(annotation_path(new_path))
@@ -0,0 +1,118 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+
+class BatchScheduler:
+    """
+    Dynamic micro-batching on a background thread. submit() queues one item
+    and returns a Future. The worker takes the first queued item, waits up to
+    max_wait_ms for more (or until max_batch_size are queued), runs
+    run_batch(items) once for all of them and resolves each Future with its
+    own result. run_batch must return one result per item, in order.
+
+    max_wait_ms trades latency for throughput: 0 only batches what is already
+    queued, higher values wait for fuller batches.
+    """
+
+    WAIT_SAMPLES = 1000  # Recent queue waits kept for percentiles
+
+    def __init__(self, run_batch, max_batch_size: int = 8, max_wait_ms: float = 5):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._worker, name="batch-scheduler", daemon=True)
+        self._closed = False
+
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes = Counter()
+        self.waits = deque(maxlen=self.WAIT_SAMPLES)
+
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        """Queue one item. The Future resolves to its result, or raises the batch's error."""
+        if self._closed:
+            raise RuntimeError("BatchScheduler is closed")
+
+        future = Future()
+        self._queue.put((item, future, time.monotonic()))
+        return future
+
+    def map(self, items) -> list:
+        """Submit several items at once and wait for all of their results."""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Finish what is queued, then stop the worker."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+
+            if entry is None:  # close(): let the loop see it after this batch
+                self._queue.put(None)
+                break
+            batch.append(entry)
+
+        return batch
+
+    def _worker(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [entry for entry in self._collect(first) if entry[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                results = self.run_batch([item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.batch_sizes[len(batch)] += 1
+                self.waits.extend(started - queued_at for _, _, queued_at in batch)
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Batch size distribution and queue wait (ms) so far."""
+        with self._lock:
+            waits = sorted(self.waits)
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_ms": {
+                    "p50": round(waits[len(waits) // 2] * 1000, 3) if waits else 0.0,
+                    "p95": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else 0.0,
+                    "max": round(waits[-1] * 1000, 3) if waits else 0.0,
+                },
+            }
@@ -0,0 +1,265 @@
+"""
+Bulk import of historical inspection photos.
+
+Streams images from a folder tree or a ZIP (members are read one at a time,
+nothing is extracted), skips duplicates by content hash, classifies them on
+a pool of threads through the batched CrackClassifier and saves the results
+to the local detection history. Results are then uploaded to one group in
+batches. Progress is appended to a checkpoint file, so an interrupted import
+picks up where it stopped when run again.
+
+Run from askcrack-project/src:
+    python -m utils.bulk_import PATH_OR_ZIP --user-id 1 --group-id 2
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from PIL import Image
+
+from config import Config
+from services.crack_service import bulk_add_cracks_service
+from utils.annotations import load_annotation
+from utils.detect_image import CrackClassifier, severity_for
+from utils.image_utils import IMAGE_EXTENSIONS, image_to_base64
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL_PATH = os.path.join(SRC_DIR, "assets", "crackAI.tflite")
+CHECKPOINT_DIR = os.path.join(Config.STORAGE_ROOT, "data", "imports")
+
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_DATETIME = 306
+
+
+def iter_images(source: str):
+    """Yield (name, read, modified) for every image in a folder tree or ZIP, in a stable order."""
+    if os.path.isfile(source) and zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in IMAGE_EXTENSIONS:
+                    continue
+                yield info.filename, lambda info=info: archive.read(info), datetime(*info.date_time)
+        return
+
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for file_name in sorted(files):
+            if os.path.splitext(file_name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+
+            path = os.path.join(root, file_name)
+
+            def read(path=path):
+                with open(path, "rb") as f:
+                    return f.read()
+
+            yield os.path.relpath(path, source), read, datetime.fromtimestamp(os.path.getmtime(path))
+
+def taken_at(data: bytes, fallback: datetime) -> datetime:
+    """When the photo was taken, from its EXIF data, else the file's modification time."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            exif = img.getexif()
+            value = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+        return datetime.strptime(str(value).strip(), "%Y:%m:%d %H:%M:%S")
+    except (OSError, ValueError, TypeError):
+        return fallback
+
+def default_checkpoint_path(source: str, group_id) -> str:
+    name = os.path.basename(os.path.normpath(source)) or "import"
+    return os.path.join(CHECKPOINT_DIR, f"{name}.group-{group_id}.checkpoint.jsonl")
+
+
+class ImportCheckpoint:
+    """
+    Append-only JSON-lines log of what an import has done. Each image is
+    "classified" (saved locally), then "uploaded" with its crack ID, or
+    "failed" if it could not be read. A half-written last line from a
+    crash is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.classified = {}
+        self.uploaded = {}
+        self.failed = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    getattr(self, entry.pop("state"))[entry["hash"]] = entry
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def seen(self, content_hash: str) -> bool:
+        return content_hash in self.classified or content_hash in self.uploaded or content_hash in self.failed
+
+    def pending_uploads(self) -> list[dict]:
+        """Images classified by an earlier run but not uploaded yet."""
+        return [
+            entry for content_hash, entry in self.classified.items()
+            if content_hash not in self.uploaded and entry["saved_path"]
+        ]
+
+    def record(self, state: str, entry: dict):
+        getattr(self, state)[entry["hash"]] = entry
+        self._file.write(json.dumps({"state": state, **entry}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class BulkImporter:
+    def __init__(self, classifier: CrackClassifier, checkpoint: ImportCheckpoint, user_id: int = None,
+                 group_id: int = None, workers: int = 4, upload_batch: int = 20):
+        self.classifier = classifier
+        self.checkpoint = checkpoint
+        self.user_id = user_id
+        self.group_id = group_id
+        self.workers = workers
+        self.upload_batch = upload_batch
+        self.pending = checkpoint.pending_uploads()
+        self.uploads_stopped = False
+        self.counts = Counter()
+
+    def classify(self, content_hash: str, name: str, data: bytes, modified: datetime) -> dict:
+        """Runs on a worker thread: decode, predict (batched with the other workers) and save locally."""
+        prob = self.classifier.predict(self.classifier.preprocess(io.BytesIO(data)))
+        # The hash prefix keeps same-named photos from different folders apart
+        saved_path = self.classifier.analyze_and_save(
+            f"{content_hash[:12]}_{os.path.basename(name)}", confidence_threshold=0.5, prob=prob, image_data=data
+        )
+        return {
+            "hash": content_hash,
+            "name": name,
+            "probability": prob,
+            "severity": severity_for(prob),
+            "detected_at": taken_at(data, modified).isoformat(),
+            "saved_path": saved_path,
+        }
+
+    def collect(self, content_hash: str, name: str, future):
+        try:
+            entry = future.result()
+        except Exception as ex:
+            print(f"❌ Could not import {name}: {ex}")
+            self.checkpoint.record("failed", {"hash": content_hash, "name": name, "error": str(ex)})
+            self.counts["failed"] += 1
+            return
+
+        self.checkpoint.record("classified", entry)
+        self.counts["classified"] += 1
+        # DETECTION_STORE_ONLY_ANNOTATED leaves photos without a crack unsaved, so there is nothing to upload
+        if entry["saved_path"]:
+            self.pending.append(entry)
+        else:
+            self.counts["not_saved"] += 1
+
+    def upload(self, force: bool = False):
+        """Send classified images to the group in batches of upload_batch."""
+        if self.group_id is None or self.uploads_stopped:
+            return
+
+        while len(self.pending) >= self.upload_batch or (force and self.pending):
+            batch, self.pending = self.pending[:self.upload_batch], self.pending[self.upload_batch:]
+            cracks = [
+                {
+                    # 240px thumbnails, the same size a single add uploads
+                    "image_base64": image_to_base64(entry["saved_path"]),
+                    "probability": entry["probability"],
+                    "severity": entry["severity"],
+                    "detected_at": entry["detected_at"],
+                    "annotations": load_annotation(entry["saved_path"]),
+                }
+                for entry in batch
+            ]
+
+            response = asyncio.run(bulk_add_cracks_service(self.user_id, self.group_id, cracks))
+            if not response.get("success"):
+                # Stop uploading; these stay "classified" in the checkpoint and the next run retries them
+                print(f"❌ Upload failed: {response.get('message') or response.get('error')}")
+                self.pending = batch + self.pending
+                self.uploads_stopped = True
+                return
+
+            for entry, result in zip(batch, response["results"]):
+                if result["success"]:
+                    self.checkpoint.record("uploaded", {"hash": entry["hash"], "crack_id": result["crack_id"]})
+                    self.counts["duplicates" if result["duplicate"] else "uploaded"] += 1
+                else:
+                    self.checkpoint.record("failed", {"hash": entry["hash"], "name": entry["name"], "error": result["message"]})
+                    self.counts["failed"] += 1
+
+    def run(self, source: str) -> Counter:
+        queued = set()
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="import") as pool:
+            for name, read, modified in iter_images(source):
+                data = read()
+                content_hash = hashlib.sha256(data).hexdigest()
+                if self.checkpoint.seen(content_hash) or content_hash in queued:
+                    self.counts["skipped"] += 1
+                    continue
+
+                queued.add(content_hash)
+                in_flight.append((content_hash, name, pool.submit(self.classify, content_hash, name, data, modified)))
+
+                # Only a few images are held in memory at once
+                while len(in_flight) >= self.workers * 2:
+                    self.collect(*in_flight.popleft())
+                self.upload()
+
+            while in_flight:
+                self.collect(*in_flight.popleft())
+
+        self.upload(force=True)
+        if self.pending and self.group_id is not None:
+            self.counts["not_uploaded"] = len(self.pending)
+        return self.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a folder or ZIP of inspection photos.")
+    parser.add_argument("source", help="folder of images or a .zip archive")
+    parser.add_argument("--user-id", type=int, help="user the cracks are added for")
+    parser.add_argument("--group-id", type=int, help="group to upload the results to (omit to only save locally)")
+    parser.add_argument("--checkpoint", help="progress file (default: storage/data/imports/<source>.group-<id>.checkpoint.jsonl)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="TFLite model path")
+    parser.add_argument("--workers", type=int, default=4, help="images decoded and classified in parallel")
+    parser.add_argument("--upload-batch", type=int, default=20, help="cracks sent per upload request")
+    args = parser.parse_args()
+
+    if args.group_id is not None and args.user_id is None:
+        parser.error("--group-id needs --user-id")
+
+    checkpoint = ImportCheckpoint(args.checkpoint or default_checkpoint_path(args.source, args.group_id))
+    classifier = CrackClassifier(args.model)
+    importer = BulkImporter(classifier, checkpoint, args.user_id, args.group_id, args.workers, args.upload_batch)
+
+    try:
+        counts = importer.run(args.source)
+    finally:
+        classifier.scheduler.close()
+        checkpoint.close()
+
+    print(f"Import finished: {dict(counts)}")
+    print(f"Inference batches: {classifier.scheduler.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Headless crack detection, for servers and cron jobs.
+
+Runs CrackClassifier over files, folders and glob patterns and writes one
+result per image (JSON Lines or CSV) as soon as it is ready. Images are
+decoded on a pool of threads and predicted in shared batches.
+
+Run from askcrack-project/src (or use the askcrack-project/cracktify-detect wrapper):
+    python -m utils.detect_cli "site_a/**/*.jpg" photos/ --format csv -o results.csv
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.detect_image import CrackClassifier, severity_for
+from utils.image_utils import IMAGE_EXTENSIONS
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL_PATH = os.path.join(SRC_DIR, "assets", "crackAI.tflite")
+FIELDS = ["path", "probability", "severity", "crack", "output_path", "error"]
+
+
+def expand_inputs(inputs: list[str]):
+    """Yield each image path named by the inputs (files, folders searched recursively, or glob patterns) once."""
+    seen = set()
+
+    def walk(path):
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    if os.path.splitext(file_name)[1].lower() in IMAGE_EXTENSIONS:
+                        yield os.path.join(root, file_name)
+        elif os.path.isfile(path):
+            yield path
+
+    for pattern in inputs:
+        paths = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not paths:
+            print(f"No files match {pattern}", file=sys.stderr)
+
+        for path in paths:
+            for image_path in walk(path):
+                key = os.path.abspath(image_path)
+                if key not in seen:
+                    seen.add(key)
+                    yield image_path
+
+class ResultWriter:
+    """Writes results as JSON Lines or CSV, flushing each one so consumers can follow along."""
+
+    def __init__(self, stream, output_format: str):
+        self.stream = stream
+        self.csv = csv.DictWriter(stream, fieldnames=FIELDS) if output_format == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, result: dict):
+        if self.csv:
+            self.csv.writerow(result)
+        else:
+            self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
+
+
+def detect(classifier: CrackClassifier, image_path: str, threshold: float, save: bool) -> dict:
+    """Runs on a worker thread: predict (batched with the other workers) and optionally save the image and its annotations."""
+    result = {"path": image_path, "probability": None, "severity": None, "crack": None, "output_path": None, "error": None}
+    try:
+        prob = classifier.predict(classifier.preprocess(image_path))
+        result.update(probability=round(prob, 4), severity=severity_for(prob), crack=prob >= threshold)
+
+        if save:
+            # Folder names go into the file name so same-named images from different folders don't clash
+            name = os.path.relpath(image_path).replace(os.sep, "_")
+            result["output_path"] = classifier.analyze_and_save(name, confidence_threshold=threshold, prob=prob, image_data=read_file(image_path))
+    except Exception as ex:
+        result["error"] = str(ex)
+
+    return result
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def run(inputs, classifier: CrackClassifier, writer: ResultWriter, threshold: float, workers: int, save: bool) -> dict:
+    """Detect every input image, writing results in completion order. Returns counts."""
+    counts = {"images": 0, "cracks": 0, "errors": 0}
+    in_flight = set()
+
+    def drain(block_until: int):
+        nonlocal in_flight
+        while len(in_flight) > block_until:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                writer.write(result)
+                counts["images"] += 1
+                counts["errors"] += result["error"] is not None
+                counts["cracks"] += bool(result["crack"])
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detect") as pool:
+        for image_path in expand_inputs(inputs):
+            in_flight.add(pool.submit(detect, classifier, image_path, threshold, save))
+            drain(workers * 2)  # Bounded: paths are listed lazily, not all queued up front
+        drain(0)
+
+    return counts
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="cracktify-detect", description="Detect cracks in images without the app.")
+    parser.add_argument("inputs", nargs="+", help="image files, folders or glob patterns (quote ** patterns)")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="result format (default: jsonl)")
+    parser.add_argument("--output-dir", help="also save the images and their crack annotations (.json) here")
+    parser.add_argument("--threshold", type=float, default=0.5, help="probability counted as a crack (default: 0.5)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="images decoded and saved in parallel (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=None, help="threads the model uses per batch (default: runtime's choice)")
+    parser.add_argument("--max-batch", type=int, default=None, help="images per model call (default: INFERENCE_MAX_BATCH)")
+    parser.add_argument("--batch-wait-ms", type=float, default=None, help="how long a batch waits to fill (default: INFERENCE_BATCH_WAIT_MS)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="TFLite model path")
+    args = parser.parse_args(argv)
+
+    classifier = CrackClassifier(
+        args.model,
+        storage_dir=args.output_dir,
+        num_threads=args.threads,
+        max_batch_size=args.max_batch,
+        max_wait_ms=args.batch_wait_ms,
+    )
+
+    stream = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        # Progress prints from the classifier go to stderr so stdout only carries results
+        with contextlib.redirect_stdout(sys.stderr):
+            counts = run(args.inputs, classifier, ResultWriter(stream, args.format), args.threshold, args.workers, bool(args.output_dir))
+    finally:
+        classifier.scheduler.close()
+        if args.output:
+            stream.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{counts['images']} image(s), {counts['cracks']} crack(s), {counts['errors']} error(s) "
+        f"in {elapsed:.1f}s; batches: {classifier.scheduler.stats()['batch_sizes']}",
+        file=sys.stderr,
+    )
+    return 1 if counts["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,75 @@
-import tensorflow as tf
 import numpy as np
 from PIL import Image
+import io
 import os
 import cv2
-import sys
 from datetime import datetime
 
-from services.crack_service import add_crack_service
+from config import Config
+from utils.annotations import build_annotation, save_annotation
+from utils.batch_scheduler import BatchScheduler
+
+def severity_for(probability: float) -> str:
+    """Severity label the app and server use for a crack probability."""
+    return "Severe" if probability > 0.7 else "Mild" if probability > 0.4 else "None"
+
+def load_interpreter(model_path: str, num_threads: int = None):
+    """TFLite interpreter from TensorFlow, or the standalone LiteRT / tflite-runtime on machines without it."""
+    try:
+        import tensorflow as tf
+        return tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+    except ImportError:
+        pass
+
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError as e:
+            raise RuntimeError("tensorflow, ai-edge-litert or tflite-runtime is required to run the model") from e
+
+    return Interpreter(model_path=model_path, num_threads=num_threads)
+
+# Saved detection formats: file extension and the OpenCV quality flag
+IMAGE_FORMATS = {
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+}
 
 class CrackClassifier:
-    def __init__(self, model_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        storage_dir: str = None,
+        num_threads: int = None,
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
+    ):
         """
         Constructor: loads the TFLite model ONCE.
+        storage_dir is where analyze_and_save writes (default: the app's
+        detection history); the rest default to Config. How saved images
+        are encoded comes from the DETECTION_* settings.
         """
-        self.interpreter = tf.lite.Interpreter(model_path=model_path)
+        if Config.DETECTION_IMAGE_FORMAT not in IMAGE_FORMATS:
+            raise ValueError(f"DETECTION_IMAGE_FORMAT must be one of {', '.join(IMAGE_FORMATS)}")
+
+        self.interpreter = load_interpreter(model_path, num_threads)
         self.interpreter.allocate_tensors()
+        self.storage_dir = storage_dir or Config.DETECTED_IMAGES_DIR
 
         self.input_details  = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self.batch_size = 1
+        self.batchable = True
+
+        # predict() calls from any thread are queued and run through the model together
+        self.scheduler = BatchScheduler(
+            self.predict_batch,
+            max_batch_size=max_batch_size or Config.INFERENCE_MAX_BATCH,
+            max_wait_ms=Config.INFERENCE_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms,
+        )
 
     # ---------- PREPROCESS FUNCTIONS ----------
     def _mobilenet_standard_scaling(self, image_array_rgb):
@@ -32,71 +84,91 @@ class CrackClassifier:
         img_array = np.array(img)
         return self._mobilenet_standard_scaling(img_array)
 
-    # ---------- PREDICT FUNCTION ----------
-    def predict(self, image_path: str) -> float:
-        """
-        Returns a probability value between 0 and 1.
-        """
-        # Preprocess image
-        img = self._preprocess_image(image_path)
-        img = np.expand_dims(img, axis=0)
-
-        # Run inference
-        self.interpreter.set_tensor(self.input_details[0]['index'], img)
+    # ---------- PREDICT FUNCTIONS ----------
+    def _resize_batch(self, batch_size: int) -> bool:
+        """Resize the input tensor to batch_size images. False if the model only takes one."""
+        if batch_size == self.batch_size:
+            return True
+
+        index = self.input_details[0]['index']
+        try:
+            self.interpreter.resize_tensor_input(index, [batch_size, 128, 128, 3])
+            self.interpreter.allocate_tensors()
+        except (ValueError, RuntimeError) as ex:
+            print(f"Model does not accept batches, predicting one image at a time: {ex}")
+            self.batchable = False
+            self.interpreter.resize_tensor_input(index, [1, 128, 128, 3])
+            self.interpreter.allocate_tensors()
+            self.batch_size = 1
+            return False
+
+        self.batch_size = batch_size
+        return True
+
+    def _invoke(self, batch):
+        self.interpreter.set_tensor(self.input_details[0]['index'], batch)
         self.interpreter.invoke()
-
         output = self.interpreter.get_tensor(self.output_details[0]['index'])
-        probability = float(output[0][0])  # assuming sigmoid output
+        return [float(p) for p in output[:, 0]]  # assuming sigmoid output
 
-        return probability
-            
-    def analyze_and_save(self, image_path: str, confidence_threshold: float = 0.4) -> str:
+    def preprocess(self, image) -> np.ndarray:
         """
-        Analyzes image, draws crack contours if confidence > threshold,
-        and saves with confidence in filename for proper history display.
+        Model input for a path or open file. Passing the result to predict()
+        lets callers preprocess on their own threads.
         """
-        prob = self.predict(image_path)  # 0.0 to 1.0
+        return self._preprocess_image(image)
 
-        # === Determine storage path (same as before) ===
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-            storage_path = os.path.join(base_path, "storage", "data", "images", "detected")
-        else:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            src_dir = os.path.dirname(os.path.dirname(current_dir))
-            storage_path = os.path.join(src_dir, "storage", "data", "images", "detected")
+    def predict_batch(self, image_paths: list) -> list[float]:
+        """
+        Runs several images (paths, open files or preprocess() results)
+        through the model in one invoke and returns their probabilities in
+        order. Batches are padded to a power of two so the interpreter only
+        reallocates for a few shapes.
+        """
+        images = np.stack([
+            image if isinstance(image, np.ndarray) else self._preprocess_image(image)
+            for image in image_paths
+        ])
+        count = len(images)
+        padded = 1 << (count - 1).bit_length()
 
-        os.makedirs(storage_path, exist_ok=True)
+        if self.batchable and self._resize_batch(padded):
+            batch = np.zeros((padded, *images.shape[1:]), dtype=np.float32)
+            batch[:count] = images
+            return self._invoke(batch)[:count]
 
-        # === Generate clean, parseable filename ===
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        original_name = os.path.splitext(os.path.basename(image_path))[0]
-        
-        # Clean filename (remove special chars that might break parsing)
-        safe_name = "".join(c for c in original_name if c.isalnum() or c in " _-")
+        return [self._invoke(image[np.newaxis])[0] for image in images]
 
-        # NEW: Always include confidence in filename → _conf_0.87
-        confidence_str = f"{prob:.4f}"
-        save_filename = f"{timestamp}_{safe_name}_conf_{confidence_str}.jpg"
-        save_path = os.path.join(storage_path, save_filename)
+    def predict(self, image_path: str) -> float:
+        """
+        Returns a probability value between 0 and 1.
+        """
+        return self.scheduler.submit(image_path).result()
 
-        # Load image once
-    def analyze_and_save(self, image_path: str, confidence_threshold: float = 0.4) -> str:
+    def predict_many(self, image_paths: list[str]) -> list[float]:
         """
-        Analyzes image, draws crack contours if confidence > threshold,
-        and saves with confidence in filename for proper history display.
+        Probabilities for several images, batched together.
         """
-        prob = self.predict(image_path)  # 0.0 to 1.0
+        return self.scheduler.map(image_paths)
 
-        # === Determine storage path (same as before) ===
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-            storage_path = os.path.join(base_path, "storage", "data", "images", "detected")
-        else:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            src_dir = os.path.dirname(os.path.dirname(current_dir))
-            storage_path = os.path.join(src_dir, "storage", "data", "images", "detected")
+    def analyze_and_save(self, image_path: str, confidence_threshold: float = 0.4, prob: float = None, image_data: bytes = None) -> str:
+        """
+        Analyzes image, traces crack contours if confidence > threshold,
+        and saves the plain image (confidence in filename for proper history
+        display) with its annotation record beside it. Returns None if
+        DETECTION_STORE_ONLY_ANNOTATED skipped it. Pass prob if the image was
+        already predicted, and image_data to read the image from memory
+        (image_path then only names the saved file).
+        """
+        if prob is None:
+            prob = self.predict(io.BytesIO(image_data) if image_data is not None else image_path)  # 0.0 to 1.0
 
+        # Low-storage mode keeps only detections that get annotated
+        if Config.DETECTION_STORE_ONLY_ANNOTATED and prob < confidence_threshold:
+            print(f"Image not saved (no crack): {os.path.basename(image_path)} | Confidence: {prob:.4f}")
+            return None
+
+        storage_path = self.storage_dir
         os.makedirs(storage_path, exist_ok=True)
 
         # === Generate clean, parseable filename ===
@@ -108,61 +180,35 @@ class CrackClassifier:
 
         # NEW: Always include confidence in filename → _conf_0.87
         confidence_str = f"{prob:.4f}"
-        save_filename = f"{timestamp}_{safe_name}_conf_{confidence_str}.jpg"
+        extension, quality_flag = IMAGE_FORMATS[Config.DETECTION_IMAGE_FORMAT]
+        save_filename = f"{timestamp}_{safe_name}_conf_{confidence_str}{extension}"
         save_path = os.path.join(storage_path, save_filename)
 
         # Load image once
-        img = cv2.imread(image_path)
+        if image_data is not None:
+            img = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            img = cv2.imread(image_path)
         if img is None:
             raise RuntimeError(f"Failed to load image: {image_path}")
 
-        output = img.copy()
-
-        # === Only draw contours if confidence is meaningful ===
-        if prob >= confidence_threshold:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            binary = cv2.adaptiveThreshold(
-                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY_INV, 99, 15
-            )
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3,3))
-            binary = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, iterations=2)
-            contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-
-            valid_contours = [cnt for cnt in contours if cv2.contourArea(cnt) > 200]
-
-            # Draw red contours + green bounding boxes
-            cv2.drawContours(output, valid_contours, -1, (200, 0, 0), 3)  # Red outline
-            for cnt in valid_contours:
-                x, y, w, h = cv2.boundingRect(cnt)
-                cv2.rectangle(output, (x, y), (x + w, y + h), (100, 255, 100), 3)
-
-            # Optional: Add confidence text on image
-            cv2.putText(
-                output,
-                f"Crack: {prob*100:.1f}%",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 0, 255) if prob > 0.8 else (0, 165, 255) if prob > 0.4 else (0, 255, 0),
-                2
-            )
-        else:
-            # Low confidence → just show "No Crack" text
-            cv2.putText(
-                output,
-                f"No Crack ({prob*100:.1f}%)",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1.0,
-                (0, 255, 0),
-                2
-            )
+        # Downscale first so contour detection and encoding work on fewer pixels
+        scale = 1.0
+        height, width = img.shape[:2]
+        if Config.DETECTION_MAX_DIMENSION and max(height, width) > Config.DETECTION_MAX_DIMENSION:
+            scale = Config.DETECTION_MAX_DIMENSION / max(height, width)
+            img = cv2.resize(img, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+
+        # Crack outlines go in a JSON record next to the image; overlays are drawn when it is shown
+        record = build_annotation(img, prob, confidence_threshold, scale)
 
         # === Save final image ===
-        success = cv2.imwrite(save_path, output)
+        success, encoded = cv2.imencode(extension, img, [quality_flag, Config.DETECTION_IMAGE_QUALITY])
         if not success:
             raise RuntimeError(f"Failed to save image to {save_path}")
+        with open(save_path, "wb") as f:
+            f.write(encoded.tobytes())
+        save_annotation(save_path, record)
 
         print(f"Image saved: {save_filename} | Confidence: {prob:.4f}")
         return save_path
\ No newline at end of file
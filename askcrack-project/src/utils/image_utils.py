@@ -3,6 +3,9 @@ import io
 import base64
 from PIL import Image
 
+# File types the detection tools pick up from folders
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff"}
+
 def image_to_base64(file_path: Path, size=(240, 240)) -> str:
     try:
         img = Image.open(file_path)
@@ -13,8 +13,9 @@ from .pages import (
 )
 from utils.toggle_theme import toggle_theme
 from utils.image_utils import image_to_base64
+from utils.annotations import load_annotation
 from services.crack_service import add_crack_service
-from utils.detect_image import CrackClassifier
+from utils.detect_image import CrackClassifier, severity_for
 
 class MainPage(TemplatePage):
     """Main application page after login, with navigation and content areas."""
@@ -388,29 +389,31 @@ class MainPage(TemplatePage):
                 
                 print(f"Processing {total_files} image(s)...")
                 
-                model_path = self.get_model_path()
-                classifier = CrackClassifier(model_path)
-                
+                classifier = self.get_classifier()
+
+                # Classify every picked image in batches, then save each one
+                probabilities = classifier.predict_many([file.path for file in e.files])
+                print(f"Inference batches: {classifier.scheduler.stats()}")
+
                 # Process each file
-                for idx, file in enumerate(e.files, 1):
+                for idx, (file, prob) in enumerate(zip(e.files, probabilities), 1):
                     file_path = file.path
                     print(f"\n[{idx}/{total_files}] Processing: {os.path.basename(file_path)}")
-                    
-                    prob = classifier.predict(file_path)
                     print(f"Prediction probability: {prob}")
                     
                     # Save image (crack or no crack)
-                    saved_path = classifier.analyze_and_save(file_path, confidence_threshold=0.5)
+                    saved_path = classifier.analyze_and_save(file_path, confidence_threshold=0.5, prob=prob)
                     
+                    if prob > 0.5:
+                        crack_count += 1
+                        print("🔴 Crack detected!")
+                    else:
+                        no_crack_count += 1
+                        print("🟢 No crack detected.")
+
+                    # Not saved when DETECTION_STORE_ONLY_ANNOTATED skips images without a crack
                     if saved_path:
                         print(f"Saved to: {saved_path}")
-                        
-                        if prob > 0.5:
-                            crack_count += 1
-                            print("🔴 Crack detected!")
-                        else:
-                            no_crack_count += 1
-                            print("🟢 No crack detected.")
 
                         self.last_saved_path = saved_path  # Save last processed path
                         self.prob = prob  # Save last predicted probability
@@ -462,13 +465,14 @@ class MainPage(TemplatePage):
             user_id = user_info.get("id")
             image_base64 = image_to_base64(self.last_saved_path)
             probability = self.prob # Use the predicted probability
-            severity = "Severe" if self.prob > 0.7 else "Mild" if self.prob > 0.4 else "None"
+            severity = severity_for(self.prob)
 
             response = await add_crack_service(
                 user_id=user_id,
                 image_base64=image_base64,
                 probability=probability,
-                severity=severity
+                severity=severity,
+                annotations=load_annotation(self.last_saved_path)
             )
 
             if response.get("success"):
@@ -491,6 +495,12 @@ class MainPage(TemplatePage):
             traceback.print_exc()
 
 
+    def get_classifier(self) -> CrackClassifier:
+        """Load the model on first use and keep it for later detections"""
+        if getattr(self, "classifier", None) is None:
+            self.classifier = CrackClassifier(self.get_model_path())
+        return self.classifier
+
     def get_model_path(self):
         """Get model path that works in dev and ALL production builds (mobile + desktop)"""
         import sys
@@ -9,11 +9,13 @@ import re
 
 from services.crack_service import *
 
-from utils.image_utils import image_to_base64
+from config import Config
+from utils.annotations import delete_detection, render_annotated_base64
+from utils.image_utils import IMAGE_EXTENSIONS
 from widgets.inputs import AppTextField, CustomDropdown
 
 class DetectionHistoryPage:
-    IMAGES_FOLDER = Path(__file__).parent.parent.parent.parent / "storage" / "data" / "images" / "detected"
+    IMAGES_FOLDER = Path(Config.DETECTED_IMAGES_DIR)
 
     def __init__(self, page: ft.Page):
         self.page = page
@@ -63,7 +65,7 @@ class DetectionHistoryPage:
         if self.cached_files is None:
             self.cached_files = [
                 f for f in self.IMAGES_FOLDER.iterdir()
-                if f.suffix.lower() in {".png", ".jpg", ".jpeg", ".bmp"}
+                if f.suffix.lower() in IMAGE_EXTENSIONS
             ]
 
         self.cached_files = [f for f in self.cached_files if f.exists()]
@@ -92,7 +94,7 @@ class DetectionHistoryPage:
         else:
             for f in files:
                 if f not in self.cached_thumbs:
-                    self.cached_thumbs[f] = image_to_base64(f, (80, 80))
+                    self.cached_thumbs[f] = render_annotated_base64(f, (80, 80), label=False)
 
                 thumb = self.cached_thumbs[f]
                 file_name = f.name
@@ -214,7 +216,7 @@ class DetectionHistoryPage:
             return "Severe Crack", ft.Colors.RED_600
     def show_full_image(self, file_path: Path):
         """Show full detected image with crack outlines in overlay"""
-        base64_img = image_to_base64(file_path, (1200, 1200))
+        base64_img = render_annotated_base64(file_path, (1200, 1200))
 
         full_container = ft.Container(
             width=650,
@@ -280,8 +282,7 @@ class DetectionHistoryPage:
         
         self.page.close(dlg)
         try:
-            if file_path.exists():
-                file_path.unlink()
+            delete_detection(file_path)
             
             # ✅ Force full refresh (rescan folder)
             self.refresh()
@@ -312,7 +313,7 @@ class DetectionHistoryPage:
         if self.cached_files:
             for f in self.cached_files:
                 try:
-                    f.unlink()
+                    delete_detection(f)
                 except Exception as ex:
                     print(f"Error deleting {f}: {ex}")
         
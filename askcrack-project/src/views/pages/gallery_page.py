@@ -5,11 +5,13 @@ import flet as ft
 from typing import List
 import os
 
-from utils.image_utils import image_to_base64
+from config import Config
+from utils.annotations import delete_detection, rename_detection, render_annotated_base64
+from utils.image_utils import IMAGE_EXTENSIONS
 from widgets.inputs import AppTextField, CustomDropdown
 
 class ImageGallery:
-    IMAGES_FOLDER = Path(__file__).parent.parent.parent.parent / "storage" / "data" / "images" / "detected"
+    IMAGES_FOLDER = Path(Config.DETECTED_IMAGES_DIR)
 
     SIZE_MAP = {
         "Small": 100,
@@ -121,7 +123,7 @@ class ImageGallery:
         if self.cached_files is None:
             self.cached_files = [
                 f for f in self.IMAGES_FOLDER.iterdir()
-                if f.suffix.lower() in {".png", ".jpg", ".jpeg", ".bmp"}
+                if f.suffix.lower() in IMAGE_EXTENSIONS
             ]
         
         # ✅ Filter out files that no longer exist (in case they were deleted)
@@ -139,7 +141,7 @@ class ImageGallery:
             for f in files:
                 # Thumbnail caching (FAST)
                 if f not in self.cached_thumbs:
-                    self.cached_thumbs[f] = image_to_base64(f, (140, 140))
+                    self.cached_thumbs[f] = render_annotated_base64(f, (140, 140), label=False)
 
                 thumb = self.cached_thumbs[f]
                 self.gallery_grid.controls.append(self.build_tile_thumb(f, thumb))
@@ -175,7 +177,7 @@ class ImageGallery:
     # Full Image
     def show_full(self, file_path: Path):
         """ Show full image in overlay with zoom and pan. """
-        base64_img = image_to_base64(file_path, (1200, 1200))
+        base64_img = render_annotated_base64(file_path, (1200, 1200))
 
         full_container = ft.Container(
             width=650,
@@ -223,7 +225,7 @@ class ImageGallery:
         if not hasattr(self, "cached_files"):
             self.cached_files = [
                 f for f in self.IMAGES_FOLDER.iterdir()
-                if f.suffix.lower() in {".png", ".jpg", ".jpeg", ".bmp"}
+                if f.suffix.lower() in IMAGE_EXTENSIONS
             ]
 
         # Filter
@@ -245,7 +247,7 @@ class ImageGallery:
 
             # Build tiles inline
             for f in filtered_files:
-                thumb = image_to_base64(f, (140, 140))
+                thumb = render_annotated_base64(f, (140, 140), label=False)
                 tile = ft.Container(
                     border_radius=10,
                     padding=10,
@@ -321,7 +323,7 @@ class ImageGallery:
         self.page.close(sheet)
         self.page.close(dlg)
         try:
-            file_path.unlink()
+            delete_detection(file_path)
             self.cached_files = None
             self.cached_thumbs.pop(file_path, None)
             self.load_images()
@@ -365,7 +367,7 @@ class ImageGallery:
 
         new_file = file_path.parent / (new_name + file_path.suffix)
         try:
-            file_path.rename(new_file)
+            rename_detection(file_path, new_file)
             # Update cache: remove old file, add new
             if self.cached_files:
                 try:
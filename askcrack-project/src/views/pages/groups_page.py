@@ -5,15 +5,21 @@ from pathlib import Path
 
 from services.group_service import (
     fetch_user_groups,
-    fetch_groups,
+    fetch_group_directory,
     fetch_group_info,
     create_group,
     join_group,
     edit_member,
     remove_member
 )
-from services.crack_service import delete_crack_from_group_service, fetch_cracks_service
+from services.crack_service import (
+    delete_crack_from_group_service,
+    fetch_cracks_service,
+    sync_group_cracks_service,
+)
+from services.api_client import asset_url, get_bytes
 from widgets.inputs import AppTextField
+from utils.annotations import annotate_image_base64
 from utils.image_utils import image_to_base64, base64_to_image
 
 
@@ -29,6 +35,19 @@ class GroupsPage:
         self.cached_joinable_groups = []
 
         self.current_group_id: int | None = None
+        self.current_group_admin: int | None = None
+
+        # Crack image paging (Images tab)
+        self.crack_cursor: str | None = None
+        self.crack_has_more = False
+        self.loading_cracks = False
+        self.crack_grid: ft.GridView | None = None
+
+        # Joinable groups directory paging (Join view)
+        self.joinable_query = ""
+        self.joinable_cursor: str | None = None
+        self.joinable_has_more = False
+        self.loading_joinable = False
 
     def build(self) -> List[ft.Control]:
         """Build the Groups Page UI"""
@@ -79,6 +98,8 @@ class GroupsPage:
             controls=[self.content_container],
             spacing=10,
             expand=True,
+            on_scroll_interval=100,
+            on_scroll=self._on_list_scroll,
         )
 
         # Load user groups
@@ -99,11 +120,9 @@ class GroupsPage:
     def filter_content(self, query: str):
         query_lower = query.lower()
         if self.current_view == "join_groups":
-            filtered_joinable = [
-                g for g in self.cached_joinable_groups.get("groups", [])
-                if query_lower in g["name"].lower() or query_lower in g.get("description", "").lower()
-            ]
-            self._render_joinable_groups_list({"groups": filtered_joinable}, search_mode=True)
+            # The directory is searched server-side, page by page
+            self.joinable_query = query.strip()
+            self.page.run_task(self.load_joinable_groups)
             return
      
         filtered_user = [
@@ -218,43 +237,45 @@ class GroupsPage:
             return
 
         for g in joinable_data.get("groups", []):
-            gid = g["id"]
-            group_name = g["name"]
-            members_count = len(g.get("members", []))
+            self.content_container.controls.append(self._build_joinable_group_tile(g))
 
-            def join_with_pin(e, group_id=gid, group_name=group_name):
-                self.pin_input = AppTextField(label="Enter PIN", password=True, keyboard_type=ft.KeyboardType.NUMBER, on_change=lambda e: self.pin_input.clear_error())
-                
-                self.join_dialog = ft.AlertDialog(
-                    modal=True,
-                    shape=ft.RoundedRectangleBorder(radius=18),
-                    inset_padding=ft.padding.all(20),
-                    title=ft.Text(group_name, size=18, weight=ft.FontWeight.BOLD),
-                    content=self.pin_input,
-                    actions=[
-                        ft.TextButton("Cancel", on_click=lambda e: self.page.close(self.join_dialog)),
-                        ft.TextButton(
-                            "Join",
-                            on_click=self.get_joining_pin,
-                            data={"group_id": group_id, "pin_input": self.pin_input}
-
-                        )
-                    ]
-                )
-                self.page.open(self.join_dialog)
+        self.page.update()
 
-            tile = ft.ListTile(
-                title=ft.Text(g["name"], size=18, weight="bold"),
-                subtitle=ft.Text(f"👥 Members: {members_count}"),
-                trailing=ft.ElevatedButton("Join", width=80, on_click=join_with_pin),
-                content_padding=ft.padding.symmetric(vertical=10, horizontal=20),
-                shape=ft.RoundedRectangleBorder(radius=20),
-                bgcolor=ft.Colors.ON_INVERSE_SURFACE,
-            )
+    def _build_joinable_group_tile(self, g: dict) -> ft.Control:
+        """Build the list tile for one joinable group."""
+        gid = g["id"]
+        group_name = g["name"]
+        members_count = g.get("member_count", 0)
 
-            self.content_container.controls.append(tile)
+        def join_with_pin(e, group_id=gid, group_name=group_name):
+            self.pin_input = AppTextField(label="Enter PIN", password=True, keyboard_type=ft.KeyboardType.NUMBER, on_change=lambda e: self.pin_input.clear_error())
+            
+            self.join_dialog = ft.AlertDialog(
+                modal=True,
+                shape=ft.RoundedRectangleBorder(radius=18),
+                inset_padding=ft.padding.all(20),
+                title=ft.Text(group_name, size=18, weight=ft.FontWeight.BOLD),
+                content=self.pin_input,
+                actions=[
+                    ft.TextButton("Cancel", on_click=lambda e: self.page.close(self.join_dialog)),
+                    ft.TextButton(
+                        "Join",
+                        on_click=self.get_joining_pin,
+                        data={"group_id": group_id, "pin_input": self.pin_input}
 
-        self.page.update()
+                    )
+                ]
+            )
+            self.page.open(self.join_dialog)
+
+        return ft.ListTile(
+            title=ft.Text(g["name"], size=18, weight="bold"),
+            subtitle=ft.Text(f"👥 Members: {members_count}"),
+            trailing=ft.ElevatedButton("Join", width=80, on_click=join_with_pin),
+            content_padding=ft.padding.symmetric(vertical=10, horizontal=20),
+            shape=ft.RoundedRectangleBorder(radius=20),
+            bgcolor=ft.Colors.ON_INVERSE_SURFACE,
+        )
 
     def get_joining_pin(self, e):
         """Join a group using PIN from dialog input"""
@@ -303,6 +324,7 @@ class GroupsPage:
     def show_join_groups_view(self, e=None):
         """Show the view for joining new groups"""
         self.current_view = "join_groups"
+        self.joinable_query = ""
         self.content_container.controls.clear()
         back_button = ft.TextButton(
             "← Back to My Groups",
@@ -312,13 +334,47 @@ class GroupsPage:
         self.page.run_task(self.load_joinable_groups)
 
     async def load_joinable_groups(self):
-        """Load and display joinable groups"""
+        """Load and display the first page of joinable groups for the current search"""
+        query = self.joinable_query
         try:
-            self.cached_joinable_groups = await fetch_groups(self.user_id)
-            self._render_joinable_groups_list(self.cached_joinable_groups)
+            response = await fetch_group_directory(self.user_id, query=query or None)
+            if query != self.joinable_query or self.current_view != "join_groups":
+                return  # The search changed while this page was loading
+
+            self.cached_joinable_groups = response.get("groups", []) if response else []
+            self.joinable_cursor = response.get("next_cursor") if response else None
+            self.joinable_has_more = bool(self.joinable_cursor)
+
+            self._render_joinable_groups_list({"groups": self.cached_joinable_groups}, search_mode=bool(query))
         except Exception as ex:
             print("Error loading joinable groups:", ex)
 
+    async def load_more_joinable_groups(self):
+        """Fetch the next page of joinable groups and append it to the list"""
+        if self.loading_joinable or not self.joinable_has_more:
+            return
+
+        self.loading_joinable = True
+        query = self.joinable_query
+        try:
+            response = await fetch_group_directory(self.user_id, query=query or None, cursor=self.joinable_cursor)
+            if query != self.joinable_query or self.current_view != "join_groups":
+                return
+
+            groups = response.get("groups", []) if response else []
+            self.joinable_cursor = response.get("next_cursor") if response else None
+            self.joinable_has_more = bool(self.joinable_cursor)
+
+            self.cached_joinable_groups.extend(groups)
+            for g in groups:
+                self.content_container.controls.append(self._build_joinable_group_tile(g))
+
+            self.page.update()
+        except Exception as ex:
+            print("Error loading joinable groups:", ex)
+        finally:
+            self.loading_joinable = False
+
     def show_create_group_dialog(self, e):
         """Show dialog to create a new group with Name and PIN only"""
         self.group_name_input = AppTextField(
@@ -382,6 +438,8 @@ class GroupsPage:
         members = group_info.get("members", [])
         admin_id = group_info.get("admin_id")
         current_user_is_admin = (self.user_id == admin_id)
+        self.current_group_admin = admin_id
+        self.current_view = "group_members"
 
         # Hide top buttons, show navbar
         self.action_buttons.visible = False
@@ -504,89 +562,185 @@ class GroupsPage:
             self.page.update()
 
     async def view_group_images(self):
-        """View crack images for the current group."""
+        """View crack images for the current group, one page at a time."""
+        self.current_view = "group_images"
+        self.crack_cursor = None
+        self.crack_has_more = True
+        self.loading_cracks = False
 
-        response = await fetch_cracks_service(self.current_group_id)
-        cracks = response.get("cracks") if response else []
+        self.crack_grid = ft.GridView(
+            expand=True,
+            runs_count=3,
+            max_extent=200,
+            spacing=10,
+            run_spacing=10,
+            on_scroll_interval=100,
+            on_scroll=self._on_list_scroll,
+        )
 
         self.content_container.controls.clear()
+        self.content_container.controls.append(self.crack_grid)
 
-        if not cracks:
-            self.content_container.controls.append(
-                ft.Container(
-                    content=ft.Text("No cracks detected yet.", size=20),
-                    alignment=ft.alignment.center,
-                    expand=True
+        await self.load_more_cracks()
+
+    async def load_more_cracks(self):
+        """Fetch the next page of cracks and append it to the grid."""
+        if self.loading_cracks or not self.crack_has_more:
+            return
+
+        self.loading_cracks = True
+        try:
+            if self.crack_cursor is None:
+                # First page comes from the stored copy plus whatever changed since
+                response = await sync_group_cracks_service(self.current_group_id)
+            else:
+                response = await fetch_cracks_service(self.current_group_id, cursor=self.crack_cursor)
+            cracks = response.get("cracks") if response else []
+
+            self.crack_cursor = response.get("next_cursor") if response else None
+            self.crack_has_more = bool(self.crack_cursor)
+
+            if not cracks and not self.crack_grid.controls:
+                self.content_container.controls.clear()
+                self.content_container.controls.append(
+                    ft.Container(
+                        content=ft.Text("No cracks detected yet.", size=20),
+                        alignment=ft.alignment.center,
+                        expand=True
+                    )
                 )
-            )
+                self.page.update()
+                return
+
+            for crack in cracks or []:
+                self.crack_grid.controls.append(self._build_crack_tile(crack))
+
             self.page.update()
-            return
+        finally:
+            self.loading_cracks = False
 
-        grid_items = []
+    def _on_list_scroll(self, e: ft.OnScrollEvent):
+        """Load the next page when the Images tab or the Join view is scrolled near the end."""
+        if e.pixels < e.max_scroll_extent - 300:
+            return
 
-        for crack in cracks:
-            img_base64 = crack.get("image_base64")
-            severity = crack.get("severity", "Unknown")
-            crack_id = crack.get("id")
-            uploader_id = crack.get("user_id")
+        if self.current_view == "group_images" and self.crack_has_more:
+            self.page.run_task(self.load_more_cracks)
+        elif self.current_view == "join_groups" and self.joinable_has_more:
+            self.page.run_task(self.load_more_joinable_groups)
+
+    def _build_crack_tile(self, crack: dict) -> ft.Control:
+        """Build a grid tile for one crack."""
+        thumb_url = asset_url(crack.get("thumbnail_url"))
+        full_url = asset_url(crack.get("image_url"))
+        severity = crack.get("severity", "Unknown")
+        crack_id = crack.get("id")
+        uploader_id = crack.get("user_id")
+
+        # Small rendition for the grid; the full image is only fetched when opened
+        image_control = ft.Image(
+            src=thumb_url,
+            width=140,
+            height=140,
+            fit=ft.ImageFit.COVER,
+            border_radius=ft.border_radius.all(12),
+            error_content=ft.Icon(ft.Icons.BROKEN_IMAGE, color=ft.Colors.GREY),
+        )
 
-            image_control = ft.Image(
-                src_base64=img_base64,
-                width=140,
-                height=140,
-                fit=ft.ImageFit.COVER,
-                border_radius=ft.border_radius.all(12),
-            )
+        can_delete = (self.user_id == uploader_id or self.user_id == self.current_group_admin)
 
-            can_delete = (self.user_id == uploader_id or self.user_id == self.current_group_admin)
+        delete_btn = ft.IconButton(
+            icon=ft.Icons.DELETE,
+            icon_color=ft.Colors.RED,
+            visible=can_delete,
+            tooltip="Delete crack",
+            on_click=lambda e, cid=crack_id: self._prepare_delete_crack(cid)
+        )
 
-            delete_btn = ft.IconButton(
-                icon=ft.Icons.DELETE,
-                icon_color=ft.Colors.RED,
-                visible=can_delete,
-                tooltip="Delete crack",
-                on_click=lambda e, cid=crack_id: self._prepare_delete_crack(cid)
-            )
+        return ft.Container(
+            bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.SURFACE),
+            padding=10,
+            border_radius=12,
+            content=ft.Column(
+                spacing=6,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                controls=[
+                    ft.Stack(
+                        controls=[
+                            ft.Container(
+                                content=image_control,
+                                on_click=lambda e, url=full_url, annotations=crack.get("annotations"): self.show_full_crack_image(url, annotations),
+                            ),
+                            ft.Container(
+                                content=delete_btn,
+                                padding=5,
+                                alignment=ft.alignment.top_right
+                            ),
+                        ],
+                        width=image_control.width,
+                        height=image_control.height,
+                    ),
+                    ft.Text(f"Severity: {severity}", weight=ft.FontWeight.BOLD),
+                ],
+            ),
+        )
 
-            tile = ft.Container(
-                bgcolor=ft.Colors.with_opacity(0.05, ft.Colors.SURFACE),
-                padding=10,
-                border_radius=12,
-                content=ft.Column(
-                    spacing=6,
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    controls=[
-                        ft.Stack(
-                            controls=[
-                                image_control,
-                                ft.Container(
-                                    content=delete_btn,
-                                    padding=5,
-                                    alignment=ft.alignment.top_right
-                                ),
-                            ],
-                            width=image_control.width,
-                            height=image_control.height,
-                        ),
-                        ft.Text(f"Severity: {severity}", weight=ft.FontWeight.BOLD),
-                    ],
-                ),
-            )
+    def show_full_crack_image(self, image_url: str | None, annotations: dict | None = None):
+        """Show the full-size crack image in an overlay with zoom and pan, with its crack outlines drawn on."""
+        if not image_url:
+            return
 
-            grid_items.append(tile)
+        full_image = ft.Image(
+            src=image_url,
+            fit=ft.ImageFit.CONTAIN,
+            error_content=ft.Icon(ft.Icons.BROKEN_IMAGE, size=50, color=ft.Colors.RED)
+        )
 
-        grid = ft.GridView(
-            expand=True,
-            runs_count=3,
-            max_extent=200,
-            spacing=10,
-            run_spacing=10,
-            controls=grid_items
+        full_container = ft.Container(
+            width=650,
+            height=700,
+            bgcolor=ft.Colors.BLACK87,
+            content=ft.Column(
+                expand=True,
+                controls=[
+                    ft.Row(
+                        alignment=ft.MainAxisAlignment.END,
+                        controls=[
+                            ft.IconButton(
+                                icon=ft.Icons.CLOSE,
+                                icon_color=ft.Colors.WHITE,
+                                on_click=lambda e: (
+                                    self.page.overlay.remove(full_container),
+                                    self.page.update()
+                                )
+                            )
+                        ]
+                    ),
+                    ft.InteractiveViewer(
+                        full_image,
+                        expand=True,
+                        scale_enabled=True,
+                        pan_enabled=True,
+                    )
+                ]
+            )
         )
 
-        self.content_container.controls.append(grid)
+        self.page.overlay.append(full_container)
         self.page.update()
 
+        # Outlines are stored as vector data; the plain image shows until they are drawn on
+        if annotations:
+            self.page.run_task(self._draw_crack_annotations, full_image, image_url, annotations)
+
+    async def _draw_crack_annotations(self, image_control: ft.Image, image_url: str, annotations: dict):
+        data = await get_bytes(image_url)
+        annotated = annotate_image_base64(data, annotations) if data else ""
+        if annotated:
+            image_control.src = None
+            image_control.src_base64 = annotated
+            self.page.update()
+
     def _prepare_delete_crack(self, crack_id):
         self.page.client_storage.set("crack_to_delete", crack_id)
         
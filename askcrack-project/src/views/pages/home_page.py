@@ -3,6 +3,7 @@ from typing import List
 from pathlib import Path
 
 from services.activity_service import fetch_recent_activity_service
+from services.api_client import asset_url
 from utils.image_utils import base64_to_image
 
 class HomePage:
@@ -32,6 +33,7 @@ class HomePage:
         self.user_id = self.user.get("id")
         self.first_name = self.user.get("first_name", "User")
         self.avatar_base64 = self.user.get("avatar_base64")
+        self.avatar_url = asset_url(self.user.get("avatar_url"))
         
 
         # HEADER CARD
@@ -59,6 +61,7 @@ class HomePage:
                         border_radius=50,  # half of width/height for perfect circle-like round image
                         clip_behavior=ft.ClipBehavior.HARD_EDGE,
                         content=ft.Image(
+                            src=None if self.avatar_base64 else self.avatar_url,
                             src_base64=self.avatar_base64,
                             fit=ft.ImageFit.COVER,
                         )
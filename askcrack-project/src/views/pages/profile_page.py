@@ -8,6 +8,7 @@ from widgets.inputs import AppTextField
 from widgets.buttons import PrimaryButton, SecondaryButton, CustomTextButton
 from services.profile_service import verify_user_password, update_profile, delete_account
 from services.otp_service import send_otp, verify_otp
+from services.api_client import asset_url
 from utils.image_utils import image_to_base64, base64_to_image
 from utils.input_validator import validate_password_change
 
@@ -46,6 +47,7 @@ class ProfilePage:
         self.user_last_name = self.user.get("last_name", "")
         self.user_email = self.user.get("email", "")
         self.user_avatar_base64 = self.user.get("avatar_base64", "")
+        self.user_avatar_url = asset_url(self.user.get("avatar_url"))
 
         self.full_name = f"{self.user_first_name} {self.user_last_name}".strip()
 
@@ -60,6 +62,7 @@ class ProfilePage:
             border_radius=50,  # half of width/height for perfect circle-like round image
             clip_behavior=ft.ClipBehavior.HARD_EDGE,
             content=ft.Image(
+                src=None if self.user_avatar_base64 else self.user_avatar_url,
                 src_base64=self.user_avatar_base64,
                 fit=ft.ImageFit.COVER,
             )
@@ -405,6 +408,7 @@ class ProfilePage:
         print(avatar_path)
         avatar_base64 = image_to_base64(avatar_path)
         self.user["avatar_base64"] = avatar_base64
+        self.avatar_image.content.src = None
         self.avatar_image.content.src_base64 = avatar_base64
         self.avatar_image.content.update()
 
@@ -1,16 +1,123 @@
+import asyncio
 import flet as ft
 from typing import List
 
+from services.api_client import asset_url
+from services.group_service import fetch_user_groups
+from services.report_service import request_report, fetch_report
+from widgets.inputs import AppTextField, CustomDropdown
+
 class ReportsPage:
+    POLL_SECONDS = 1
+
     def __init__(self, page: ft.Page):
         self.page = page
         self.content: List[ft.Control] = []
+        self.report: dict | None = None
+        self.generating = False
 
     def build(self) -> List[ft.Column]:
+        self.user = self.page.client_storage.get("user_info")
+        self.user_id = self.user.get("id")
+
+        self.scope_dropdown = CustomDropdown(
+            label="Report on",
+            options=[ft.dropdown.Option(key="user", text="My detections")],
+            value="user",
+            expand=True,
+        )
+        self.date_from_field = AppTextField(label="From", hint_text="YYYY-MM-DD", expand=True)
+        self.date_to_field = AppTextField(label="To", hint_text="YYYY-MM-DD", expand=True)
+
+        self.generate_button = ft.FilledButton(
+            "Generate Report",
+            icon=ft.Icons.ASSESSMENT,
+            on_click=lambda e: self.page.run_task(self.generate_report),
+        )
+
+        self.progress_bar = ft.ProgressBar(value=0, visible=False)
+        self.status_text = ft.Text("", size=14)
+        self.download_button = ft.OutlinedButton(
+            "Download PDF",
+            icon=ft.Icons.DOWNLOAD,
+            visible=False,
+            on_click=self.download_report,
+        )
+
         self.content = [
-            ft.Text("Reports Page Coming Soon!", size=20, weight="bold"),
-            ft.Text("This section will display user reports and related analytics.", size=14),
+            ft.Text("Inspection Reports", size=20, weight="bold"),
+            ft.Text(
+                "Severity breakdown, detections over time and the latest crack images, as a PDF. Leave the dates empty for all time.",
+                size=14,
+            ),
+            self.scope_dropdown,
+            ft.Row([self.date_from_field, self.date_to_field]),
+            self.generate_button,
+            self.progress_bar,
+            self.status_text,
+            self.download_button,
         ]
-        container = ft.Column(controls=self.content, alignment=ft.MainAxisAlignment.CENTER)
-        
+        container = ft.Column(controls=self.content, spacing=15)
+
         return [container]
+
+    async def lazy_load(self):
+        """Add the user's groups to the scope options."""
+        response = await fetch_user_groups(self.user_id)
+        for group in response.get("groups", []) if response.get("success") else []:
+            self.scope_dropdown.options.append(ft.dropdown.Option(key=f"group:{group['id']}", text=group["name"]))
+
+        self.page.update()
+
+    async def generate_report(self):
+        """Request a report and poll until it is built."""
+        if self.generating:
+            return
+
+        scope, _, scope_id = (self.scope_dropdown.value or "user").partition(":")
+
+        self.generating = True
+        self.generate_button.disabled = True
+        self.download_button.visible = False
+        self.progress_bar.visible = True
+        self.progress_bar.value = 0
+        self.status_text.value = "Requesting report..."
+        self.page.update()
+
+        try:
+            response = await request_report(
+                self.user_id,
+                scope=scope,
+                scope_id=int(scope_id) if scope_id else None,
+                date_from=(self.date_from_field.value or "").strip() or None,
+                date_to=(self.date_to_field.value or "").strip() or None,
+            )
+
+            # Built earlier from the same data, or still building; poll until it finishes
+            while response.get("success") and response["report"]["status"] in ("pending", "running"):
+                report = response["report"]
+                self.progress_bar.value = report["progress"] / 100
+                self.status_text.value = f"Building report... {report['progress']}%"
+                self.page.update()
+
+                await asyncio.sleep(self.POLL_SECONDS)
+                response = await fetch_report(report["id"])
+
+            if not response.get("success"):
+                self.status_text.value = response.get("message") or response.get("error") or "Could not generate the report."
+            elif response["report"]["status"] == "failed":
+                self.status_text.value = f"Report failed: {response['report'].get('error') or 'unknown error'}"
+            else:
+                self.report = response["report"]
+                self.progress_bar.value = 1
+                self.status_text.value = "Report ready." if not response.get("cached") else "Report ready (unchanged since it was last built)."
+                self.download_button.visible = True
+        finally:
+            self.generating = False
+            self.generate_button.disabled = False
+            self.page.update()
+
+    def download_report(self, e):
+        """Open the finished report's PDF"""
+        if self.report:
+            self.page.launch_url(asset_url(self.report["download_url"]))
@@ -0,0 +1,93 @@
+"""Initial schema (tables as created by Base.metadata.create_all before migrations existed)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+Existing databases already have these tables: run `alembic stamp 0001`
+once, then `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(255), nullable=False),
+        sa.Column("last_name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("avatar_base64", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+
+    op.create_table(
+        "groups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("pin", sa.String(255), nullable=False),
+        sa.Column("admin_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "group_members",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("group_id", sa.Integer(), sa.ForeignKey("groups.id"), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("joined_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "cracks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("image_base64", sa.Text(), nullable=False),
+        sa.Column("probability", sa.Float(), nullable=True),
+        sa.Column("severity", sa.String(50), nullable=True),
+        sa.Column("detected_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "crack_groups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("crack_id", sa.Integer(), sa.ForeignKey("cracks.id"), nullable=False),
+        sa.Column("group_id", sa.Integer(), sa.ForeignKey("groups.id"), nullable=False),
+        sa.Column("added_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "otps",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("otp", sa.String(10), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_otps_id", "otps", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_otps_id", table_name="otps")
+    op.drop_table("otps")
+    op.drop_table("crack_groups")
+    op.drop_table("cracks")
+    op.drop_table("group_members")
+    op.drop_table("groups")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
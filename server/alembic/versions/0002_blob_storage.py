@@ -0,0 +1,63 @@
+"""Blob storage for crack images and avatars, with image renditions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:10:00
+
+After upgrading, move existing base64 rows out with
+`python -m scripts.migrate_blobs`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "blobs",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("mime_type", sa.String(100), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+
+    op.create_table(
+        "blob_renditions",
+        sa.Column("source_key", sa.String(64), sa.ForeignKey("blobs.key"), primary_key=True),
+        sa.Column("name", sa.String(20), primary_key=True),
+        sa.Column("blob_key", sa.String(64), sa.ForeignKey("blobs.key"), nullable=False),
+    )
+
+    with op.batch_alter_table("cracks") as batch:
+        batch.add_column(sa.Column("image_key", sa.String(64), nullable=True))
+        batch.create_foreign_key("fk_cracks_image_key_blobs", "blobs", ["image_key"], ["key"])
+        batch.alter_column("image_base64", existing_type=sa.Text(), nullable=True)
+
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("avatar_key", sa.String(64), nullable=True))
+        batch.create_foreign_key("fk_users_avatar_key_blobs", "blobs", ["avatar_key"], ["key"])
+
+
+def downgrade() -> None:
+    """Downgrade schema. Rows already moved to the blob store lose their image."""
+    with op.batch_alter_table("users") as batch:
+        batch.drop_constraint("fk_users_avatar_key_blobs", type_="foreignkey")
+        batch.drop_column("avatar_key")
+
+    with op.batch_alter_table("cracks") as batch:
+        batch.drop_constraint("fk_cracks_image_key_blobs", type_="foreignkey")
+        batch.drop_column("image_key")
+
+    op.drop_table("blob_renditions")
+    op.drop_table("blobs")
@@ -0,0 +1,61 @@
+"""Indexes and unique constraints for the crack/group access paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:20:00
+
+Duplicate memberships and crack links are removed first (keeping the oldest
+row) so the unique constraints can be created.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _delete_duplicates(table: str, columns: str) -> None:
+    # The derived table keeps MySQL from rejecting a DELETE that reads its own table
+    op.execute(
+        f"DELETE FROM {table} WHERE id NOT IN ("
+        f"SELECT id FROM (SELECT MIN(id) AS id FROM {table} GROUP BY {columns}) AS keep_rows)"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _delete_duplicates("group_members", "group_id, user_id")
+    _delete_duplicates("crack_groups", "crack_id, group_id")
+
+    with op.batch_alter_table("group_members") as batch:
+        batch.create_unique_constraint("uq_group_members_group_id_user_id", ["group_id", "user_id"])
+        batch.create_index("ix_group_members_user_id_group_id", ["user_id", "group_id"])
+
+    with op.batch_alter_table("crack_groups") as batch:
+        batch.create_unique_constraint("uq_crack_groups_crack_id_group_id", ["crack_id", "group_id"])
+        batch.create_index("ix_crack_groups_group_id_crack_id", ["group_id", "crack_id"])
+
+    op.create_index("ix_cracks_user_id", "cracks", ["user_id"])
+    op.create_index("ix_cracks_detected_at_id", "cracks", ["detected_at", "id"])
+    op.create_index("ix_otps_email", "otps", ["email"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_otps_email", table_name="otps")
+    op.drop_index("ix_cracks_detected_at_id", table_name="cracks")
+    op.drop_index("ix_cracks_user_id", table_name="cracks")
+
+    with op.batch_alter_table("crack_groups") as batch:
+        batch.drop_index("ix_crack_groups_group_id_crack_id")
+        batch.drop_constraint("uq_crack_groups_crack_id_group_id", type_="unique")
+
+    with op.batch_alter_table("group_members") as batch:
+        batch.drop_index("ix_group_members_user_id_group_id")
+        batch.drop_constraint("uq_group_members_group_id_user_id", type_="unique")
@@ -0,0 +1,30 @@
+"""Index groups.name for the group directory's prefix search
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:05:00
+
+InnoDB secondary indexes carry the primary key, so this index also serves the
+directory's (name, id) keyset ordering.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_groups_name", "groups", ["name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_groups_name", table_name="groups")
@@ -0,0 +1,32 @@
+"""Composite (email, created_at) index for OTP lookups and an expires_at index for the sweeper
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 11:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_otps_email_created_at", "otps", ["email", "created_at"])
+    op.create_index("ix_otps_expires_at", "otps", ["expires_at"])
+    # The composite index covers every lookup the single-column one served
+    op.drop_index("ix_otps_email", table_name="otps")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_otps_email", "otps", ["email"])
+    op.drop_index("ix_otps_expires_at", table_name="otps")
+    op.drop_index("ix_otps_email_created_at", table_name="otps")
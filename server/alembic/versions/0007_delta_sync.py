@@ -0,0 +1,47 @@
+"""Sync tombstones, groups.updated_at and a (group_id, added_at) index for delta sync
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("object_id", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_sync_tombstones_kind_scope_id_deleted_at", "sync_tombstones", ["kind", "scope_id", "deleted_at"])
+    op.create_index("ix_sync_tombstones_deleted_at", "sync_tombstones", ["deleted_at"])
+
+    # Existing groups count as unchanged; clients get them from their first full fetch
+    op.add_column("groups", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_groups_updated_at", "groups", ["updated_at"])
+
+    op.create_index("ix_crack_groups_group_id_added_at", "crack_groups", ["group_id", "added_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_crack_groups_group_id_added_at", table_name="crack_groups")
+    op.drop_index("ix_groups_updated_at", table_name="groups")
+    op.drop_column("groups", "updated_at")
+    op.drop_index("ix_sync_tombstones_deleted_at", table_name="sync_tombstones")
+    op.drop_index("ix_sync_tombstones_kind_scope_id_deleted_at", table_name="sync_tombstones")
+    op.drop_table("sync_tombstones")
@@ -0,0 +1,48 @@
+"""Inspection reports built by the background report builder
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reports",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("requested_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("scope", sa.String(20), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("date_from", sa.Date(), nullable=True),
+        sa.Column("date_to", sa.Date(), nullable=True),
+        sa.Column("cache_key", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("progress", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("lease_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("blob_key", sa.String(64), sa.ForeignKey("blobs.key"), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_reports_cache_key", "reports", ["cache_key"])
+    op.create_index("ix_reports_status_lease_until", "reports", ["status", "lease_until"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reports_status_lease_until", table_name="reports")
+    op.drop_index("ix_reports_cache_key", table_name="reports")
+    op.drop_table("reports")
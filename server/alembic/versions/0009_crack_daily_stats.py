@@ -0,0 +1,50 @@
+"""Daily per-user and per-group crack rollups, backfilled from existing cracks
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "crack_daily_stats",
+        sa.Column("scope", sa.String(20), primary_key=True),
+        sa.Column("scope_id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("severity", sa.String(50), primary_key=True),
+        sa.Column("crack_count", sa.Integer(), nullable=False),
+        sa.Column("probability_sum", sa.Float(), nullable=False),
+    )
+
+    # Same aggregation as scripts.rebuild_stats
+    op.execute(
+        "INSERT INTO crack_daily_stats (scope, scope_id, day, severity, crack_count, probability_sum) "
+        "SELECT 'user', user_id, DATE(detected_at), COALESCE(severity, 'Unknown'), COUNT(*), COALESCE(SUM(probability), 0) "
+        "FROM cracks WHERE user_id IS NOT NULL AND detected_at IS NOT NULL "
+        "GROUP BY user_id, DATE(detected_at), COALESCE(severity, 'Unknown')"
+    )
+    op.execute(
+        "INSERT INTO crack_daily_stats (scope, scope_id, day, severity, crack_count, probability_sum) "
+        "SELECT 'group', crack_groups.group_id, DATE(cracks.detected_at), COALESCE(cracks.severity, 'Unknown'), "
+        "COUNT(*), COALESCE(SUM(cracks.probability), 0) "
+        "FROM crack_groups JOIN cracks ON cracks.id = crack_groups.crack_id WHERE cracks.detected_at IS NOT NULL "
+        "GROUP BY crack_groups.group_id, DATE(cracks.detected_at), COALESCE(cracks.severity, 'Unknown')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("crack_daily_stats")
@@ -0,0 +1,29 @@
+"""Vector crack annotations (outlines and boxes) stored with each crack
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("cracks") as batch:
+        batch.add_column(sa.Column("annotations", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("cracks") as batch:
+        batch.drop_column("annotations")
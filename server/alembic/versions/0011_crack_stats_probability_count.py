@@ -0,0 +1,45 @@
+"""Count cracks with a probability in the daily rollups, so the mean skips those without one
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 19:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("crack_daily_stats") as batch:
+        batch.add_column(sa.Column("probability_count", sa.Integer(), nullable=False, server_default="0"))
+
+    # Recompute every rollup with the new column; same aggregation as scripts.rebuild_stats
+    op.execute("DELETE FROM crack_daily_stats")
+    op.execute(
+        "INSERT INTO crack_daily_stats (scope, scope_id, day, severity, crack_count, probability_sum, probability_count) "
+        "SELECT 'user', user_id, DATE(detected_at), COALESCE(severity, 'Unknown'), COUNT(*), COALESCE(SUM(probability), 0), COUNT(probability) "
+        "FROM cracks WHERE user_id IS NOT NULL AND detected_at IS NOT NULL "
+        "GROUP BY user_id, DATE(detected_at), COALESCE(severity, 'Unknown')"
+    )
+    op.execute(
+        "INSERT INTO crack_daily_stats (scope, scope_id, day, severity, crack_count, probability_sum, probability_count) "
+        "SELECT 'group', crack_groups.group_id, DATE(cracks.detected_at), COALESCE(cracks.severity, 'Unknown'), "
+        "COUNT(*), COALESCE(SUM(cracks.probability), 0), COUNT(cracks.probability) "
+        "FROM crack_groups JOIN cracks ON cracks.id = crack_groups.crack_id WHERE cracks.detected_at IS NOT NULL "
+        "GROUP BY crack_groups.group_id, DATE(cracks.detected_at), COALESCE(cracks.severity, 'Unknown')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("crack_daily_stats") as batch:
+        batch.drop_column("probability_count")
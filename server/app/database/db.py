@@ -1,6 +1,12 @@
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from config import Config
 
@@ -13,13 +19,151 @@ DB_PORT = Config.DB_PORT
 
 DATABASE_URL = Config.SQLALCHEMY_DATABASE_URI
 
-# Engine and session
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    echo=True,  # Set to False in production
-    future=True
-)
+# Pool defaults per APP_ENV; DB_POOL_* settings override them
+ENGINE_PROFILES = {
+    "development": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": 3600, "pool_pre_ping": True},
+    # MySQL drops connections idle past wait_timeout; recycle well before it and ping on checkout
+    "production": {"pool_size": 20, "max_overflow": 30, "pool_timeout": 10, "pool_recycle": 1800, "pool_pre_ping": True},
+    "test": {"poolclass": NullPool},
+}
+
+
+class PoolMetrics:
+    """Connection wait statistics for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.timeouts += timed_out
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            waits = self.waits
+            queue = isinstance(pool, QueuePool)  # Other pool types do not track occupancy
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if queue else None,
+                "checked_out": pool.checkedout() if queue else None,
+                "checked_in": pool.checkedin() if queue else None,
+                # Negative until the pool has opened pool_size connections
+                "overflow": pool.overflow() if queue else None,
+                "checkouts": waits,
+                "wait_ms_avg": round(self.wait_seconds_total / waits * 1000, 3) if waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class MeteredPoolMixin:
+    """Times every connection checkout, including time spent waiting for a free slot."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+POOL_SIZING_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle")
+
+def is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:")
+
+def engine_options(url: str, profile: str | None = None, queue_pool=MeteredQueuePool) -> dict:
+    """Keyword arguments for create_engine, from the APP_ENV profile plus DB_POOL_* overrides."""
+    options = dict(ENGINE_PROFILES.get(profile or Config.APP_ENV, ENGINE_PROFILES["development"]))
+    options["echo"] = Config.SQLALCHEMY_ECHO
+
+    overrides = {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+    }
+    options.update({key: int(value) for key, value in overrides.items() if value})
+    if Config.DB_POOL_PRE_PING:
+        options["pool_pre_ping"] = Config.DB_POOL_PRE_PING.lower() == "true"
+
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    if options.get("poolclass") is NullPool or is_memory_sqlite(url):
+        # No queue pool here (a connection per checkout, or one shared in-memory
+        # database), so sizing options do not apply
+        for key in POOL_SIZING_OPTIONS:
+            options.pop(key, None)
+    else:
+        options.setdefault("poolclass", queue_pool)
+
+    return options
+
+def create_app_engine(url: str = DATABASE_URL, profile: str | None = None):
+    """Create an engine configured from Config, with pool metrics on engine.pool.metrics."""
+    engine = create_engine(url, future=True, **engine_options(url, profile))
+    if not hasattr(engine.pool, "metrics"):
+        engine.pool.metrics = PoolMetrics()
+
+    return engine
+
+# Sync driver -> asyncio driver for the same database
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """The asyncio-driver equivalent of a sync database URL."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def create_async_app_engine(url: str | None = None, profile: str | None = None):
+    """Create an asyncio engine configured like create_app_engine; metrics are on engine.sync_engine.pool."""
+    url = url or Config.ASYNC_DATABASE_URL or async_database_url(DATABASE_URL)
+    engine = create_async_engine(url, **engine_options(url, profile, queue_pool=MeteredAsyncQueuePool))
+    if not hasattr(engine.sync_engine.pool, "metrics"):
+        engine.sync_engine.pool.metrics = PoolMetrics()
+
+    return engine
+
+def pool_status(engine) -> dict:
+    """Current pool occupancy and checkout wait statistics, for monitoring."""
+    engine = getattr(engine, "sync_engine", engine)
+    return engine.pool.metrics.snapshot(engine.pool)
+
+# Engine and session. Workers and scripts use the sync engine; request
+# handlers use the async one, so an idle request costs no thread.
+engine = create_app_engine()
+async_engine = create_async_app_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -27,12 +171,25 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Objects stay usable after commit; an async session cannot lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base for models
 Base = declarative_base()
 
 # Dependency used in FastAPI routes
-def get_db():
-    """Get a database session"""
+async def get_db():
+    """Get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
+    """Get a sync database session, for routes whose services are not async yet"""
     db = SessionLocal()
     try:
         yield db
@@ -2,4 +2,11 @@ from .user import User
 from .group import Group
 from .group_member import GroupMember
 from .crack import Crack
+from .crack_group import CrackGroup
 from .otp import OTP
+from .blob import Blob
+from .blob_rendition import BlobRendition
+from .outbox_email import OutboxEmail
+from .sync_tombstone import SyncTombstone
+from .report import Report
+from .crack_daily_stat import CrackDailyStat
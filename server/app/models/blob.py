@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database.db import Base
+
+class Blob(Base):
+    __tablename__ = "blobs"
+
+    # SHA-256 of the content; the bytes themselves live in the blob store
+    key = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    mime_type = Column(String(100), nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @property
+    def url(self):
+        return f"/blobs/{self.key}"
+
+    def to_dict(self):
+        return {
+            "key": self.key,
+            "url": self.url,
+            "size": self.size,
+            "width": self.width,
+            "height": self.height,
+            "mime_type": self.mime_type,
+        }
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy.orm import relationship
+from app.database.db import Base
+
+class BlobRendition(Base):
+    __tablename__ = "blob_renditions"
+
+    # Original image and rendition name ("small", "medium", ...)
+    source_key = Column(String(64), ForeignKey("blobs.key"), primary_key=True)
+    name = Column(String(20), primary_key=True)
+
+    # Downscaled copy, itself stored as a blob
+    blob_key = Column(String(64), ForeignKey("blobs.key"), nullable=False)
+
+    blob = relationship("Blob", foreign_keys=[blob_key])
@@ -1,28 +1,47 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float, Index, JSON
 from sqlalchemy.orm import relationship
 from app.database.db import Base
 
 class Crack(Base):
     __tablename__ = "cracks"
+    __table_args__ = (
+        # Newest-first listings and keyset pagination on (detected_at, id)
+        Index("ix_cracks_detected_at_id", "detected_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    image_base64 = Column(Text, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    image_key = Column(String(64), ForeignKey("blobs.key"), nullable=True)
+    image_base64 = Column(Text, nullable=True)  # Legacy inline image, moved to the blob store by scripts.migrate_blobs
     probability = Column(Float)
     severity = Column(String(50))
     detected_at = Column(DateTime, default=datetime.now(timezone.utc))
+    annotations = Column(JSON, nullable=True)  # Crack outlines and boxes; clients draw them over the image
 
     user = relationship("User", back_populates="cracks")
     groups = relationship("CrackGroup", back_populates="crack", cascade="all, delete-orphan")
+    image = relationship("Blob")
+
+    @property
+    def image_url(self):
+        return f"/blobs/{self.image_key}" if self.image_key else None
+
+    def rendition_url(self, name: str):
+        return f"/blobs/{self.image_key}/{name}" if self.image_key else None
 
     def to_dict(self):
+        # Image bytes are never inlined; clients fetch renditions or the full image by URL
         return {
             "id": self.id,
             "user_id": self.user_id,
-            "image_base64": self.image_base64,
+            "image_key": self.image_key,
+            "image_url": self.image_url,
+            "thumbnail_url": self.rendition_url("small"),
+            "medium_url": self.rendition_url("medium"),
             "probability": self.probability,
             "severity": self.severity,
             "detected_at": self.detected_at.isoformat(),
+            "annotations": self.annotations,
         }
 
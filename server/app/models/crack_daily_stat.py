@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Date, Float
+from app.database.db import Base
+
+class CrackDailyStat(Base):
+    """
+    Per-day crack counts for one user or group, by severity. Kept up to date
+    as cracks are added and removed, so statistics over any date range read
+    one row per day and severity instead of scanning cracks.
+    """
+    __tablename__ = "crack_daily_stats"
+
+    USER = "user"    # scope_id = user_id; cracks that user detected
+    GROUP = "group"  # scope_id = group_id; cracks shared to the group
+
+    UNKNOWN_SEVERITY = "Unknown"
+
+    # The primary key doubles as the (scope, scope_id, day) range index
+    scope = Column(String(20), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC date of detected_at
+    severity = Column(String(50), primary_key=True)
+    crack_count = Column(Integer, nullable=False, default=0)
+    probability_sum = Column(Float, nullable=False, default=0.0)
+    probability_count = Column(Integer, nullable=False, default=0)  # Cracks with a probability; mean = probability_sum / probability_count
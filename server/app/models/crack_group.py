@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, Index, UniqueConstraint
 from datetime import datetime, timezone
 from sqlalchemy.orm import relationship
 from app.database.db import Base
 
 class CrackGroup(Base):
     __tablename__ = "crack_groups"
+    __table_args__ = (
+        # A crack is linked to a group at most once; also serves lookups by crack_id
+        UniqueConstraint("crack_id", "group_id", name="uq_crack_groups_crack_id_group_id"),
+        # Listing a group's cracks
+        Index("ix_crack_groups_group_id_crack_id", "group_id", "crack_id"),
+        # Cracks added to a group since a time (delta sync)
+        Index("ix_crack_groups_group_id_added_at", "group_id", "added_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     crack_id = Column(Integer, ForeignKey("cracks.id"), nullable=False)
@@ -7,10 +7,12 @@ class Group(Base):
     __tablename__ = "groups"
 
     id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)  # Prefix search in the group directory
     pin = Column(String(255), nullable=False)
     admin_id = Column(Integer)
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # Bumped whenever the member list or admin changes, for delta sync of group lists
+    updated_at = Column(DateTime, nullable=True, index=True, default=lambda: datetime.now(timezone.utc))
 
     members = relationship("GroupMember", back_populates="group", cascade="all, delete-orphan")
     users = relationship("User", secondary="group_members")
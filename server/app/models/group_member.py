@@ -1,10 +1,16 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, UniqueConstraint
 from app.database.db import Base
 from sqlalchemy.orm import relationship
 
 class GroupMember(Base):
     __tablename__ = "group_members"
+    __table_args__ = (
+        # A user joins a group at most once; also serves lookups by group_id
+        UniqueConstraint("group_id", "user_id", name="uq_group_members_group_id_user_id"),
+        # Finding the groups a user belongs to
+        Index("ix_group_members_user_id_group_id", "user_id", "group_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     group_id = Column(Integer, ForeignKey("groups.id"))
@@ -1,12 +1,16 @@
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from app.database.db import Base
 
 class OTP(Base):
     __tablename__ = "otps"
+    __table_args__ = (
+        # Latest OTP for an email
+        Index("ix_otps_email_created_at", "email", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), nullable=False)
     otp = Column(String(10), nullable=False)
     created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    expires_at = Column(DateTime(timezone=True), default=lambda _: datetime.now(timezone.utc) + timedelta(minutes=5))
+    expires_at = Column(DateTime(timezone=True), default=lambda _: datetime.now(timezone.utc) + timedelta(minutes=5), index=True)  # Expiry sweeps
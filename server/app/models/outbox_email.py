@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.database.db import Base
+
+class OutboxEmail(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # The sender polls for pending messages that are due
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    id = Column(Integer, primary_key=True)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    html_body = Column(Text, nullable=False)
+    text_body = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Due time for pending messages; also the lease expiry while a sender holds the row
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, ForeignKey, Index
+from app.database.db import Base
+
+class Report(Base):
+    """An inspection report, built in the background and stored as a PDF blob."""
+    __tablename__ = "reports"
+    __table_args__ = (
+        # Repeat requests reuse a report built from the same data
+        Index("ix_reports_cache_key", "cache_key"),
+        # The builder polls for pending reports and expired leases
+        Index("ix_reports_status_lease_until", "status", "lease_until"),
+    )
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    USER = "user"    # scope_id = user_id; cracks that user detected
+    GROUP = "group"  # scope_id = group_id; cracks shared to the group
+
+    id = Column(Integer, primary_key=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    scope = Column(String(20), nullable=False)
+    scope_id = Column(Integer, nullable=False)
+    date_from = Column(Date, nullable=True)
+    date_to = Column(Date, nullable=True)
+    # Hash of scope, date range and the data version the report was requested at
+    cache_key = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default=PENDING)
+    progress = Column(Integer, nullable=False, default=0)  # Percent
+    attempts = Column(Integer, nullable=False, default=0)
+    lease_until = Column(DateTime(timezone=True), nullable=True)  # While a builder holds the row
+    blob_key = Column(String(64), ForeignKey("blobs.key"), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def download_url(self):
+        return f"/reports/{self.id}/download" if self.status == self.DONE else None
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "scope": self.scope,
+            "scope_id": self.scope_id,
+            "date_from": self.date_from.isoformat() if self.date_from else None,
+            "date_to": self.date_to.isoformat() if self.date_to else None,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "download_url": self.download_url,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database.db import Base
+
+class SyncTombstone(Base):
+    """A record that something was removed, so delta sync (`since=`) can tell clients to drop it."""
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        # Delta queries: removals of one kind in a scope since a time
+        Index("ix_sync_tombstones_kind_scope_id_deleted_at", "kind", "scope_id", "deleted_at"),
+        # The sweeper prunes by age
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+    CRACK = "crack"            # scope_id = group_id, object_id = crack_id
+    MEMBERSHIP = "membership"  # scope_id = user_id, object_id = group_id
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)
+    scope_id = Column(Integer, nullable=False)
+    object_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database.db import Base
 
@@ -11,7 +11,8 @@ class User(Base):
     last_name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
-    avatar_base64 = Column(Text, nullable=True)
+    avatar_key = Column(String(64), ForeignKey("blobs.key"), nullable=True)
+    avatar_base64 = Column(Text, nullable=True)  # Legacy inline avatar, moved to the blob store by scripts.migrate_blobs
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=datetime.now(timezone.utc))
 
@@ -22,3 +23,7 @@ class User(Base):
     groups = relationship("Group", secondary="group_members")
     
     cracks = relationship("Crack", back_populates="user")
+
+    @property
+    def avatar_url(self):
+        return f"/blobs/{self.avatar_key}" if self.avatar_key else None
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Body, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
+from app.utils.http_cache import etag_response
 from app.services.activity_service import fetch_recent_activity
 
 router = APIRouter()
 
 @router.get("/{user_id}")
-def get_recent_activity(user_id: int, db: Session = Depends(get_db)):
-    return fetch_recent_activity(user_id, db)
\ No newline at end of file
+async def get_recent_activity(user_id: int, request: Request, since: str | None = None, db: AsyncSession = Depends(get_db)):
+    return etag_response(request, await fetch_recent_activity(user_id, db, since=since))
\ No newline at end of file
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Request, Response, HTTPException
+from sqlalchemy.orm import Session
+from app.database.db import get_sync_db
+from app.services.blob_service import fetch_blob_service, fetch_rendition_service, RENDITION_SIZES
+from config import Config
+
+router = APIRouter()
+
+def _cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={Config.BLOB_CACHE_MAX_AGE}, immutable",
+    }
+
+@router.get("/{key}")
+def api_fetch_blob(key: str, request: Request, db: Session = Depends(get_sync_db)):
+    """Endpoint to serve stored image bytes. Blobs are content-addressed, so they never change."""
+    etag = f'"{key}"'
+    headers = _cache_headers(etag)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    result = fetch_blob_service(key, db)
+    if not result:
+        raise HTTPException(status_code=404, detail="Blob not found")
+
+    blob, data = result
+
+    return Response(content=data, media_type=blob.mime_type, headers=headers)
+
+
+@router.get("/{key}/{rendition}")
+def api_fetch_blob_rendition(key: str, rendition: str, request: Request, db: Session = Depends(get_sync_db)):
+    """Endpoint to serve a downscaled rendition ("small", "medium") of a stored image."""
+    if rendition not in RENDITION_SIZES:
+        raise HTTPException(status_code=404, detail="Unknown rendition")
+
+    # The size is part of the tag so changing rendition settings invalidates client caches
+    etag = f'"{key}-{rendition}-{RENDITION_SIZES[rendition]}"'
+    headers = _cache_headers(etag)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    result = fetch_rendition_service(key, rendition, db)
+    if not result:
+        raise HTTPException(status_code=404, detail="Rendition not found")
+
+    blob, data = result
+
+    return Response(content=data, media_type=blob.mime_type, headers=headers)
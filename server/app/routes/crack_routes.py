@@ -1,31 +1,64 @@
-from fastapi import APIRouter, Body, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
-from app.services.crack_service import delete_crack_from_group_service, fetch_cracks_service, add_crack_service
+from app.services.crack_service import delete_crack_from_group_service, fetch_cracks_service, sync_cracks_service, add_crack_service, bulk_add_cracks_service
+from app.utils.http_cache import etag_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE
 
 router = APIRouter()
 
 @router.post("/fetch-cracks")
-def api_fetch_cracks(data: dict = Body(...), db: Session = Depends(get_db)):
-    """Endpoint to fetch cracks for a specific group."""
+async def api_fetch_cracks(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
+    """Endpoint to fetch a page of cracks for a specific group."""
     group_id = data.get("group_id")
-    
-    return fetch_cracks_service(group_id, db)
+    cursor = data.get("cursor")
+    limit = data.get("limit", DEFAULT_PAGE_SIZE)
+    severity = data.get("severity")
+    date_from = data.get("date_from")
+    date_to = data.get("date_to")
+
+    return await fetch_cracks_service(group_id, db, cursor=cursor, limit=limit, severity=severity, date_from=date_from, date_to=date_to)
+
+@router.get("/group/{group_id}")
+async def api_sync_cracks(
+    group_id: int,
+    request: Request,
+    since: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    severity: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Endpoint to fetch a group's first page of cracks, or only the changes after `since`, with an ETag."""
+    response = await sync_cracks_service(group_id, db, since=since, limit=limit, severity=severity, date_from=date_from, date_to=date_to)
+
+    return etag_response(request, response)
 
 @router.post("/add-crack")
-def api_add_crack(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_add_crack(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to add a new crack."""
     user_id = data.get("user_id")
     image_base64 = data.get("image_base64")
     probability = data.get("probability")
     severity = data.get("severity")
+    annotations = data.get("annotations")
     
-    return add_crack_service(user_id, image_base64, probability, severity, db)
+    return await add_crack_service(user_id, image_base64, probability, severity, db, annotations)
+
+@router.post("/bulk-add")
+async def api_bulk_add_cracks(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
+    """Endpoint to add a batch of imported cracks to one group."""
+    user_id = data.get("user_id")
+    group_id = data.get("group_id")
+    cracks = data.get("cracks")
+
+    return await bulk_add_cracks_service(user_id, group_id, cracks, db)
 
 @router.post("/delete-crack-from-group")
-def api_delete_crack_from_group(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_delete_crack_from_group(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to delete a crack from a specific group."""
     crack_id = data.get("crack_id")
     group_id = data.get("group_id")
     
-    return delete_crack_from_group_service(crack_id, group_id, db)
+    return await delete_crack_from_group_service(crack_id, group_id, db)
@@ -1,58 +1,70 @@
-from fastapi import APIRouter, Depends, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Body, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.db import get_db
-from app.services.group_service import create_group_service, fetch_groups_service, join_group_service, fetch_user_groups_service, fetch_group_info_service, edit_member_service, remove_member_service
+from app.utils.http_cache import etag_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE
+from app.services.group_service import create_group_service, fetch_groups_service, join_group_service, fetch_user_groups_service, fetch_group_info_service, fetch_group_directory_service, edit_member_service, remove_member_service
 
 router = APIRouter()
 
 @router.post("/create-group")
-def api_create_group(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_create_group(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to create a new group."""
     name = data.get("name")
     pin = data.get("pin")
     admin_id = data.get("admin_id")
     
-    return create_group_service(name, pin, admin_id, db)
+    return await create_group_service(name, pin, admin_id, db)
 
 @router.post("/join-group")
-def api_join_group(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_join_group(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint for a user to join a group."""
     user_id = data.get("user_id")
     group_id = data.get("group_id")
     pin = data.get("pin")
     
-    return join_group_service(user_id, group_id, pin, db)
+    return await join_group_service(user_id, group_id, pin, db)
 
 @router.get("/group-info/{group_id}")
-def api_fetch_group_info(group_id: int, db: Session = Depends(get_db)):
+async def api_fetch_group_info(group_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Endpoint to fetch detailed information about a specific group."""
-    return fetch_group_info_service(group_id, db)
+    return etag_response(request, await fetch_group_info_service(group_id, db))
 
 @router.get("/user-groups/{user_id}")
-def api_fetch_user_groups(user_id: int, db: Session = Depends(get_db)):
-    """Endpoint to fetch groups a user is a member of."""
-    return fetch_user_groups_service(user_id, db)
+async def api_fetch_user_groups(user_id: int, request: Request, since: str | None = None, db: AsyncSession = Depends(get_db)):
+    """Endpoint to fetch groups a user is a member of, or only the changes after `since`."""
+    return etag_response(request, await fetch_user_groups_service(user_id, db, since=since))
 
 @router.post("/all")
-def api_fetch_groups(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_fetch_groups(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to fetch all groups."""
     user_id = data.get("user_id")
 
-    return fetch_groups_service(user_id, db)
+    return await fetch_groups_service(user_id, db)
+
+@router.post("/directory")
+async def api_fetch_group_directory(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
+    """Endpoint to fetch one page of joinable groups, optionally filtered by name prefix."""
+    user_id = data.get("user_id")
+    query = data.get("query")
+    cursor = data.get("cursor")
+    limit = data.get("limit", DEFAULT_PAGE_SIZE)
+
+    return await fetch_group_directory_service(user_id, db, query=query, cursor=cursor, limit=limit)
 
 @router.post("/edit-member")
-def api_edit_member(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_edit_member(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to edit a group member's role."""
     user_id = data.get("user_id")
     group_id = data.get("group_id")
     new_role = data.get("new_role")
 
-    return edit_member_service(user_id, group_id, new_role, db) 
+    return await edit_member_service(user_id, group_id, new_role, db) 
 
 @router.post("/remove-member")
-def api_remove_member(data: dict = Body(...), db: Session = Depends(get_db)):
+async def api_remove_member(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
     """Endpoint to remove a user from a group."""
     user_id = data.get("user_id")
     group_id = data.get("group_id")
 
-    return remove_member_service(user_id, group_id, db)
\ No newline at end of file
+    return await remove_member_service(user_id, group_id, db)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Body
+from app.services.inference_service import predict_images_service
+
+router = APIRouter()
+
+@router.post("/predict")
+async def api_predict(data: dict = Body(...)):
+    """Endpoint to classify one image (image_base64) or several (images) with the server's crack model."""
+    images = data.get("images")
+    if images is None:
+        images = [data.get("image_base64")] if data.get("image_base64") else []
+
+    return await predict_images_service(images)
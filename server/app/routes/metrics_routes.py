@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from app.database.db import engine, async_engine, pool_status
+from app.utils.inference import get_batcher
+
+router = APIRouter()
+
+@router.get("/db-pool")
+async def api_db_pool_metrics():
+    """Endpoint to report database connection pool occupancy and checkout wait times."""
+    return {"success": True, "pool": pool_status(async_engine), "sync_pool": pool_status(engine)}
+
+@router.get("/inference")
+async def api_inference_metrics():
+    """Endpoint to report server inference batching: batches run, images classified and mean batch size."""
+    batcher = get_batcher()
+    if batcher is None:
+        return {"success": False, "message": "Server inference is disabled"}
+
+    return {"success": True, "inference": batcher.status()}
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db import get_db
+from app.services.report_service import request_report_service, fetch_report_service, fetch_report_pdf
+from app.utils.pdf import iter_chunks
+
+router = APIRouter()
+
+@router.post("/request")
+async def api_request_report(data: dict = Body(...), db: AsyncSession = Depends(get_db)):
+    """Endpoint to queue an inspection report for the user or one of their groups."""
+    user_id = data.get("user_id")
+    scope = data.get("scope", "user")
+    scope_id = data.get("scope_id")
+    date_from = data.get("date_from")
+    date_to = data.get("date_to")
+
+    return await request_report_service(user_id, scope, scope_id, date_from, date_to, db)
+
+@router.get("/{report_id}")
+async def api_fetch_report(report_id: int, db: AsyncSession = Depends(get_db)):
+    """Endpoint to poll a report's status and progress."""
+    return await fetch_report_service(report_id, db)
+
+@router.get("/{report_id}/download")
+async def api_download_report(report_id: int, db: AsyncSession = Depends(get_db)):
+    """Endpoint to download a finished report as a PDF."""
+    result = await fetch_report_pdf(report_id, db)
+    if not result:
+        raise HTTPException(status_code=404, detail="Report not ready")
+
+    report, data = result
+
+    return StreamingResponse(
+        iter_chunks(data),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=cracktify_{report.scope}_{report.scope_id}_report.pdf",
+            "Content-Length": str(len(data)),
+        }
+    )
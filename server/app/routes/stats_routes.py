@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.db import get_db
+from app.services.stats_service import fetch_stats_service
+from app.utils.http_cache import etag_response
+
+router = APIRouter()
+
+@router.get("/{user_id}")
+async def api_fetch_stats(
+    user_id: int,
+    request: Request,
+    scope: str = "user",
+    scope_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Endpoint to fetch crack statistics for the user or one of their groups over a date range."""
+    return etag_response(request, await fetch_stats_service(user_id, scope, scope_id, date_from, date_to, db))
@@ -1,50 +1,135 @@
-from datetime import datetime, timezone
+from sqlalchemy import case, exists, func, or_, select
+
 from app.models.crack import Crack
 from app.models.group import Group
 from app.models.group_member import GroupMember
-from app.models.user import User
-from app.models.group_member import GroupMember
 from app.models.crack_group import CrackGroup
+from app.models.sync_tombstone import SyncTombstone
+from app.services.cache_service import activity_tag
+from app.utils.response_cache import read_through
+from app.utils.sync import encode_sync_token, parse_since, sync_checkpoint
 
 from app.utils.time_util import human_time
 
+RECENT_ACTIVITY_LIMIT = 20
+
+
+def member_group_ids(user_id: int):
+    """Subquery of the group IDs a user belongs to."""
+    return select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+
+async def fetch_activity_overview(user_id: int, db) -> dict:
+    """Count the cracks visible to a user, per severity, in one aggregate query."""
+    visible_cracks = select(CrackGroup.crack_id).where(CrackGroup.group_id.in_(member_group_ids(user_id)))
+
+    def severity_count(severity: str):
+        return func.coalesce(func.sum(case((Crack.severity == severity, 1), else_=0)), 0)
+
+    row = (await db.execute(
+        select(
+            func.count(Crack.id),
+            severity_count("Severe"),
+            severity_count("Mild"),
+            severity_count("None"),
+        ).where(Crack.id.in_(visible_cracks))
+    )).one()
+
+    return {
+        "total_cracks": row[0],
+        "total_severe_cracks": row[1],
+        "total_mild_cracks": row[2],
+        "total_none_cracks": row[3],
+    }
+
+async def fetch_recent_activity(user_id: int, db, since: str = None):
+    """
+    Fetch recent activity for a given user. Cached until a crack is added to
+    or removed from one of their groups, or their memberships change; the
+    relative times can lag by up to CACHE_TTL_SECONDS.
 
-def fetch_recent_activity(user_id: int, db):
-    """Fetch recent activity for a given user."""
-    # Get groups the user belongs to
-    groups = db.query(Group).join(GroupMember).filter(GroupMember.user_id == user_id).all()
-    group_ids = [group.id for group in groups]
-    # Get recent cracks from these groups
-    recent_cracks = (
-        db.query(Crack)
+    With `since` (a previous server_time) only the activity added after it
+    is returned. If the user's groups changed or a crack was removed from
+    them, older items move into the feed, so the full feed is sent with
+    "full": True instead.
+    """
+    since_at = parse_since(since)
+    if since_at is None or await feed_reshaped(user_id, since_at, db):
+        return await read_through(activity_tag(user_id), [activity_tag(user_id)], lambda: load_recent_activity(user_id, db))
+
+    started = sync_checkpoint()
+    added = await fetch_activity_items(user_id, db, since_at)
+
+    return {
+        "success": True,
+        "full": False,
+        "activities": added,
+        "overview": await fetch_activity_overview(user_id, db),
+        # Unchanged feeds repeat the client's token, so the response is identical and revalidates to a 304
+        "server_time": encode_sync_token(started if added else since_at),
+    }
+
+async def load_recent_activity(user_id: int, db):
+    started = sync_checkpoint()
+
+    return {
+        "success": True,
+        "full": True,
+        "activities": await fetch_activity_items(user_id, db),
+        "overview": await fetch_activity_overview(user_id, db),
+        "server_time": encode_sync_token(started),
+    }
+
+async def fetch_activity_items(user_id: int, db, since_at=None) -> list[dict]:
+    """The newest activity items, optionally only those for cracks shared after `since_at`."""
+    # A crack shared to several of the user's groups shows up once, under its first group
+    ranked = (
+        select(
+            Crack.id.label("crack_id"),
+            Crack.severity,
+            Crack.detected_at,
+            Group.name.label("location"),
+            CrackGroup.added_at,
+            func.row_number().over(partition_by=Crack.id, order_by=CrackGroup.id).label("rank"),
+        )
         .join(CrackGroup, CrackGroup.crack_id == Crack.id)
-        .filter(CrackGroup.group_id.in_(group_ids))
-        .order_by(Crack.detected_at.desc())
-        .limit(20)
-        .all()
+        .join(Group, Group.id == CrackGroup.group_id)
+        .where(CrackGroup.group_id.in_(member_group_ids(user_id)))
+        .subquery()
     )
 
-    activity_list = []
+    statement = select(ranked.c.crack_id, ranked.c.severity, ranked.c.detected_at, ranked.c.location).where(ranked.c.rank == 1)
+    if since_at is not None:
+        statement = statement.where(ranked.c.added_at > since_at)
 
-    total_cracks = len(recent_cracks)
-    total_severe_cracks = sum(1 for crack in recent_cracks if crack.severity == "Severe")
-    total_mild_cracks = sum(1 for crack in recent_cracks if crack.severity == "Mild")
-    total_none_cracks = sum(1 for crack in recent_cracks if crack.severity == "None")
+    recent_cracks = (await db.execute(
+        statement
+        .order_by(ranked.c.detected_at.desc(), ranked.c.crack_id.desc())
+        .limit(RECENT_ACTIVITY_LIMIT)
+    )).all()
 
-    for crack in recent_cracks:
-        location = (
-            db.query(Group.name)
-            .join(CrackGroup, CrackGroup.group_id == Group.id)
-            .filter(CrackGroup.crack_id == crack.id)
-            .first()
-        )
-        activity_list.append({
+    return [
+        {
             "type": "Crack detected",
-            "crack_id": crack.id,
-            "location": location[0] if location else "Unknown location",
+            "crack_id": crack.crack_id,
+            "location": crack.location or "Unknown location",
             "severity": crack.severity,
+            "detected_at": crack.detected_at.isoformat(),
             "time_ago": human_time(crack.detected_at),
-        })
+        }
+        for crack in recent_cracks
+    ]
 
-    return {"success": True, "activities": activity_list, "overview": {"total_cracks": total_cracks, "total_severe_cracks": total_severe_cracks, "total_mild_cracks": total_mild_cracks, "total_none_cracks": total_none_cracks}}
-                                                                            
\ No newline at end of file
+async def feed_reshaped(user_id: int, since_at, db) -> bool:
+    """True if, after `since_at`, the user joined or left a group or a crack was removed from one of theirs."""
+    joined = exists().where(GroupMember.user_id == user_id, GroupMember.joined_at > since_at)
+    left = exists().where(
+        SyncTombstone.kind == SyncTombstone.MEMBERSHIP,
+        SyncTombstone.scope_id == user_id,
+        SyncTombstone.deleted_at > since_at,
+    )
+    crack_removed = exists().where(
+        SyncTombstone.kind == SyncTombstone.CRACK,
+        SyncTombstone.scope_id.in_(member_group_ids(user_id)),
+        SyncTombstone.deleted_at > since_at,
+    )
+    return bool(await db.scalar(select(or_(joined, left, crack_removed))))
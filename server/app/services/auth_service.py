@@ -1,30 +1,38 @@
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import select, update
 from app.models.user import User
-from app.utils.password import hash_password, verify_password
+from app.utils.password import hash_password_async, verify_password_async, needs_rehash
 from app.utils.token_generator import generate_jwt
+from app.services.blob_service import store_base64_blob_async
 from config import Config
 
 default_avatar_base64 = Config.DEFAULT_BASE64_AVATAR
 
-def check_email_unique_service(email: str, db):
+async def check_email_unique_service(email: str, db):
     """Check if the email is already registered."""
     # Query the database to find a user with the given email
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User.id).where(User.email == email))
 
     if user:
         return {"success": False, "message": "Email is already registered"} # If email found, return not unique
     
     return {"success": True, "message": "Email is unique"}
 
-def register_user_service(first_name: str, last_name: str, email: str, password: str, db):
+async def register_user_service(first_name: str, last_name: str, email: str, password: str, db):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = await db.scalar(select(User.id).where(User.email == email))
     if existing_user:
         return {"success": False, "message": "User already exists"}
 
+    # End the read transaction so the connection goes back to the pool while hashing
+    await db.rollback()
+
     # Hash the password
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
+
+    # Default avatar is content-addressed, so every user shares one blob
+    avatar = await store_base64_blob_async(default_avatar_base64, db)
 
     # Create new user
     new_user = User(
@@ -32,13 +40,13 @@ def register_user_service(first_name: str, last_name: str, email: str, password:
         last_name=last_name,
         email=email,
         password_hash=hashed_password,
-        avatar_base64=default_avatar_base64,
+        avatar_key=avatar.key if avatar else None,
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc)
     )
 
     db.add(new_user)
-    db.commit()
+    await db.commit()
 
     token = generate_jwt(new_user.id, new_user.email)
 
@@ -51,49 +59,63 @@ def register_user_service(first_name: str, last_name: str, email: str, password:
             "first_name": new_user.first_name,
             "last_name": new_user.last_name,
             "email": new_user.email,
-            "avatar_base64": new_user.avatar_base64
+            "avatar_base64": new_user.avatar_base64,
+            "avatar_url": new_user.avatar_url
         }
     }
 
-def login_user_service(email: str, password: str, db):
+async def login_user_service(email: str, password: str, db):
     """Authenticate a user by email and password."""
     # Find user by email
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         return {"success": False, "message": "Invalid email or password"}
 
+    user_info = {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "avatar_base64": user.avatar_base64,
+        "avatar_url": user.avatar_url
+    }
+    stored_hash = user.password_hash
+
+    # End the read transaction so the connection goes back to the pool while hashing
+    await db.rollback()
+
     # Verify password
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, stored_hash):
         return {"success": False, "message": "Invalid email or password"}
-    
-    token = generate_jwt(user.id, user.email)
+
+    # Upgrade hashes made with an older cost while we have the plain password
+    if needs_rehash(stored_hash):
+        new_hash = await hash_password_async(password)
+        await db.execute(update(User).where(User.id == user_info["id"]).values(password_hash=new_hash))
+        await db.commit()
+
+    token = generate_jwt(user_info["id"], user_info["email"])
 
     return {
         "success": True, 
         "message": "Login successful", 
         "token": token,
-        "user": {
-            "id": user.id,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "email": user.email,
-            "avatar_base64": user.avatar_base64
-        }
+        "user": user_info
     }
 
-def forgot_password_service(email: str, new_password: str, db):
+async def forgot_password_service(email: str, new_password: str, db):
     """Reset user's password."""
+    # Hash the new password before touching the database, so no connection is held while hashing
+    hashed_password = await hash_password_async(new_password)
+
     # Find user by email
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         return {"success": False, "message": "Email not found"}
 
-    # Hash the new password
-    hashed_password = hash_password(new_password)
-
     # Update user's password
     user.password_hash = hashed_password
     user.updated_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
 
     return {"success": True, "message": "Password reset successfully"}
\ No newline at end of file
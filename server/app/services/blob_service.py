@@ -0,0 +1,239 @@
+import asyncio
+import base64
+import binascii
+import io
+from datetime import datetime, timezone
+from PIL import Image, UnidentifiedImageError
+from sqlalchemy.exc import IntegrityError
+
+from app.models.blob import Blob
+from app.models.blob_rendition import BlobRendition
+from app.utils.blob_store import get_blob_store, content_key
+from config import Config
+
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+# Rendition name -> longest side in pixels
+RENDITION_SIZES = {
+    "small": Config.RENDITION_SMALL_SIZE,
+    "medium": Config.RENDITION_MEDIUM_SIZE,
+}
+
+
+def decode_base64(data: str) -> bytes | None:
+    """Decode a base64 payload, accepting an optional data-URL prefix."""
+    if not data:
+        return None
+
+    if "," in data:
+        data = data.split(",", 1)[1]
+
+    try:
+        return base64.b64decode(data, validate=False)
+    except (binascii.Error, ValueError):
+        return None
+
+def describe_image(data: bytes) -> dict:
+    """Read dimensions and MIME type from image bytes without decoding pixels."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            return {
+                "width": img.width,
+                "height": img.height,
+                "mime_type": Image.MIME.get(img.format, DEFAULT_MIME_TYPE),
+            }
+    except (UnidentifiedImageError, OSError):
+        return {"width": None, "height": None, "mime_type": DEFAULT_MIME_TYPE}
+
+def prepare_blob(data: bytes, mime_type: str | None = None) -> dict:
+    """Write bytes to the blob store and return the metadata for its DB row."""
+    key = content_key(data)
+    info = describe_image(data)
+    if mime_type:
+        info["mime_type"] = mime_type
+
+    get_blob_store().put(key, data, info["mime_type"])
+
+    return {"key": key, "size": len(data), **info}
+
+def store_blob(data: bytes, db, mime_type: str | None = None) -> Blob:
+    """Store bytes in the blob store and return the (possibly existing) Blob row."""
+    info = prepare_blob(data, mime_type)
+
+    blob = db.query(Blob).filter(Blob.key == info["key"]).first()
+    if blob:
+        return blob
+
+    blob = Blob(**info, created_at=datetime.now(timezone.utc))
+    try:
+        with db.begin_nested():
+            db.add(blob)
+    except IntegrityError:
+        # Another request stored the same bytes first; use its row
+        blob = db.get(Blob, info["key"])
+
+    return blob
+
+def store_base64_blob(data: str, db) -> Blob | None:
+    """Decode a base64 image and store it. Returns None for empty/invalid input."""
+    raw = decode_base64(data)
+    if not raw:
+        return None
+
+    return store_blob(raw, db)
+
+def make_rendition(data: bytes, max_size: int) -> bytes | None:
+    """Downscale image bytes to fit within max_size x max_size as a JPEG."""
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", (max_size, max_size))  # Lets JPEG decode at reduced scale
+            img = img.convert("RGB")
+            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=Config.RENDITION_JPEG_QUALITY, optimize=True)
+            return buffer.getvalue()
+    except (UnidentifiedImageError, OSError):
+        return None
+
+def create_rendition(source_key: str, name: str, data: bytes, db) -> Blob | None:
+    """Generate one named rendition of an image and link it to the source blob."""
+    existing = db.query(BlobRendition).filter_by(source_key=source_key, name=name).first()
+    if existing:
+        return existing.blob
+
+    rendition_data = make_rendition(data, RENDITION_SIZES[name])
+    if rendition_data is None:
+        return None
+
+    blob = store_blob(rendition_data, db)
+    db.add(BlobRendition(source_key=source_key, name=name, blob_key=blob.key))
+    db.flush()
+
+    return blob
+
+def create_renditions(source: Blob, data: bytes, db):
+    """Generate every configured rendition for a freshly stored image."""
+    if not source.mime_type.startswith("image/"):
+        return
+
+    for name in RENDITION_SIZES:
+        create_rendition(source.key, name, data, db)
+
+def store_image_base64(data: str, db) -> Blob | None:
+    """Store a base64 image together with its small/medium renditions."""
+    raw = decode_base64(data)
+    if not raw:
+        return None
+
+    blob = store_blob(raw, db)
+    create_renditions(blob, raw, db)
+
+    return blob
+
+def prepare_image(data: bytes) -> tuple[dict, dict]:
+    """
+    Write an image and its renditions to the blob store without touching the
+    database. Returns (source metadata, {rendition name: metadata}).
+    """
+    source = prepare_blob(data)
+    renditions = {}
+
+    if source["mime_type"].startswith("image/"):
+        for name, max_size in RENDITION_SIZES.items():
+            rendition_data = make_rendition(data, max_size)
+            if rendition_data is not None:
+                renditions[name] = prepare_blob(rendition_data)
+
+    return source, renditions
+
+async def save_blob_row_async(info: dict, db) -> Blob:
+    """Return the Blob row for prepared metadata, adding it if it is new."""
+    blob = await db.get(Blob, info["key"])
+    if blob:
+        return blob
+
+    blob = Blob(**info, created_at=datetime.now(timezone.utc))
+    try:
+        async with db.begin_nested():
+            db.add(blob)
+    except IntegrityError:
+        # Another request stored the same bytes first; use its row
+        blob = await db.get(Blob, info["key"])
+
+    return blob
+
+async def store_base64_blob_async(data: str, db) -> Blob | None:
+    """store_base64_blob for an AsyncSession; hashing and the blob write run in a worker thread."""
+    raw = decode_base64(data)
+    if not raw:
+        return None
+
+    info = await asyncio.to_thread(prepare_blob, raw)
+    return await save_blob_row_async(info, db)
+
+async def store_image_base64_async(data: str, db) -> Blob | None:
+    """store_image_base64 for an AsyncSession; decoding and resizing run in a worker thread."""
+    raw = decode_base64(data)
+    if not raw:
+        return None
+
+    source_info, rendition_infos = await asyncio.to_thread(prepare_image, raw)
+    return await save_image_rows_async(source_info, rendition_infos, db)
+
+async def save_image_rows_async(source_info: dict, rendition_infos: dict, db) -> Blob:
+    """Add the rows for an image written by prepare_image and link its renditions."""
+    blob = await save_blob_row_async(source_info, db)
+
+    for name, info in rendition_infos.items():
+        rendition = await save_blob_row_async(info, db)
+        if not await db.get(BlobRendition, (blob.key, name)):
+            try:
+                async with db.begin_nested():
+                    db.add(BlobRendition(source_key=blob.key, name=name, blob_key=rendition.key))
+            except IntegrityError:
+                pass  # Another request linked the same rendition first
+
+    return blob
+
+def fetch_blob_service(key: str, db):
+    """Fetch a blob's metadata and bytes. Returns None if it does not exist."""
+    blob = db.query(Blob).filter(Blob.key == key).first()
+    if not blob:
+        return None
+
+    data = get_blob_store().get(key)
+    if data is None:
+        return None
+
+    return blob, data
+
+def fetch_rendition_service(key: str, name: str, db):
+    """
+    Fetch a rendition's metadata and bytes, generating it on first use for
+    images stored before renditions existed. Returns None if unavailable.
+    """
+    if name not in RENDITION_SIZES:
+        return None
+
+    rendition = db.query(BlobRendition).filter_by(source_key=key, name=name).first()
+    if rendition:
+        return fetch_blob_service(rendition.blob_key, db)
+
+    source = fetch_blob_service(key, db)
+    if not source:
+        return None
+
+    blob = create_rendition(key, name, source[1], db)
+    if not blob:
+        return None
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request generated the same rendition first; use theirs
+        db.rollback()
+        rendition = db.query(BlobRendition).filter_by(source_key=key, name=name).first()
+        return fetch_blob_service(rendition.blob_key, db) if rendition else None
+
+    return fetch_blob_service(blob.key, db)
@@ -0,0 +1,27 @@
+from sqlalchemy import select
+
+from app.models.group_member import GroupMember
+
+
+# Tags for cached responses; a write bumps the tags of every response it changes
+def group_info_tag(group_id: int) -> str:
+    return f"group-info:{group_id}"
+
+def user_groups_tag(user_id: int) -> str:
+    return f"user-groups:{user_id}"
+
+def activity_tag(user_id: int) -> str:
+    return f"activity:{user_id}"
+
+
+def group_member_ids(group_ids):
+    """Statement for the distinct users in any of these groups."""
+    return select(GroupMember.user_id).where(GroupMember.group_id.in_(list(group_ids))).distinct()
+
+async def member_tags(group_ids, db, *tag_functions) -> list[str]:
+    """Tags of every member of these groups, e.g. member_tags(ids, db, activity_tag)."""
+    if not group_ids:
+        return []
+
+    user_ids = (await db.scalars(group_member_ids(group_ids))).all()
+    return [tag(user_id) for user_id in user_ids for tag in tag_functions]
@@ -1,80 +1,416 @@
-from datetime import datetime, timezone
+import asyncio
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only
 from app.models.user import User
 from app.models.crack import Crack
 from app.models.group_member import GroupMember
 from app.models.crack_group import CrackGroup
-from app.models.group import Group
+from app.models.sync_tombstone import SyncTombstone
+from app.services.blob_service import decode_base64, prepare_image, save_image_rows_async, store_image_base64_async
+from app.services.cache_service import activity_tag, member_tags
+from app.services.inference_service import predict_base64_image, predict_image
+from app.services.stats_service import record_crack_added, record_crack_removed
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, clamp_page_size, encode_cursor, decode_cursor, parse_datetime
+from app.utils.response_cache import invalidate
+from app.utils.sync import encode_sync_token, parse_since, sync_checkpoint
+from config import Config
 
-def fetch_cracks_service(group_id: int, db):
-    """Fetch cracks for a specific group."""
-    # Query the database to find cracks associated with the group
-    cracks = db.query(Crack).join(CrackGroup).filter(CrackGroup.group_id == group_id).all()
+async def ensure_crack_images(cracks: list[Crack], db) -> bool:
+    """
+    Move legacy base64 images into the blob store on first read, so list
+    responses can always point at renditions. Returns True if any row changed.
+    """
+    pending = {crack.id: crack for crack in cracks if not crack.image_key}
+    if not pending:
+        return False
 
-    if not cracks:
-        return {"success": False, "message": "No cracks found for this group"}
+    # The legacy column is deferred on list queries; load it for just these rows
+    legacy_images = await db.execute(
+        select(Crack.id, Crack.image_base64).where(Crack.id.in_(pending), Crack.image_base64.is_not(None))
+    )
+
+    changed = False
+    for crack_id, image_base64 in legacy_images.all():
+        image = await store_image_base64_async(image_base64, db)
+        if not image:
+            continue
+
+        pending[crack_id].image_key = image.key
+        pending[crack_id].image_base64 = None
+        changed = True
+
+    return changed
+
+def crack_list_query(group_id: int, severity=None, date_from: str = None, date_to: str = None):
+    """A group's cracks with the list filters applied, unordered."""
+    # Only the columns the list needs; the legacy image column stays deferred
+    query = (
+        select(Crack)
+        .options(load_only(Crack.id, Crack.user_id, Crack.image_key, Crack.probability, Crack.severity, Crack.detected_at, Crack.annotations))
+        .join(CrackGroup, CrackGroup.crack_id == Crack.id)
+        .where(CrackGroup.group_id == group_id)
+    )
+
+    if severity:
+        severities = [severity] if isinstance(severity, str) else list(severity)
+        query = query.where(Crack.severity.in_(severities))
+
+    start = parse_datetime(date_from)
+    if start:
+        query = query.where(Crack.detected_at >= start)
+
+    end = parse_datetime(date_to)
+    if end and len(date_to) <= 10:
+        # A plain date includes that whole day, like /stats and reports
+        query = query.where(Crack.detected_at < end + timedelta(days=1))
+    elif end:
+        query = query.where(Crack.detected_at <= end)
+
+    return query
+
+async def fetch_cracks_service(
+    group_id: int,
+    db,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    severity=None,
+    date_from: str = None,
+    date_to: str = None,
+):
+    """
+    Fetch one page of cracks for a specific group, newest first.
+
+    Pages are keyed on (detected_at, id) so each page is an index range scan
+    regardless of how deep the client has scrolled. Pass the returned
+    next_cursor to get the following page.
+    """
+    limit = clamp_page_size(limit)
+    query = crack_list_query(group_id, severity, date_from, date_to)
+
+    try:
+        position = decode_cursor(cursor, datetime, int)
+    except ValueError:
+        return {"success": False, "message": "Invalid cursor", "cracks": [], "next_cursor": None}
+
+    if position:
+        last_detected_at, last_id = position
+        query = query.where(
+            or_(
+                Crack.detected_at < last_detected_at,
+                and_(Crack.detected_at == last_detected_at, Crack.id < last_id),
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    cracks = (await db.scalars(query.order_by(Crack.detected_at.desc(), Crack.id.desc()).limit(limit + 1))).all()
+    has_more = len(cracks) > limit
+    cracks = cracks[:limit]
+
+    if not cracks and not position:
+        return {"success": False, "message": "No cracks found for this group", "cracks": [], "next_cursor": None}
+
+    if await ensure_crack_images(cracks, db):
+        await db.commit()
+
+    next_cursor = encode_cursor(cracks[-1].detected_at, cracks[-1].id) if has_more else None
 
     return {
         "success": True,
         "message": "Cracks fetched successfully",
-        "cracks": [crack.to_dict() for crack in cracks]
+        "cracks": [crack.to_dict() for crack in cracks],
+        "next_cursor": next_cursor
+    }
+
+async def sync_cracks_service(
+    group_id: int,
+    db,
+    since: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    severity=None,
+    date_from: str = None,
+    date_to: str = None,
+):
+    """
+    The first page of a group's cracks for a client that keeps a copy.
+
+    Without `since` (or with one too old to answer) this is fetch_cracks_service's
+    first page with "full": True. With a previous server_time it returns only
+    the cracks added since then and the IDs of removed ones.
+    """
+    started = sync_checkpoint()
+    since_at = parse_since(since)
+
+    if since_at is not None:
+        added = (await db.scalars(
+            crack_list_query(group_id, severity, date_from, date_to)
+            .where(CrackGroup.added_at > since_at)
+            .order_by(Crack.detected_at.desc(), Crack.id.desc())
+            .limit(MAX_PAGE_SIZE + 1)
+        )).all()
+
+        # Too much changed to be worth merging; send a fresh first page instead
+        if len(added) <= MAX_PAGE_SIZE:
+            removed_ids = (await db.scalars(
+                select(SyncTombstone.object_id).distinct().where(
+                    SyncTombstone.kind == SyncTombstone.CRACK,
+                    SyncTombstone.scope_id == group_id,
+                    SyncTombstone.deleted_at > since_at,
+                )
+            )).all()
+
+            if await ensure_crack_images(added, db):
+                await db.commit()
+
+            return {
+                "success": True,
+                "full": False,
+                "cracks": [crack.to_dict() for crack in added],
+                "removed_ids": list(removed_ids),
+                # Unchanged groups repeat the client's token, so the response is identical and revalidates to a 304
+                "server_time": encode_sync_token(started if added or removed_ids else since_at),
+            }
+
+    page = await fetch_cracks_service(group_id, db, limit=limit, severity=severity, date_from=date_from, date_to=date_to)
+    return {**page, "full": True, "server_time": encode_sync_token(started)}
+
+def is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def is_number(value) -> bool:
+    return (is_int(value) or isinstance(value, float)) and math.isfinite(value)
+
+def clean_annotations(annotations):
+    """
+    The annotation record to store, or None if it is missing, too large or
+    does not match what clients draw: positive int width/height, numeric
+    probability/threshold, contours of [x, y] int points and [x, y, w, h]
+    int boxes. Unknown keys are dropped.
+    """
+    if not isinstance(annotations, dict) or len(json.dumps(annotations)) > Config.ANNOTATIONS_MAX_BYTES:
+        return None
+
+    width, height = annotations.get("width"), annotations.get("height")
+    if not (is_int(width) and is_int(height) and width > 0 and height > 0):
+        return None
+    if not (is_number(annotations.get("probability")) and is_number(annotations.get("threshold"))):
+        return None
+
+    contours, boxes = annotations.get("contours", []), annotations.get("boxes", [])
+    if not isinstance(contours, list) or not isinstance(boxes, list):
+        return None
+    for contour in contours:
+        if not isinstance(contour, list) or not all(
+            isinstance(point, list) and len(point) == 2 and all(is_int(v) for v in point) for point in contour
+        ):
+            return None
+    if not all(isinstance(box, list) and len(box) == 4 and all(is_int(v) for v in box) for box in boxes):
+        return None
+
+    return {
+        "version": annotations["version"] if is_int(annotations.get("version")) else 1,
+        "probability": annotations["probability"],
+        "threshold": annotations["threshold"],
+        "width": width,
+        "height": height,
+        "contours": contours,
+        "boxes": boxes,
     }
 
-def add_crack_service(user_id: int, image_base64: str, probability: float, severity: str, db):
+async def add_crack_service(user_id: int, image_base64: str, probability: float, severity: str, db, annotations: dict = None):
     """Add a crack and link it to all groups where the user is a member."""
 
     # 1️⃣ Validate user
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    user_exists = await db.scalar(select(User.id).where(User.id == user_id))
+    if not user_exists:
         return {"success": False, "message": "User not found"}
 
     # 2️⃣ Find all groups the user belongs to
-    user_groups = (
-        db.query(Group)
-        .join(GroupMember, GroupMember.group_id == Group.id)
-        .filter(GroupMember.user_id == user_id)
-        .all()
-    )
+    group_ids = (await db.scalars(select(GroupMember.group_id).where(GroupMember.user_id == user_id))).all()
+
+    # End the read transaction so the connection goes back to the pool while the image is processed
+    await db.rollback()
+
+    # 3️⃣ Store the image and its renditions in the blob store; the row only keeps the key
+    image = await store_image_base64_async(image_base64, db)
+    if not image:
+        return {"success": False, "message": "Invalid image data"}
 
-    # 3️⃣ Create main crack record
+    # Thin clients may leave classification to the server's model, when it is enabled
+    if probability is None:
+        prediction = await predict_base64_image(image_base64)
+        if prediction:
+            probability, severity = prediction["probability"], prediction["severity"]
+
+    # 4️⃣ Create main crack record
     new_crack = Crack(
         user_id=user_id,
-        image_base64=image_base64,
+        image_key=image.key,
         probability=probability,
         severity=severity,
-        detected_at=datetime.now(timezone.utc)
+        detected_at=datetime.now(timezone.utc),
+        annotations=clean_annotations(annotations),
     )
     db.add(new_crack)
-    db.flush()  # IMPORTANT! ensures new_crack.id exists before creating CrackGroup
+    await db.flush()  # IMPORTANT! ensures new_crack.id exists before creating CrackGroup
 
-    # 4️⃣ Link crack to all groups (many-to-many)
-    for group in user_groups:
+    # 5️⃣ Link crack to all groups (many-to-many)
+    for group_id in group_ids:
         link = CrackGroup(
             crack_id=new_crack.id,
-            group_id=group.id,
+            group_id=group_id,
             added_at=datetime.now(timezone.utc)
         )
         db.add(link)
 
-    # 5️⃣ Commit everything
-    db.commit()
-    db.refresh(new_crack)
+    # 6️⃣ Count it in the user's and groups' daily statistics
+    await record_crack_added(new_crack, group_ids, db)
+
+    # 7️⃣ Commit everything
+    await db.commit()
+
+    # 8️⃣ The crack now shows in the activity feed of everyone in those groups
+    await invalidate(await member_tags(group_ids, db, activity_tag))
 
     return {
         "success": True,
         "message": "Crack added successfully",
-        "crack_id": new_crack.id
+        "crack_id": new_crack.id,
+        "image_url": new_crack.image_url
     }    
 
-def delete_crack_from_group_service(crack_id: int, group_id: int, db):
+def bulk_detected_at(value) -> datetime | None:
+    """When an imported photo was taken, in UTC (naive times are taken as UTC). None if unreadable."""
+    if not value:
+        return datetime.now(timezone.utc)
+
+    detected_at = parse_datetime(value)
+    if detected_at is None:
+        return None
+    if detected_at.tzinfo is None:
+        return detected_at.replace(tzinfo=timezone.utc)
+    return detected_at.astimezone(timezone.utc)
+
+async def bulk_add_cracks_service(user_id: int, group_id: int, cracks: list, db):
+    """
+    Add a batch of imported cracks to one group. Each item has image_base64
+    and optionally probability, severity, detected_at (when the photo
+    was taken) and annotations. An image already in the group is reported as a duplicate
+    with its existing crack_id, so a retried batch never adds it twice.
+    """
+    if not isinstance(cracks, list) or not cracks:
+        return {"success": False, "message": "No cracks provided"}
+    if len(cracks) > Config.BULK_ADD_MAX_CRACKS:
+        return {"success": False, "message": f"At most {Config.BULK_ADD_MAX_CRACKS} cracks per request"}
+
+    if not await db.scalar(select(User.id).where(User.id == user_id)):
+        return {"success": False, "message": "User not found"}
+
+    is_member = await db.scalar(
+        select(GroupMember.id).where(GroupMember.group_id == group_id, GroupMember.user_id == user_id)
+    )
+    if not is_member:
+        return {"success": False, "message": "You are not a member of this group"}
+
+    # Release the connection while images are decoded and written to the blob store
+    await db.rollback()
+
+    results = [None] * len(cracks)
+    raw_images = {}
+    for index, item in enumerate(cracks):
+        raw = decode_base64(item.get("image_base64")) if isinstance(item, dict) else None
+        detected_at = bulk_detected_at(item.get("detected_at")) if isinstance(item, dict) else None
+        if not raw:
+            results[index] = {"index": index, "success": False, "message": "Invalid image data"}
+        elif detected_at is None:
+            results[index] = {"index": index, "success": False, "message": "Invalid detected_at"}
+        else:
+            raw_images[index] = (raw, detected_at)
+
+    async def predict_missing(index, raw):
+        return await predict_image(raw) if cracks[index].get("probability") is None else None
+
+    # Classify every image sent without a probability together, so they share
+    # micro-batches, and before the first query so no connection waits on them
+    prepared, predictions = await asyncio.gather(
+        asyncio.gather(*(asyncio.to_thread(prepare_image, raw) for raw, _ in raw_images.values())),
+        asyncio.gather(*(predict_missing(index, raw) for index, (raw, _) in raw_images.items())),
+    )
+
+    keys = [source_info["key"] for source_info, _ in prepared]
+    existing = dict((await db.execute(
+        select(Crack.image_key, Crack.id)
+        .join(CrackGroup, CrackGroup.crack_id == Crack.id)
+        .where(CrackGroup.group_id == group_id, Crack.image_key.in_(keys))
+    )).all()) if keys else {}
+
+    added = []
+    now = datetime.now(timezone.utc)
+    for (index, (raw, detected_at)), (source_info, rendition_infos), prediction in zip(raw_images.items(), prepared, predictions):
+        key = source_info["key"]
+        if key in existing:
+            results[index] = {"index": index, "success": True, "duplicate": True, "crack_id": existing[key]}
+            continue
+
+        item = cracks[index]
+        probability, severity = item.get("probability"), item.get("severity")
+        if prediction:
+            probability, severity = prediction["probability"], prediction["severity"]
+
+        image = await save_image_rows_async(source_info, rendition_infos, db)
+        crack = Crack(
+            user_id=user_id,
+            image_key=image.key,
+            probability=probability,
+            severity=severity,
+            detected_at=detected_at,
+            annotations=clean_annotations(item.get("annotations")),
+        )
+        db.add(crack)
+        await db.flush()
+
+        db.add(CrackGroup(crack_id=crack.id, group_id=group_id, added_at=now))
+        await record_crack_added(crack, [group_id], db)
+
+        existing[key] = crack.id
+        added.append(crack)
+        results[index] = {"index": index, "success": True, "duplicate": False, "crack_id": crack.id}
+
+    await db.commit()
+
+    if added:
+        await invalidate(await member_tags([group_id], db, activity_tag))
+
+    return {
+        "success": True,
+        "added": len(added),
+        "duplicates": sum(1 for result in results if result.get("duplicate")),
+        "failed": sum(1 for result in results if not result["success"]),
+        "results": results,
+    }
+
+async def delete_crack_from_group_service(crack_id: int, group_id: int, db):
     """Delete a crack from a specific group."""
     # Check if the crack exists
-    crack_group = db.query(CrackGroup).filter(
+    crack_group = await db.scalar(select(CrackGroup).where(
         CrackGroup.crack_id == crack_id,
         CrackGroup.group_id == group_id
-    ).first()
+    ))
+
+    if not crack_group:
+        return {"success": False, "message": "Crack not found in this group"}
+
+    crack = await db.scalar(
+        select(Crack).options(load_only(Crack.severity, Crack.probability, Crack.detected_at)).where(Crack.id == crack_id)
+    )
 
-    # Delete the crack from the group
-    db.delete(crack_group)
-    db.commit()
+    # Delete the crack from the group, leaving a tombstone for clients syncing with since=
+    await db.delete(crack_group)
+    await record_crack_removed(crack, group_id, db)
+    db.add(SyncTombstone(kind=SyncTombstone.CRACK, scope_id=group_id, object_id=crack_id))
+    await db.commit()
+    await invalidate(await member_tags([group_id], db, activity_tag))
 
-    return {"success": True, "message": "Crack deleted from group successfully"}
+    return {"success": True, "message": "Crack deleted from group successfully"}
\ No newline at end of file
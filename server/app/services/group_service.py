@@ -1,10 +1,42 @@
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.crack_daily_stat import CrackDailyStat
 from app.models.group import Group
 from app.models.group_member import GroupMember
+from app.models.sync_tombstone import SyncTombstone
+from app.models.user import User
+from app.services.stats_service import delete_scope_stats
+from app.services.cache_service import activity_tag, group_info_tag, member_tags, user_groups_tag
+from app.utils.pagination import DEFAULT_PAGE_SIZE, clamp_page_size, encode_cursor, decode_cursor
+from app.utils.response_cache import invalidate, read_through
+from app.utils.sync import encode_sync_token, parse_since, sync_checkpoint
+
+
+def serialize_group(g: Group) -> dict:
+    """Serialize a group with its member list. Expects members to be eager-loaded."""
+    return {
+        "id": g.id,
+        "name": g.name,
+        "pin": g.pin,
+        "admin_id": g.admin_id,
+        "created_at": g.created_at.isoformat(),
+
+        # g.members is a list of GroupMember objects (not users)
+        "members": [
+            {
+                "id": member.id,
+                "user_id": member.user_id,
+                "joined_at": member.joined_at.isoformat()
+            }
+            for member in g.members
+        ]
+    }
 
 
 # CREATE GROUP
-def create_group_service(
+async def create_group_service(
     name: str,
     pin: int,
     admin_id: int,
@@ -19,8 +51,7 @@ def create_group_service(
     )
 
     db.add(new_group)
-    db.commit()
-    db.refresh(new_group)
+    await db.commit()
 
     # Add admin as member
     new_member = GroupMember(
@@ -30,25 +61,26 @@ def create_group_service(
     )
 
     db.add(new_member)
-    db.commit()
+    await db.commit()
+    await invalidate([user_groups_tag(admin_id)])
 
-    return fetch_user_groups_service(admin_id, db)
+    return await fetch_user_groups_service(admin_id, db)
 
 # JOIN GROUP
-def join_group_service(user_id: int, group_id: int, pin: int, db):
+async def join_group_service(user_id: int, group_id: int, pin: int, db):
     """User joins a group."""
 
     # Check if already member
-    existing = db.query(GroupMember).filter_by(
+    existing = await db.scalar(select(GroupMember).filter_by(
         user_id=user_id,
         group_id=group_id
-    ).first()
+    ))
 
     if existing:
         return {"success": False, "message": "User already a member of the group."}
 
     # Verify PIN
-    group = db.query(Group).filter_by(id=group_id).first()
+    group = await db.get(Group, group_id)
     if not group:
         return {"success": False, "message": "Group not found."}
     
@@ -62,79 +94,159 @@ def join_group_service(user_id: int, group_id: int, pin: int, db):
     )
 
     db.add(new_member)
-    db.commit()
+    group.updated_at = datetime.now(timezone.utc)
+    await db.commit()
 
-    return fetch_user_groups_service(user_id, db)
+    # Every member's group list shows this group's members, the new one included
+    tags = await member_tags([group_id], db, user_groups_tag)
+    await invalidate([*tags, group_info_tag(group_id), activity_tag(user_id)])
+
+    return await fetch_user_groups_service(user_id, db)
 
 # FETCH USER'S GROUPS
-def fetch_user_groups_service(user_id: int, db):
-    """Fetch groups a user is a member of."""
-    groups = (
-        db.query(Group)
+async def fetch_user_groups_service(user_id: int, db, since: str = None):
+    """
+    Fetch groups a user is a member of. Cached until a membership in one of them changes.
+
+    With `since` (a previous server_time) only the groups whose members
+    changed after it and the IDs of groups the user left are returned.
+    """
+    since_at = parse_since(since)
+    if since_at is None:
+        return await read_through(user_groups_tag(user_id), [user_groups_tag(user_id)], lambda: load_user_groups(user_id, db))
+
+    started = sync_checkpoint()
+    groups = await fetch_member_groups(user_id, db, Group.updated_at > since_at)
+    removed_ids = (await db.scalars(
+        select(SyncTombstone.object_id).distinct().where(
+            SyncTombstone.kind == SyncTombstone.MEMBERSHIP,
+            SyncTombstone.scope_id == user_id,
+            SyncTombstone.deleted_at > since_at,
+            # Left and joined again since: the group is in `groups` instead
+            SyncTombstone.object_id.not_in(select(GroupMember.group_id).where(GroupMember.user_id == user_id)),
+        )
+    )).all()
+
+    return {
+        "success": True,
+        "full": False,
+        "groups": [serialize_group(g) for g in groups],
+        "removed_ids": list(removed_ids),
+        # Unchanged lists repeat the client's token, so the response is identical and revalidates to a 304
+        "server_time": encode_sync_token(started if groups or removed_ids else since_at),
+    }
+
+async def load_user_groups(user_id: int, db):
+    started = sync_checkpoint()
+    groups = await fetch_member_groups(user_id, db)
+
+    return {"success": True, "full": True, "groups": [serialize_group(g) for g in groups], "server_time": encode_sync_token(started)}
+
+async def fetch_member_groups(user_id: int, db, *conditions) -> list[Group]:
+    """Groups the user belongs to, with members loaded."""
+    return (await db.scalars(
+        select(Group)
         .join(GroupMember)
-        .filter(GroupMember.user_id == user_id)
-        .all()
+        .where(GroupMember.user_id == user_id, *conditions)
+        .options(selectinload(Group.members))
+        # Also called right after create/join; reload rows this session just wrote
+        .execution_options(populate_existing=True)
+    )).all()
+
+# FETCH GROUPS USER IS NOT A MEMBER OF
+async def fetch_groups_service(user_id: int, db):
+    """Fetch groups the user is NOT a member of. Older clients only; see fetch_group_directory_service."""
+
+    groups = (await db.scalars(
+        select(Group)
+        .where(~Group.members.any(GroupMember.user_id == user_id))
+        .options(selectinload(Group.members))
+    )).all()
+
+    return {"success": True, "groups": [serialize_group(g) for g in groups]}
+
+# JOINABLE GROUPS DIRECTORY
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only ever matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+async def fetch_group_directory_service(
+    user_id: int,
+    db,
+    query: str = None,
+    cursor: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+):
+    """
+    Fetch one page of groups the user can join, ordered by name.
+
+    `query` matches the start of the group name, which the index on
+    groups.name can serve. Each group carries a member count instead of its
+    member list. Pass the returned next_cursor to get the following page.
+    """
+    limit = clamp_page_size(limit)
+
+    is_member = exists().where(GroupMember.group_id == Group.id, GroupMember.user_id == user_id)
+    member_count = (
+        select(func.count(GroupMember.id))
+        .where(GroupMember.group_id == Group.id)
+        .correlate(Group)
+        .scalar_subquery()
     )
 
-    result = []
-
-    for g in groups:
-        result.append({
-            "id": g.id,
-            "name": g.name,
-            "pin": g.pin,
-            "admin_id": g.admin_id,
-            "created_at": g.created_at.isoformat(),
-
-            # FIXED: g.members is a list of GroupMember objects (not users)
-            "members": [
-                {
-                    "id": member.id,
-                    "user_id": member.user_id,
-                    "joined_at": member.joined_at.isoformat()
-                }
-                for member in g.members
-            ]
-        })
-
-    return {"success": True, "groups": result}
+    statement = select(Group.id, Group.name, Group.admin_id, Group.created_at, member_count.label("member_count")).where(~is_member)
 
-# FETCH GROUPS USER IS NOT A MEMBER OF
-def fetch_groups_service(user_id: int, db):
-    """Fetch groups the user is NOT a member of."""
+    query = (query or "").strip()
+    if query:
+        statement = statement.where(Group.name.like(f"{escape_like(query)}%", escape="\\"))
 
-    groups = (
-        db.query(Group)
-        .filter(~Group.members.any(GroupMember.user_id == user_id))
-        .all()
-    )
+    try:
+        position = decode_cursor(cursor, str, int)
+    except ValueError:
+        return {"success": False, "message": "Invalid cursor", "groups": [], "next_cursor": None}
 
-    result = []
-
-    for g in groups:
-        result.append({
-            "id": g.id,
-            "name": g.name,
-            "pin": g.pin,
-            "admin_id": g.admin_id,
-            "created_at": g.created_at.isoformat(),
-
-            # Return group members correctly
-            "members": [
-                {
-                    "id": member.id,
-                    "user_id": member.user_id,
-                    "joined_at": member.joined_at.isoformat()
-                }
-                for member in g.members
-            ]
-        })
-
-    return {"success": True, "groups": result}
-
-def fetch_group_info_service(group_id: int, db):
-    """Fetch detailed information about a specific group."""
-    g = db.query(Group).filter_by(id=group_id).first()
+    if position:
+        last_name, last_id = position
+        statement = statement.where(
+            or_(Group.name > last_name, and_(Group.name == last_name, Group.id > last_id))
+        )
+
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(statement.order_by(Group.name, Group.id).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    groups = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "admin_id": row.admin_id,
+            "created_at": row.created_at.isoformat(),
+            "member_count": row.member_count,
+        }
+        for row in rows
+    ]
+
+    return {
+        "success": True,
+        "groups": groups,
+        "next_cursor": encode_cursor(rows[-1].name, rows[-1].id) if has_more else None,
+    }
+
+async def fetch_group_info_service(group_id: int, db):
+    """Fetch detailed information about a specific group. Cached until its members change."""
+    return await read_through(group_info_tag(group_id), [group_info_tag(group_id)], lambda: load_group_info(group_id, db))
+
+async def load_group_info(group_id: int, db):
+    g = await db.scalar(
+        select(Group)
+        .filter_by(id=group_id)
+        .options(
+            selectinload(Group.members)
+            .joinedload(GroupMember.user)
+            .load_only(User.first_name, User.last_name)
+        )
+    )
 
     if not g:
         return {"success": False, "message": "Group not found."}
@@ -158,49 +270,61 @@ def fetch_group_info_service(group_id: int, db):
 
     return {"success": True, "group": group_info}
 
-def edit_member_service(user_id: int, group_id: int, new_role: str, db):
+async def edit_member_service(user_id: int, group_id: int, new_role: str, db):
     """Edit a group member's role."""
-    member = db.query(GroupMember).filter_by(
+    member = await db.scalar(select(GroupMember).filter_by(
         user_id=user_id,
         group_id=group_id
-    ).first()
+    ))
 
     if not member:
         return {"success": False, "message": "Member not found in the group."}
 
     member.role = new_role
-    db.commit()
+    await db.execute(update(Group).where(Group.id == group_id).values(updated_at=datetime.now(timezone.utc)))
+    await db.commit()
+    await invalidate([group_info_tag(group_id)])
 
     return {"success": True, "message": "Member role updated successfully."}
 
-def remove_member_service(user_id: int, group_id: int, db):
+async def remove_member_service(user_id: int, group_id: int, db):
     """Remove a user from a group. if admin, pass the membership to the most oldest member or delete the group if no members left."""
-    member = db.query(GroupMember).filter_by(
+    member = await db.scalar(select(GroupMember).filter_by(
         user_id=user_id,
         group_id=group_id
-    ).first()
+    ))
 
     if not member:
         return {"success": False, "message": "Member not found in the group."}
 
-    db.delete(member)
-    db.commit()
+    # Collected while the leaving member is still listed
+    tags = await member_tags([group_id], db, user_groups_tag)
+    tags += [group_info_tag(group_id), activity_tag(user_id)]
 
-    if user_id == db.query(Group).filter_by(id=group_id).first().admin_id:
+    # The tombstone tells the leaving member's clients to drop the group; the rest see it change
+    await db.delete(member)
+    db.add(SyncTombstone(kind=SyncTombstone.MEMBERSHIP, scope_id=user_id, object_id=group_id))
+    await db.execute(update(Group).where(Group.id == group_id).values(updated_at=datetime.now(timezone.utc)))
+    await db.commit()
+
+    group = await db.get(Group, group_id)
+    if user_id == group.admin_id:
         # User is admin, find the oldest member to transfer admin rights
-        oldest_member = (
-            db.query(GroupMember)
-            .filter(GroupMember.group_id == group_id, GroupMember.user_id != user_id)
+        oldest_member = await db.scalar(
+            select(GroupMember)
+            .where(GroupMember.group_id == group_id, GroupMember.user_id != user_id)
             .order_by(GroupMember.joined_at.asc())
-            .first()
+            .limit(1)
         )
-        group = db.query(Group).filter_by(id=group_id).first()
         if oldest_member:
             group.admin_id = oldest_member.user_id
-            db.commit()
+            await db.commit()
         else:
             # No other members, delete the group
-            db.delete(group)
-            db.commit()
+            await db.execute(delete_scope_stats(CrackDailyStat.GROUP, group.id))
+            await db.delete(group)
+            await db.commit()
+
+    await invalidate(tags)
 
     return {"success": True, "message": "Member removed from the group successfully."}
\ No newline at end of file
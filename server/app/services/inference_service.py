@@ -0,0 +1,49 @@
+import asyncio
+
+from app.services.blob_service import decode_base64
+from app.utils.inference import get_batcher, preprocess_image, severity_for
+from config import Config
+
+
+async def predict_image(data: bytes) -> dict | None:
+    """Probability and severity for raw image bytes, or None if inference is off or the image is unreadable."""
+    batcher = get_batcher()
+    if batcher is None:
+        return None
+
+    image = await asyncio.to_thread(preprocess_image, data)
+    if image is None:
+        return None
+
+    probability = await batcher.submit(image)
+    return {"probability": round(probability, 4), "severity": severity_for(probability)}
+
+async def predict_base64_image(data: str) -> dict | None:
+    """predict_image for a base64 payload; None if inference is off or the image is invalid."""
+    if get_batcher() is None:
+        return None
+
+    raw = decode_base64(data) if isinstance(data, str) else None
+    if raw is None:
+        return None
+
+    return await predict_image(raw)
+
+async def predict_images_service(images_base64: list[str]):
+    """
+    Classify base64 images with the server's copy of the crack model.
+    Requests arriving together share one interpreter invoke.
+    """
+    if get_batcher() is None:
+        return {"success": False, "message": "Server inference is disabled"}
+
+    if not images_base64 or not isinstance(images_base64, list):
+        return {"success": False, "message": "No images provided"}
+    if len(images_base64) > Config.INFERENCE_MAX_IMAGES_PER_REQUEST:
+        return {"success": False, "message": f"At most {Config.INFERENCE_MAX_IMAGES_PER_REQUEST} images per request"}
+
+    predictions = await asyncio.gather(*(predict_base64_image(data) for data in images_base64))
+    if any(prediction is None for prediction in predictions):
+        return {"success": False, "message": "Invalid image data"}
+
+    return {"success": True, "predictions": predictions}
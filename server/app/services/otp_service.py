@@ -1,27 +1,24 @@
-from datetime import datetime, timezone, timedelta
-from app.models.otp import OTP
+from datetime import datetime, timezone
 from app.models.user import User
-from app.utils.otp import generate_otp, verify_otp
-from app.utils.email import send_email
-from app.templates.otp_template import otp_email_template, forgot_password_otp_template
+from app.utils.otp import generate_otp, verify_otp, is_expired
+from app.utils.otp_store import get_otp_store
+from app.utils.email import queue_email
+from app.workers.email_sender import wake_email_sender
+from app.templates.email_renderer import render_email
 
 OTP_EXPIRATION_MINUTES = 5
 
-def send_email_otp(email: str, name: str, resend: bool, db):
+def send_email_otp(email: str, name: str, resend: bool, db, locale: str = None):
     now = datetime.now(timezone.utc)
+    store = get_otp_store()
 
     if resend:
         # Delete existing OTPs for this email
-        db.query(OTP).filter(OTP.email == email).delete()
-        db.commit()
+        store.delete(email, db)
 
     # Check if user already has a VALID, UNEXPIRED OTP
-    valid_otp = (
-        db.query(OTP)
-        .filter(OTP.email == email, OTP.expires_at > now)
-        .order_by(OTP.created_at.desc())
-        .first()
-    )
+    last_otp = store.latest(email, db)
+    valid_otp = last_otp and not is_expired(last_otp, now)
 
     if valid_otp and not resend:
         # Ignore and return success but clarify nothing was sent
@@ -30,39 +27,35 @@ def send_email_otp(email: str, name: str, resend: bool, db):
     # Generate a new OTP
     otp_code = generate_otp()
 
-    # Save OTP to database
-    new_otp = OTP(
-        email=email,
-        otp=otp_code,
-        created_at=now,
-        expires_at=now + timedelta(minutes=OTP_EXPIRATION_MINUTES)
-    )
-    db.add(new_otp)
-    db.commit()
+    # Save OTP
+    store.put(email, otp_code, OTP_EXPIRATION_MINUTES * 60, db)
 
-    # Send OTP via email
-    subject = "Your One-Time PIN (OTP)"
-    content = otp_email_template(name, otp_code)
-    send_email(email, subject, content)
+    # Queue the OTP email; it is committed with the OTP and sent in the background
+    message = render_email("otp", locale, name=name, otp=otp_code, minutes=OTP_EXPIRATION_MINUTES)
+    queue_email(email, message.subject, message.html, db, text=message.text)
+    db.commit()
+    wake_email_sender()
 
     return {"success": True, "message": "OTP has been sent to your email"}
 
 def verify_entered_otp(email: str, entered_otp: str, db):
     now = datetime.now(timezone.utc)
 
+    store = get_otp_store()
+
     # Get the latest OTP for this email
-    last_otp = db.query(OTP).filter(OTP.email == email).order_by(OTP.created_at.desc()).first()
+    last_otp = store.latest(email, db)
 
     if not verify_otp(last_otp, entered_otp, now):
         return {"success": False, "message": "Invalid OTP"}
 
     # Optional: delete the OTP after successful verification
-    db.delete(last_otp)
+    store.delete(email, db)
     db.commit()
 
     return {"success": True, "message": "Email has been verified"}
 
-def send_forgot_password_otp(email: str, db):
+def send_forgot_password_otp(email: str, db, locale: str = None):
     """Send OTP for forgot password functionality addressing to the first name."""
     user = db.query(User).filter(User.email == email).first()
     if not user:
@@ -71,18 +64,11 @@ def send_forgot_password_otp(email: str, db):
     name = user.first_name
     otp = generate_otp()
 
-    new_otp = OTP(
-        email=email,
-        otp=otp,
-        created_at=datetime.now(timezone.utc),
-        expires_at=datetime.now(timezone.utc) + timedelta(minutes=OTP_EXPIRATION_MINUTES)
-    )
+    get_otp_store().put(email, otp, OTP_EXPIRATION_MINUTES * 60, db)
 
-    db.add(new_otp)
+    message = render_email("forgot_password", locale, name=name, otp=otp, minutes=OTP_EXPIRATION_MINUTES)
+    queue_email(email, message.subject, message.html, db, text=message.text)
     db.commit()
-
-    subject = "Your Password Reset OTP"
-    content = forgot_password_otp_template(name, otp)
-    send_email(email, subject, content)
+    wake_email_sender()
 
     return {"success": True, "message": "OTP has been sent to your email"}
\ No newline at end of file
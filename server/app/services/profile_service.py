@@ -1,102 +1,152 @@
+import asyncio
 from datetime import datetime, timezone
+from sqlalchemy import case, func, select
 from app.models.user import User
+from app.models.crack import Crack
+from app.models.crack_daily_stat import CrackDailyStat
 from app.models.group import Group
 from app.models.group_member import GroupMember
-from app.utils.password import hash_password, verify_password
+from app.utils.password import hash_password_async, verify_password_async
 from app.utils.pdf import generate_user_pdf
+from app.services.blob_service import store_base64_blob_async
+from app.services.stats_service import delete_scope_stats
+from app.services.cache_service import activity_tag, group_info_tag, member_tags, user_groups_tag
+from app.utils.response_cache import invalidate
 
-def update_profile(profile_data: dict, new_password, db):
+# Fields clients may send back but must never be written directly
+READ_ONLY_PROFILE_FIELDS = {"id", "password_hash", "avatar_key", "avatar_url", "created_at", "updated_at"}
+
+async def update_profile(profile_data: dict, new_password, db):
     """Update user profile with provided data"""
     user_id = profile_data.get("id")
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Hash before touching the database, so no connection is held while hashing
+    new_password_hash = await hash_password_async(new_password) if new_password else None
+
+    profile_data = dict(profile_data)
+
+    # Avatars go to the blob store; the row only keeps the key. Decoding and the blob write run in a worker thread first
+    avatar_base64 = profile_data.pop("avatar_base64", None)
+    avatar = await store_base64_blob_async(avatar_base64, db) if avatar_base64 else None
+
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return {"success": False, "error": "User not found"}
 
+    if avatar:
+        user.avatar_key = avatar.key
+        user.avatar_base64 = None
+
     for key, value in profile_data.items():
-        if hasattr(user, key):
+        if key not in READ_ONLY_PROFILE_FIELDS and hasattr(user, key):
             setattr(user, key, value)
 
-    if new_password:
-        user.password_hash = hash_password(new_password)
+    if new_password_hash:
+        user.password_hash = new_password_hash
 
     user.updated_at = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(user)
-    print("Updated user profile:", user)
+    # Group info lists member names
+    group_ids = (await db.scalars(select(GroupMember.group_id).where(GroupMember.user_id == user_id))).all()
+
+    await db.commit()
+    await db.refresh(user)
+    await invalidate([group_info_tag(group_id) for group_id in group_ids])
 
     return {"success": True, "user": user}
 
-def verify_user_password(user_id: int, old_password: str, db):
+async def verify_user_password(user_id: int, old_password: str, db):
     """Verify if the provided password matches the user's password"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return {"success": False, "error": "User not found"}
 
-    if verify_password(old_password, user.password_hash):
+    # End the read transaction so the connection goes back to the pool while hashing
+    stored_hash = user.password_hash
+    await db.rollback()
+
+    if await verify_password_async(old_password, stored_hash):
         return {"success": True, "message": "Password verified"}
     else:
         return {"success": False, "error": "Incorrect password"}
 
-def download_data(user_id: int, db):
-    """Download user data"""
-    user = db.query(User).filter(User.id == user_id).first()
+async def download_data(user_id: int, db):
+    """Build the user's data report as PDF bytes, in memory"""
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return {"success": False, "error": "User not found"}
 
-    generated_pdf_path = f"user_{user_id}_data.pdf"
-    generate_user_pdf(
-        {
-            "id": user.id,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "email": user.email,
-            "joined_at": user.created_at.strftime("%Y-%m-%d"),
-            # "scans_done": user.scans_done,
-            # "cracks_detected": user.cracks_detected,
-            # "last_scan": user.last_scan.strftime("%Y-%m-%d") if user.last_scan else "N/A",
-        },
-        output_path=generated_pdf_path
-    )
-    with open(generated_pdf_path, "rb") as pdf_file:
-        pdf_content = pdf_file.read()
-
-    return pdf_content
-
-def delete_account(user_id: int, password: str, db):
+    # Every saved scan is a crack row; "None" means no crack was found
+    scans_done, cracks_detected, last_scan = (await db.execute(
+        select(
+            func.count(Crack.id),
+            func.sum(case((Crack.severity != "None", 1), else_=0)),
+            func.max(Crack.detected_at),
+        ).where(Crack.user_id == user_id)
+    )).one()
+
+    user_data = {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "joined_at": user.created_at.strftime("%Y-%m-%d"),
+        "scans_done": scans_done,
+        "cracks_detected": cracks_detected or 0,
+        "last_scan": last_scan.strftime("%Y-%m-%d") if last_scan else "N/A",
+    }
+
+    # Release the connection before rendering; the PDF is built in a worker thread
+    await db.rollback()
+    pdf_content = await asyncio.to_thread(generate_user_pdf, user_data)
+
+    return {"success": True, "pdf": pdf_content}
+
+async def delete_account(user_id: int, password: str, db):
     """Delete user account, removeing them from all groups; if admin, pass the membership to the most oldest member after verifying the password"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return {"success": False, "error": "User not found"}
 
-    if not verify_password(password, user.password_hash):
+    # End the read transaction so the connection goes back to the pool while hashing
+    stored_hash = user.password_hash
+    await db.rollback()
+
+    if not await verify_password_async(password, stored_hash):
         return {"success": False, "error": "Incorrect password"}
 
     # Find all groups where the user is a member
-    group_memberships = db.query(GroupMember).filter(GroupMember.user_id == user_id).all()
+    group_memberships = (await db.scalars(select(GroupMember).where(GroupMember.user_id == user_id))).all()
+
+    group_ids = [membership.group_id for membership in group_memberships]
+    tags = await member_tags(group_ids, db, user_groups_tag, activity_tag)
+    tags += [group_info_tag(group_id) for group_id in group_ids]
 
     for membership in group_memberships:
-        group = db.query(Group).filter(Group.id == membership.group_id).first()
+        group = await db.get(Group, membership.group_id)
+        if group:
+            group.updated_at = datetime.now(timezone.utc)  # Other members' clients see the group change
         if group and group.admin_id == user_id:
             # User is admin, find the oldest member to transfer admin rights
-            oldest_member = (
-                db.query(GroupMember)
-                .filter(GroupMember.group_id == group.id, GroupMember.user_id != user_id)
+            oldest_member = await db.scalar(
+                select(GroupMember)
+                .where(GroupMember.group_id == group.id, GroupMember.user_id != user_id)
                 .order_by(GroupMember.joined_at.asc())
-                .first()
+                .limit(1)
             )
             if oldest_member:
                 group.admin_id = oldest_member.user_id
             else:
                 # No other members, delete the group
-                db.delete(group)
+                await db.delete(group)
+                await db.execute(delete_scope_stats(CrackDailyStat.GROUP, group.id))
 
         # Remove the user's membership
-        db.delete(membership)
+        await db.delete(membership)
 
     # Finally, delete the user account
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    await invalidate(tags)
 
     return {"success": True, "message": "Account deleted successfully"}
\ No newline at end of file
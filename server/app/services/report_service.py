@@ -0,0 +1,94 @@
+import asyncio
+from sqlalchemy import select
+
+from app.models.group_member import GroupMember
+from app.models.report import Report
+from app.models.user import User
+from app.utils.blob_store import get_blob_store
+from app.utils.pagination import parse_date
+from app.utils.reports import report_cache_key, scope_title_query, scope_version_query
+from app.workers.report_builder import wake_report_builder
+
+
+async def request_report_service(user_id: int, scope: str, scope_id, date_from: str, date_to: str, db):
+    """
+    Queue an inspection report, or return an existing one built from the
+    same data. A finished match is ready to download straight away.
+    """
+    if scope not in (Report.USER, Report.GROUP):
+        return {"success": False, "message": "Scope must be 'user' or 'group'"}
+
+    if not await db.scalar(select(User.id).where(User.id == user_id)):
+        return {"success": False, "message": "User not found"}
+
+    # Users report on their own detections, or on a group they belong to
+    if scope == Report.USER:
+        scope_id = user_id
+    else:
+        try:
+            scope_id = int(scope_id)
+        except (TypeError, ValueError):
+            return {"success": False, "message": "Group ID is required"}
+
+        is_member = await db.scalar(
+            select(GroupMember.id).where(GroupMember.group_id == scope_id, GroupMember.user_id == user_id)
+        )
+        if not is_member:
+            return {"success": False, "message": "You are not a member of this group"}
+
+    start, end = parse_date(date_from), parse_date(date_to)
+    if (date_from and not start) or (date_to and not end):
+        return {"success": False, "message": "Dates must be in YYYY-MM-DD format"}
+    if start and end and start > end:
+        return {"success": False, "message": "Start date is after end date"}
+
+    title = await db.scalar(scope_title_query(scope, scope_id))
+    version = (await db.execute(scope_version_query(scope, scope_id, start, end))).one()
+    cache_key = report_cache_key(scope, scope_id, start, end, title, tuple(version))
+
+    existing = await db.scalar(
+        select(Report)
+        .where(Report.cache_key == cache_key, Report.status.in_([Report.PENDING, Report.RUNNING, Report.DONE]))
+        .order_by(Report.id.desc())
+        .limit(1)
+    )
+    if existing:
+        return {"success": True, "cached": existing.status == Report.DONE, "report": existing.to_dict()}
+
+    report = Report(
+        requested_by=user_id,
+        scope=scope,
+        scope_id=scope_id,
+        date_from=start,
+        date_to=end,
+        cache_key=cache_key,
+        status=Report.PENDING,
+        progress=0,
+        attempts=0,
+    )
+    db.add(report)
+    await db.commit()
+
+    wake_report_builder()
+
+    return {"success": True, "cached": False, "report": report.to_dict()}
+
+async def fetch_report_service(report_id: int, db):
+    """Fetch a report's status and progress."""
+    report = await db.get(Report, report_id)
+    if not report:
+        return {"success": False, "message": "Report not found"}
+
+    return {"success": True, "report": report.to_dict()}
+
+async def fetch_report_pdf(report_id: int, db):
+    """Return (report, PDF bytes) for a finished report, or None."""
+    report = await db.get(Report, report_id)
+    if not report or report.status != Report.DONE:
+        return None
+
+    data = await asyncio.to_thread(get_blob_store().get, report.blob_key)
+    if data is None:
+        return None
+
+    return report, data
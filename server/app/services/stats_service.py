@@ -0,0 +1,193 @@
+from datetime import date, datetime, timezone
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects import mysql, sqlite
+
+from app.models.crack import Crack
+from app.models.crack_daily_stat import CrackDailyStat
+from app.models.crack_group import CrackGroup
+from app.models.group_member import GroupMember
+from app.models.user import User
+from app.utils.pagination import parse_date
+
+# Dialects whose INSERT can add to an existing row in the same statement
+UPSERT_DIALECTS = {"mysql": mysql, "sqlite": sqlite}
+
+
+def stat_day(detected_at: datetime) -> date:
+    """The UTC day a crack is counted under."""
+    if detected_at.tzinfo is not None:
+        detected_at = detected_at.astimezone(timezone.utc)
+    return detected_at.date()
+
+def crack_stat_rows(crack: Crack, group_ids) -> list[dict]:
+    """Rollup increments for a new crack: one for its user, one per group it was shared to."""
+    increment = {
+        "day": stat_day(crack.detected_at),
+        "severity": crack.severity or CrackDailyStat.UNKNOWN_SEVERITY,
+        "crack_count": 1,
+        "probability_sum": crack.probability or 0.0,
+        "probability_count": 1 if crack.probability is not None else 0,
+    }
+    rows = [{**increment, "scope": CrackDailyStat.USER, "scope_id": crack.user_id}]
+    rows += [{**increment, "scope": CrackDailyStat.GROUP, "scope_id": group_id} for group_id in group_ids]
+    return rows
+
+def stats_upsert(dialect_name: str, rows: list[dict]):
+    """INSERT the rows, adding to the counts of any that already exist (atomic under concurrent writers)."""
+    dialect = UPSERT_DIALECTS.get(dialect_name)
+    if dialect is None:
+        raise NotImplementedError(f"Crack statistics need an upsert for {dialect_name}")
+
+    statement = dialect.insert(CrackDailyStat).values(rows)
+    if dialect_name == "mysql":
+        return statement.on_duplicate_key_update(
+            crack_count=CrackDailyStat.crack_count + statement.inserted.crack_count,
+            probability_sum=CrackDailyStat.probability_sum + statement.inserted.probability_sum,
+            probability_count=CrackDailyStat.probability_count + statement.inserted.probability_count,
+        )
+
+    return statement.on_conflict_do_update(
+        index_elements=["scope", "scope_id", "day", "severity"],
+        set_={
+            "crack_count": CrackDailyStat.crack_count + statement.excluded.crack_count,
+            "probability_sum": CrackDailyStat.probability_sum + statement.excluded.probability_sum,
+            "probability_count": CrackDailyStat.probability_count + statement.excluded.probability_count,
+        },
+    )
+
+def stats_decrement(crack: Crack, scope: str, scope_id: int):
+    """Take one crack back out of a scope's rollup."""
+    return (
+        update(CrackDailyStat)
+        .where(
+            CrackDailyStat.scope == scope,
+            CrackDailyStat.scope_id == scope_id,
+            CrackDailyStat.day == stat_day(crack.detected_at),
+            CrackDailyStat.severity == (crack.severity or CrackDailyStat.UNKNOWN_SEVERITY),
+        )
+        .values(
+            crack_count=CrackDailyStat.crack_count - 1,
+            probability_sum=CrackDailyStat.probability_sum - (crack.probability or 0.0),
+            probability_count=CrackDailyStat.probability_count - (1 if crack.probability is not None else 0),
+        )
+    )
+
+def delete_scope_stats(scope: str, scope_id: int):
+    """Statement removing a deleted user's or group's rollup."""
+    return delete(CrackDailyStat).where(CrackDailyStat.scope == scope, CrackDailyStat.scope_id == scope_id)
+
+async def record_crack_added(crack: Crack, group_ids, db):
+    """Count a new crack for its user and groups, in the caller's transaction."""
+    await db.execute(stats_upsert(db.get_bind().dialect.name, crack_stat_rows(crack, group_ids)))
+
+async def record_crack_removed(crack: Crack, group_id: int, db):
+    """Uncount a crack removed from a group, in the caller's transaction."""
+    await db.execute(stats_decrement(crack, CrackDailyStat.GROUP, group_id))
+
+def rebuild_daily_stats(db):
+    """Recompute every rollup from the cracks table (used by scripts.rebuild_stats)."""
+    day = func.date(Crack.detected_at)
+    severity = func.coalesce(Crack.severity, CrackDailyStat.UNKNOWN_SEVERITY)
+    aggregates = (severity, func.count(Crack.id), func.coalesce(func.sum(Crack.probability), 0), func.count(Crack.probability))
+    columns = ["scope", "scope_id", "day", "severity", "crack_count", "probability_sum", "probability_count"]
+
+    user_rows = (
+        select(literal(CrackDailyStat.USER), Crack.user_id, day, *aggregates)
+        .where(Crack.user_id.is_not(None), Crack.detected_at.is_not(None))
+        .group_by(Crack.user_id, day, severity)
+    )
+    group_rows = (
+        select(literal(CrackDailyStat.GROUP), CrackGroup.group_id, day, *aggregates)
+        .join(Crack, Crack.id == CrackGroup.crack_id)
+        .where(Crack.detected_at.is_not(None))
+        .group_by(CrackGroup.group_id, day, severity)
+    )
+
+    db.execute(delete(CrackDailyStat))
+    db.execute(insert(CrackDailyStat).from_select(columns, user_rows))
+    db.execute(insert(CrackDailyStat).from_select(columns, group_rows))
+
+
+def summarize(rows) -> dict:
+    """
+    Totals by severity and mean probability for (severity, count, probability
+    sum, probability count) rows. Cracks without a probability are counted
+    but left out of the mean.
+    """
+    by_severity, total, probability_sum, probability_count = {}, 0, 0.0, 0
+    for severity, count, row_probability_sum, row_probability_count in rows:
+        if not count:
+            continue
+        by_severity[severity] = by_severity.get(severity, 0) + count
+        total += count
+        probability_sum += row_probability_sum
+        probability_count += row_probability_count
+
+    return {
+        "total_cracks": total,
+        "by_severity": by_severity,
+        "mean_probability": round(probability_sum / probability_count, 4) if probability_count else None,
+    }
+
+async def fetch_stats_service(user_id: int, scope: str, scope_id, date_from: str, date_to: str, db):
+    """
+    Crack statistics for the user's own detections or one of their groups,
+    over an optional date range: totals and one entry per day with
+    detections. Reads the daily rollup, so the cost grows with the number
+    of days, not the number of cracks.
+    """
+    if scope not in (CrackDailyStat.USER, CrackDailyStat.GROUP):
+        return {"success": False, "message": "Scope must be 'user' or 'group'"}
+
+    if not await db.scalar(select(User.id).where(User.id == user_id)):
+        return {"success": False, "message": "User not found"}
+
+    if scope == CrackDailyStat.USER:
+        scope_id = user_id
+    else:
+        try:
+            scope_id = int(scope_id)
+        except (TypeError, ValueError):
+            return {"success": False, "message": "Group ID is required"}
+
+        is_member = await db.scalar(
+            select(GroupMember.id).where(GroupMember.group_id == scope_id, GroupMember.user_id == user_id)
+        )
+        if not is_member:
+            return {"success": False, "message": "You are not a member of this group"}
+
+    start, end = parse_date(date_from), parse_date(date_to)
+    if (date_from and not start) or (date_to and not end):
+        return {"success": False, "message": "Dates must be in YYYY-MM-DD format"}
+
+    query = (
+        select(
+            CrackDailyStat.day,
+            CrackDailyStat.severity,
+            CrackDailyStat.crack_count,
+            CrackDailyStat.probability_sum,
+            CrackDailyStat.probability_count,
+        )
+        .where(CrackDailyStat.scope == scope, CrackDailyStat.scope_id == scope_id, CrackDailyStat.crack_count > 0)
+        .order_by(CrackDailyStat.day)
+    )
+    if start:
+        query = query.where(CrackDailyStat.day >= start)
+    if end:
+        query = query.where(CrackDailyStat.day <= end)
+
+    rows = (await db.execute(query)).all()
+
+    days = {}
+    for day, *stats in rows:
+        days.setdefault(day, []).append(stats)
+
+    return {
+        "success": True,
+        "scope": scope,
+        "scope_id": scope_id,
+        "date_from": start.isoformat() if start else None,
+        "date_to": end.isoformat() if end else None,
+        "totals": summarize(stats for _, *stats in rows),
+        "days": [{"day": day.isoformat(), **summarize(day_rows)} for day, day_rows in days.items()],
+    }
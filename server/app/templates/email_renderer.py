@@ -0,0 +1,88 @@
+import json
+import os
+import re
+from typing import NamedTuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import escape
+
+from config import Config
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "email")
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), "locales")
+
+# Per-send values; everything else in a template is static for a given locale
+EMAIL_FIELDS = ("name", "otp", "minutes")
+EMAIL_TEMPLATES = ("otp", "forgot_password")
+
+_HOLE = "\x00{}\x00"
+_HOLE_PATTERN = re.compile("\x00(\\w+)\x00")
+
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+)
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+class CompiledEmail:
+    """
+    An email template rendered once for one locale, with holes left for the
+    per-send fields. Sending only joins the static parts with the values.
+    """
+
+    def __init__(self, template: str, strings: dict):
+        context = {"t": strings, **{field: _HOLE.format(field) for field in EMAIL_FIELDS}}
+
+        self.subject = strings["subject"]
+        # re.split with a capture group alternates static text and field names
+        self.html_parts = _HOLE_PATTERN.split(_env.get_template(f"{template}.html").render(context))
+        self.text_parts = _HOLE_PATTERN.split(_env.get_template(f"{template}.txt").render(context))
+
+    @staticmethod
+    def _fill(parts: list[str], values: dict, html: bool) -> str:
+        filled = []
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                filled.append(part)
+            else:
+                value = str(values.get(part, ""))
+                filled.append(str(escape(value)) if html else value)
+        return "".join(filled)
+
+    def render(self, **values) -> RenderedEmail:
+        return RenderedEmail(
+            subject=self.subject,
+            html=self._fill(self.html_parts, values, html=True),
+            text=self._fill(self.text_parts, values, html=False),
+        )
+
+
+def _load_locales() -> dict:
+    locales = {}
+    for filename in sorted(os.listdir(LOCALE_DIR)):
+        if filename.endswith(".json"):
+            with open(os.path.join(LOCALE_DIR, filename), encoding="utf-8") as f:
+                locales[filename[:-len(".json")]] = json.load(f)
+    return locales
+
+def compile_email_templates() -> dict:
+    """Compile every template for every locale. Runs once, at import."""
+    return {
+        (template, locale): CompiledEmail(template, strings[template])
+        for locale, strings in _load_locales().items()
+        for template in EMAIL_TEMPLATES
+    }
+
+_compiled = compile_email_templates()
+
+def render_email(template: str, locale: str | None = None, **values) -> RenderedEmail:
+    """Render a compiled email, falling back to the default locale if `locale` is unknown."""
+    compiled = _compiled.get((template, locale)) or _compiled[(template, Config.EMAIL_DEFAULT_LOCALE)]
+    return compiled.render(**values)
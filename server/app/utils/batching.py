@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching: queues items, and as soon as one arrives waits up
+    to `max_wait_ms` for more (or until `max_batch` are queued), then hands the
+    whole batch to `run_batch` on a dedicated thread and resolves each caller
+    with its own result. `run_batch(items) -> results` must return one result
+    per item, in order.
+
+    `max_wait_ms` is the latency/throughput knob: 0 never waits (batches only
+    form from requests already queued), larger values trade single-request
+    latency for fuller batches.
+    """
+
+    WAIT_SAMPLES = 1000  # Recent queue waits kept for percentiles
+
+    def __init__(self, run_batch, max_batch: int, max_wait_ms: float, name: str = "batcher"):
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.run_seconds = 0.0
+        self.batch_sizes = Counter()
+        self.waits = deque(maxlen=self.WAIT_SAMPLES)
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, item):
+        """Queue one item and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future, time.monotonic()))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            # Take whatever is already queued without waiting
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [entry for entry in await self._collect() if not entry[1].cancelled()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                results = await loop.run_in_executor(self.executor, self.run_batch, [item for item, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._record(batch, started)
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _record(self, batch: list, started: float):
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.run_seconds += time.monotonic() - started
+            self.batch_sizes[len(batch)] += 1
+            self.waits.extend(started - queued_at for _, _, queued_at in batch)
+
+    def status(self) -> dict:
+        """Batch size distribution, queue wait (ms) and time spent running batches."""
+        with self._lock:
+            waits = sorted(self.waits)
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_wait_ms": {
+                    "p50": round(waits[len(waits) // 2] * 1000, 3) if waits else 0.0,
+                    "p95": round(waits[int(len(waits) * 0.95)] * 1000, 3) if waits else 0.0,
+                    "max": round(waits[-1] * 1000, 3) if waits else 0.0,
+                },
+                "mean_run_ms": round(self.run_seconds / self.batches * 1000, 3) if self.batches else 0.0,
+                "queued": self.queue.qsize() if self.queue else 0,
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+            }
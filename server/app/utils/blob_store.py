@@ -0,0 +1,152 @@
+import hashlib
+import os
+import tempfile
+
+from config import Config
+
+
+def content_key(data: bytes) -> str:
+    """Return the content address (SHA-256 hex digest) of the given bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Interface for content-addressed blob storage backends."""
+
+    def put(self, key: str, data: bytes, mime_type: str) -> None:
+        raise NotImplementedError
+
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Stores blobs on the local filesystem, sharded by content hash.
+
+    A blob with key "ab12cd..." is written to <root>/ab/12/ab12cd... so no
+    single directory grows past a few hundred entries.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def put(self, key: str, data: bytes, mime_type: str) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return  # Same content, same key: nothing to do
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temp file first so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """Stores blobs in an S3-compatible bucket (AWS S3, MinIO, R2, ...)."""
+
+    def __init__(self, bucket: str, prefix: str = "", **client_kwargs):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError as e:
+            raise RuntimeError("boto3 is required for BLOB_STORE_BACKEND='s3'") from e
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client_error = ClientError
+        self.client = boto3.client("s3", **client_kwargs)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key[2:4]}/{key}"
+
+    def put(self, key: str, data: bytes, mime_type: str) -> None:
+        if self.exists(key):
+            return
+
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=data,
+            ContentType=mime_type,
+        )
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return response["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except self._client_error:
+            return False
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+_blob_store: BlobStore | None = None
+
+def get_blob_store() -> BlobStore:
+    """Return the configured blob store (created once per process)."""
+    global _blob_store
+
+    if _blob_store is None:
+        backend = Config.BLOB_STORE_BACKEND.lower()
+
+        if backend == "local":
+            _blob_store = LocalBlobStore(Config.BLOB_STORE_ROOT)
+        elif backend == "s3":
+            _blob_store = S3BlobStore(
+                Config.S3_BUCKET,
+                prefix=Config.S3_PREFIX,
+                endpoint_url=Config.S3_ENDPOINT_URL,
+                region_name=Config.S3_REGION,
+                aws_access_key_id=Config.S3_ACCESS_KEY_ID,
+                aws_secret_access_key=Config.S3_SECRET_ACCESS_KEY,
+            )
+        else:
+            raise ValueError(f"Unknown BLOB_STORE_BACKEND: {Config.BLOB_STORE_BACKEND}")
+
+    return _blob_store
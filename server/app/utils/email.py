@@ -1,28 +1,82 @@
 import smtplib
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+from app.models.outbox_email import OutboxEmail
 from config import Config
 
-def send_email(receiver_email, subject, message):
-    SENDER_EMAIL = Config.EMAIL_SENDER
-    APP_PASSWORD = Config.EMAIL_PASSWORD
-
-    msg = MIMEMultipart()
-    msg["From"] = SENDER_EMAIL
+def build_message(receiver_email: str, subject: str, html: str, text: str | None = None) -> MIMEMultipart:
+    """Build a MIME message, with a plain-text alternative when one is given."""
+    msg = MIMEMultipart("alternative")
+    msg["From"] = Config.EMAIL_SENDER
     msg["To"] = receiver_email
     msg["Subject"] = subject
-    msg.attach(MIMEText(message, "html"))
 
-    try:
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(SENDER_EMAIL, APP_PASSWORD)
+    if text:
+        msg.attach(MIMEText(text, "plain"))
+    msg.attach(MIMEText(html, "html"))
+
+    return msg
+
+def queue_email(receiver_email: str, subject: str, html: str, db, text: str | None = None) -> OutboxEmail:
+    """
+    Add a message to the outbox. It is sent by the background email sender
+    once the caller commits, so it is never sent for a rolled-back request.
+    """
+    email = OutboxEmail(
+        recipient=receiver_email,
+        subject=subject,
+        html_body=html,
+        text_body=text,
+    )
+    db.add(email)
+
+    return email
+
+
+class SMTPConnection:
+    """
+    One SMTP connection reused across sends. It is opened on first use,
+    reopened if the server drops it, and closed after sitting idle.
+    """
+
+    def __init__(self):
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(Config.EMAIL_SMTP_HOST, Config.EMAIL_SMTP_PORT, timeout=Config.EMAIL_SMTP_TIMEOUT)
+        if Config.EMAIL_SMTP_STARTTLS:
+            server.starttls()
+        if Config.EMAIL_PASSWORD:
+            server.login(Config.EMAIL_SENDER, Config.EMAIL_PASSWORD)
+        return server
+
+    def send(self, msg: MIMEMultipart):
+        if self._server is None:
+            self._server = self._connect()
+
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # The server closed our idle connection; reconnect once and retry
+            self._server = self._connect()
+            self._server.send_message(msg)
+
+        self._last_used = time.monotonic()
 
-        server.sendmail(SENDER_EMAIL, receiver_email, msg.as_string())
-        server.quit()
+    def close_if_idle(self):
+        if self._server is not None and time.monotonic() - self._last_used > Config.EMAIL_SMTP_IDLE_SECONDS:
+            self.close()
 
-        print("Email sent successfully!")
+    def close(self):
+        if self._server is None:
+            return
 
-    except Exception as e:
-        print("Error sending email:", e)
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._server = None
@@ -0,0 +1,35 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    # Weak comparison, as RFC 9110 specifies for If-None-Match
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return etag in candidates
+
+def etag_response(request: Request, payload: dict) -> Response:
+    """
+    Serialize a JSON payload with an ETag. Returns an empty 304 if the
+    client already holds this exact payload.
+    """
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}  # Clients may keep it but must revalidate
+
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,127 @@
+import io
+
+from PIL import Image, UnidentifiedImageError
+
+from app.utils.batching import MicroBatcher
+from config import Config
+
+# Must match the client's CrackClassifier preprocessing
+INPUT_SIZE = (128, 128)
+
+
+def load_interpreter(model_path: str, num_threads: int):
+    """Create a TFLite interpreter from whichever runtime is installed."""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tensorflow.lite import Interpreter
+            except ImportError as e:
+                raise RuntimeError(
+                    "ai-edge-litert, tflite-runtime or tensorflow is required for INFERENCE_ENABLED=true"
+                ) from e
+
+    return Interpreter(model_path=model_path, num_threads=num_threads)
+
+def preprocess_image(data: bytes):
+    """Decode image bytes into the model's input: 128x128 RGB scaled to [-1, 1]. None if unreadable."""
+    import numpy as np
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("RGB", (INPUT_SIZE[0] * 2, INPUT_SIZE[1] * 2))  # Lets JPEG decode at reduced scale
+            img = img.convert("RGB").resize(INPUT_SIZE, Image.Resampling.LANCZOS)
+            x = np.asarray(img, dtype=np.float32)
+    except (UnidentifiedImageError, OSError):
+        return None
+
+    return x / 127.5 - 1.0
+
+def severity_for(probability: float) -> str:
+    """Severity label for a crack probability, using the client's thresholds."""
+    if probability > Config.INFERENCE_SEVERE_THRESHOLD:
+        return "Severe"
+    if probability > Config.INFERENCE_MILD_THRESHOLD:
+        return "Mild"
+    return "None"
+
+
+class CrackModel:
+    """
+    The crack classifier, loaded once. Batches are padded to a power of two
+    so the interpreter only reallocates for a handful of shapes; a model
+    exported with a fixed batch of 1 is run image by image instead.
+    Not thread-safe: call predict_batch from one thread.
+    """
+
+    def __init__(self, model_path: str, num_threads: int = 1):
+        self.interpreter = load_interpreter(model_path, num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_index = self.interpreter.get_input_details()[0]["index"]
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self.batch_size = 1
+        self.batchable = True
+
+    def _resize(self, batch_size: int) -> bool:
+        if batch_size == self.batch_size:
+            return True
+
+        try:
+            self.interpreter.resize_tensor_input(self.input_index, [batch_size, *INPUT_SIZE, 3])
+            self.interpreter.allocate_tensors()
+        except (ValueError, RuntimeError) as e:
+            print("Model does not accept batched input; running images one at a time:", e)
+            self.batchable = False
+            self.interpreter.resize_tensor_input(self.input_index, [1, *INPUT_SIZE, 3])
+            self.interpreter.allocate_tensors()
+            self.batch_size = 1
+            return False
+
+        self.batch_size = batch_size
+        return True
+
+    def _invoke(self, inputs):
+        self.interpreter.set_tensor(self.input_index, inputs)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index)[:, 0]
+
+    def predict_batch(self, images: list) -> list[float]:
+        """Crack probabilities for preprocessed images, in order."""
+        import numpy as np
+
+        count = len(images)
+        padded = 1 << (count - 1).bit_length()
+
+        if self.batchable and self._resize(padded):
+            inputs = np.zeros((padded, *INPUT_SIZE, 3), dtype=np.float32)
+            inputs[:count] = images
+            return [float(p) for p in self._invoke(inputs)[:count]]
+
+        self._resize(1)
+        return [float(self._invoke(np.expand_dims(image, 0).astype(np.float32))[0]) for image in images]
+
+
+_batcher: MicroBatcher | None = None
+
+def start_inference():
+    """Load the model and start batching (once per worker process). Call from the event loop."""
+    global _batcher
+
+    if _batcher is None:
+        model = CrackModel(Config.INFERENCE_MODEL_PATH, Config.INFERENCE_THREADS)
+        _batcher = MicroBatcher(model.predict_batch, Config.INFERENCE_MAX_BATCH, Config.INFERENCE_BATCH_WINDOW_MS, name="inference")
+        _batcher.start()
+
+async def stop_inference():
+    global _batcher
+
+    if _batcher is not None:
+        await _batcher.stop()
+        _batcher = None
+
+def get_batcher() -> MicroBatcher | None:
+    """The running batcher, or None when server inference is off."""
+    return _batcher
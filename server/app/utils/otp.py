@@ -4,16 +4,19 @@ from datetime import datetime, timezone
 def generate_otp():
     return str(random.randint(100000, 999999))
 
-def verify_otp(last_otp, entered_otp, datenow):
-    if not last_otp:
-        return False
-
+def is_expired(otp, datenow):
     # Ensure expires_at is timezone-aware
-    expires_at = last_otp.expires_at
+    expires_at = otp.expires_at
     if expires_at.tzinfo is None:
         expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-    if datenow > expires_at:
+    return datenow > expires_at
+
+def verify_otp(last_otp, entered_otp, datenow):
+    if not last_otp:
+        return False
+
+    if is_expired(last_otp, datenow):
         return False
 
     return last_otp.otp == entered_otp
@@ -0,0 +1,152 @@
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select
+
+from app.models.otp import OTP
+from config import Config
+
+
+@dataclass
+class StoredOTP:
+    """An OTP held outside the database; same fields verify_otp reads from OTP rows."""
+    email: str
+    otp: str
+    created_at: datetime
+    expires_at: datetime
+
+
+class OTPStore:
+    """Interface for OTP storage backends. `db` is the request's session."""
+
+    def put(self, email: str, otp: str, ttl_seconds: int, db) -> None:
+        raise NotImplementedError
+
+    def latest(self, email: str, db):
+        """The most recently issued OTP for an email, expired or not, or None."""
+        raise NotImplementedError
+
+    def delete(self, email: str, db) -> None:
+        raise NotImplementedError
+
+    def purge_expired(self, db, limit: int) -> int:
+        """Delete up to `limit` expired OTPs and return how many were removed."""
+        return 0
+
+
+class DatabaseOTPStore(OTPStore):
+    """OTP rows in the otps table. Writes join the caller's transaction."""
+
+    def put(self, email: str, otp: str, ttl_seconds: int, db) -> None:
+        now = datetime.now(timezone.utc)
+        db.add(OTP(email=email, otp=otp, created_at=now, expires_at=now + timedelta(seconds=ttl_seconds)))
+
+    def latest(self, email: str, db):
+        # Served by the (email, created_at) index
+        return db.query(OTP).filter(OTP.email == email).order_by(OTP.created_at.desc()).first()
+
+    def delete(self, email: str, db) -> None:
+        db.query(OTP).filter(OTP.email == email).delete()
+
+    def purge_expired(self, db, limit: int) -> int:
+        expired_ids = db.scalars(
+            select(OTP.id).where(OTP.expires_at < datetime.now(timezone.utc)).limit(limit)
+        ).all()
+        if not expired_ids:
+            return 0
+
+        db.execute(delete(OTP).where(OTP.id.in_(expired_ids)))
+        db.commit()
+        return len(expired_ids)
+
+
+class MemoryOTPStore(OTPStore):
+    """
+    OTPs in process memory. Only suitable for a single server process, and
+    codes are lost on restart.
+    """
+
+    def __init__(self):
+        self._otps: dict[str, StoredOTP] = {}
+        self._lock = threading.Lock()
+
+    def put(self, email: str, otp: str, ttl_seconds: int, db) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            self._otps[email] = StoredOTP(email, otp, now, now + timedelta(seconds=ttl_seconds))
+
+    def latest(self, email: str, db):
+        with self._lock:
+            return self._otps.get(email)
+
+    def delete(self, email: str, db) -> None:
+        with self._lock:
+            self._otps.pop(email, None)
+
+    def purge_expired(self, db, limit: int) -> int:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [email for email, stored in self._otps.items() if stored.expires_at < now][:limit]
+            for email in expired:
+                del self._otps[email]
+        return len(expired)
+
+
+class RedisOTPStore(OTPStore):
+    """OTPs in Redis (or a compatible server); keys expire on their own, so there is nothing to sweep."""
+
+    def __init__(self, url: str, prefix: str = "otp:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("redis is required for OTP_STORE_BACKEND='redis'") from e
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def put(self, email: str, otp: str, ttl_seconds: int, db) -> None:
+        now = datetime.now(timezone.utc)
+        value = json.dumps({"otp": otp, "created_at": now.isoformat()})
+        self.client.set(self.prefix + email, value, ex=ttl_seconds)
+
+    def latest(self, email: str, db):
+        key = self.prefix + email
+        pipe = self.client.pipeline()
+        pipe.get(key)
+        pipe.ttl(key)
+        value, ttl = pipe.execute()
+        if value is None:
+            return None
+
+        data = json.loads(value)
+        return StoredOTP(
+            email=email,
+            otp=data["otp"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=max(ttl, 0)),
+        )
+
+    def delete(self, email: str, db) -> None:
+        self.client.delete(self.prefix + email)
+
+
+_otp_store: OTPStore | None = None
+
+def get_otp_store() -> OTPStore:
+    """Return the configured OTP store (created once per process)."""
+    global _otp_store
+
+    if _otp_store is None:
+        backend = Config.OTP_STORE_BACKEND.lower()
+
+        if backend == "database":
+            _otp_store = DatabaseOTPStore()
+        elif backend == "memory":
+            _otp_store = MemoryOTPStore()
+        elif backend == "redis":
+            _otp_store = RedisOTPStore(Config.REDIS_URL, prefix=Config.OTP_REDIS_PREFIX)
+        else:
+            raise ValueError(f"Unknown OTP_STORE_BACKEND: {Config.OTP_STORE_BACKEND}")
+
+    return _otp_store
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import date, datetime
+
+DEFAULT_PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+
+def clamp_page_size(limit) -> int:
+    """Coerce a client-supplied page size into [1, MAX_PAGE_SIZE]."""
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str | None, *types) -> list | None:
+    """
+    Decode a cursor produced by encode_cursor into one value per type in
+    types (datetimes are parsed back from ISO strings). Returns None if there
+    is no cursor; raises ValueError if it is malformed or has the wrong shape.
+    """
+    if not cursor:
+        return None
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError("Invalid cursor")
+
+    position = []
+    for value, value_type in zip(values, types):
+        if value_type is datetime:
+            value = parse_datetime(value) if isinstance(value, str) else None
+        elif isinstance(value, bool) or not isinstance(value, value_type):
+            value = None
+
+        if value is None:
+            raise ValueError("Invalid cursor")
+        position.append(value)
+
+    return position
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """Parse an ISO 8601 date/datetime string, returning None when invalid."""
+    if not value:
+        return None
+
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_date(value) -> date | None:
+    """Parse a YYYY-MM-DD date (or the date part of a datetime), returning None when invalid."""
+    if not value:
+        return None
+
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
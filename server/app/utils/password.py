@@ -1,13 +1,95 @@
+import asyncio
 import hashlib
+import hmac
 import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
-def hash_password(password: str):
+from config import Config
+
+ALGORITHM = "pbkdf2_sha256"
+
+# Hashes written before the cost was configurable are "salt:hash" at this cost
+LEGACY_ITERATIONS = 100000
+
+
+def _pbkdf2(password: str, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+def _parse(stored: str):
+    """Split a stored hash into (iterations, salt, hash hex)."""
+    if stored.startswith(ALGORITHM + "$"):
+        _, iterations, salt, stored_hash = stored.split("$")
+        return int(iterations), bytes.fromhex(salt), stored_hash
+
+    salt, stored_hash = stored.split(":")
+    return LEGACY_ITERATIONS, bytes.fromhex(salt), stored_hash
+
+def hash_password(password: str, iterations: int | None = None):
+    iterations = iterations or Config.PASSWORD_HASH_ITERATIONS
     salt = os.urandom(16)
-    hashed = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 100000)
-    return salt.hex() + ":" + hashed.hex()
+    hashed = _pbkdf2(password, salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${hashed.hex()}"
 
 def verify_password(password: str, stored: str):
-    salt, stored_hash = stored.split(":")
-    salt = bytes.fromhex(salt)
-    hashed = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, 100000)
-    return hashed.hex() == stored_hash
+    try:
+        iterations, salt, stored_hash = _parse(stored)
+    except ValueError:
+        return False
+
+    hashed = _pbkdf2(password, salt, iterations)
+    return hmac.compare_digest(hashed.hex(), stored_hash)
+
+def needs_rehash(stored: str) -> bool:
+    """True if a stored hash was made with a different cost than the configured one."""
+    try:
+        iterations, _, _ = _parse(stored)
+    except ValueError:
+        return False
+
+    return not stored.startswith(ALGORITHM + "$") or iterations != Config.PASSWORD_HASH_ITERATIONS
+
+
+# Hashing runs on its own bounded executor so a login burst cannot tie up
+# the request threadpool or the event loop.
+_executor: Executor | None = None
+_slots: asyncio.Semaphore | None = None
+
+def get_password_executor() -> Executor:
+    """Return the hashing executor (created once per process)."""
+    global _executor
+
+    if _executor is None:
+        workers = Config.PASSWORD_HASH_WORKERS
+        if Config.PASSWORD_HASH_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+
+    return _executor
+
+def shutdown_password_executor():
+    global _executor, _slots
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+    _slots = None
+
+async def _run(func, *args):
+    global _slots
+
+    # Bound the queue: callers past the limit wait here instead of piling work on the pool
+    if _slots is None:
+        _slots = asyncio.Semaphore(Config.PASSWORD_HASH_MAX_PENDING)
+
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_password_executor(), func, *args)
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the hashing executor."""
+    return await _run(hash_password, password, Config.PASSWORD_HASH_ITERATIONS)
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    """verify_password on the hashing executor."""
+    return await _run(verify_password, password, stored)
@@ -1,7 +1,8 @@
+import io
+from datetime import datetime, timezone
 from fpdf import FPDF
-from datetime import datetime
 
-def generate_user_pdf(user_data, output_path="user_data.pdf"):
+def generate_user_pdf(user_data) -> bytes:
     """
     Generate a PDF containing user data.
 
@@ -14,7 +15,9 @@ def generate_user_pdf(user_data, output_path="user_data.pdf"):
             "cracks_detected": 7,
             "last_scan": "2025-12-07",
         }
-    output_path: Path to save the PDF
+
+    The PDF is built in memory and returned as bytes, so concurrent requests
+    never share a file. CPU-bound: call it off the event loop.
     """
     pdf = FPDF()
     pdf.add_page()
@@ -37,6 +40,170 @@ def generate_user_pdf(user_data, output_path="user_data.pdf"):
     pdf.set_font("Arial", 'I', 10)
     pdf.cell(0, 8, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True, align='R')
     
-    # Save PDF
-    pdf.output(output_path)
+    return bytes(pdf.output())
+
+def iter_chunks(data: bytes, chunk_size: int = 64 * 1024):
+    """Yield `data` in slices, for a StreamingResponse body."""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+
+# Severity -> RGB fill used in tables and charts
+SEVERITY_COLORS = {
+    "Severe": (211, 47, 47),
+    "Mild": (245, 124, 0),
+    "None": (56, 142, 60),
+}
+OTHER_COLOR = (120, 144, 156)
+
+THUMBNAIL_COLUMNS = 4
+THUMBNAIL_SIZE = 40  # mm
+
+def pdf_text(value) -> str:
+    """The core PDF fonts only cover Latin-1; replace anything else."""
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+def _section(pdf: FPDF, title: str):
+    pdf.ln(4)
+    pdf.set_font("Helvetica", "B", 13)
+    pdf.cell(0, 8, pdf_text(title), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 10)
+
+def _severity_table(pdf: FPDF, report: dict):
+    widths = (60, 35, 35, 50)
+    headers = ("Severity", "Cracks", "Share", "Avg. confidence")
+
+    pdf.set_font("Helvetica", "B", 10)
+    for width, header in zip(widths, headers):
+        pdf.cell(width, 7, header, border=1)
+    pdf.ln()
+
+    pdf.set_font("Helvetica", "", 10)
+    total = report["total"]
+    for row in report["severities"]:
+        pdf.set_fill_color(*SEVERITY_COLORS.get(row["severity"], OTHER_COLOR))
+        pdf.cell(4, 7, "", border=1, fill=True)
+        pdf.cell(widths[0] - 4, 7, pdf_text(row["severity"] or "Unknown"), border=1)
+        pdf.cell(widths[1], 7, str(row["count"]), border=1)
+        pdf.cell(widths[2], 7, f"{row['count'] / total:.0%}" if total else "-", border=1)
+        average = row["average_probability"]
+        pdf.cell(widths[3], 7, f"{average:.0%}" if average is not None else "-", border=1)
+        pdf.ln()
+
+    pdf.set_font("Helvetica", "B", 10)
+    pdf.cell(widths[0], 7, "Total", border=1)
+    pdf.cell(widths[1], 7, str(total), border=1)
+    pdf.cell(widths[2] + widths[3], 7, "", border=1)
+    pdf.ln()
+
+def _timeline_chart(pdf: FPDF, timeline: list[dict], height: float = 50):
+    """Stacked bar chart of detections per bucket, one color per severity."""
+    if not timeline:
+        pdf.cell(0, 7, "No detections in this period.", new_x="LMARGIN", new_y="NEXT")
+        return
+
+    if pdf.get_y() + height + 20 > pdf.h - pdf.b_margin:
+        pdf.add_page()
+
+    left, top = pdf.l_margin + 8, pdf.get_y() + 4
+    width = pdf.epw - 8
+    peak = max(sum(bucket["counts"].values()) for bucket in timeline) or 1
+    bar_width = width / len(timeline)
+
+    pdf.set_draw_color(150, 150, 150)
+    pdf.line(left, top + height, left + width, top + height)
+    pdf.set_font("Helvetica", "", 7)
+    pdf.text(pdf.l_margin, top + 2, str(peak))
+    pdf.text(pdf.l_margin, top + height, "0")
+
+    label_every = max(1, -(-len(timeline) // 8))  # At most ~8 labels
+    for index, bucket in enumerate(timeline):
+        x = left + index * bar_width
+        y = top + height
+        for severity, count in bucket["counts"].items():
+            bar_height = height * count / peak
+            y -= bar_height
+            pdf.set_fill_color(*SEVERITY_COLORS.get(severity, OTHER_COLOR))
+            pdf.rect(x + bar_width * 0.1, y, bar_width * 0.8, bar_height, style="F")
+
+        if index % label_every == 0:
+            pdf.text(x, top + height + 4, bucket["label"])
+
+    # Legend
+    pdf.set_y(top + height + 7)
+    for severity, color in SEVERITY_COLORS.items():
+        pdf.set_fill_color(*color)
+        pdf.cell(4, 4, "", fill=True)
+        pdf.cell(22, 4, f" {severity}")
+    pdf.ln(6)
+    pdf.set_font("Helvetica", "", 10)
+
+def _thumbnail_grid(pdf: FPDF, thumbnails: list[dict], on_progress=None):
+    column_width = pdf.epw / THUMBNAIL_COLUMNS
+    row_height = THUMBNAIL_SIZE + 10
+
+    for index, thumbnail in enumerate(thumbnails):
+        column = index % THUMBNAIL_COLUMNS
+        if column == 0:
+            if index:
+                pdf.set_y(pdf.get_y() + row_height)
+            if pdf.get_y() + row_height > pdf.h - pdf.b_margin:
+                pdf.add_page()
+
+        x, y = pdf.l_margin + column * column_width, pdf.get_y()
+        try:
+            pdf.image(io.BytesIO(thumbnail["data"]), x=x, y=y, w=THUMBNAIL_SIZE, h=THUMBNAIL_SIZE, keep_aspect_ratio=True)
+        except Exception as e:
+            print(f"Skipping unreadable thumbnail for crack {thumbnail['crack_id']}:", e)
+            pdf.set_draw_color(200, 200, 200)
+            pdf.rect(x, y, THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+
+        pdf.set_font("Helvetica", "", 7)
+        pdf.set_text_color(*SEVERITY_COLORS.get(thumbnail["severity"], OTHER_COLOR))
+        pdf.text(x, y + THUMBNAIL_SIZE + 4, pdf_text(f"#{thumbnail['crack_id']} {thumbnail['severity']}"))
+        pdf.set_text_color(0, 0, 0)
+        pdf.text(x, y + THUMBNAIL_SIZE + 7.5, thumbnail["detected_at"].strftime("%Y-%m-%d %H:%M"))
+
+        if on_progress:
+            on_progress(index + 1, len(thumbnails))
+
+    pdf.set_y(pdf.get_y() + row_height)
+    pdf.set_font("Helvetica", "", 10)
+
+def generate_inspection_report(report: dict, thumbnails: list[dict], on_progress=None) -> bytes:
+    """
+    Render an inspection report as PDF bytes.
+
+    report: output of report_service.collect_report_data
+    thumbnails: [{"crack_id", "severity", "detected_at", "data"}], newest first,
+        where data is an already downscaled JPEG
+    on_progress: optional callback(done, total) while thumbnails are placed
+    """
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+
+    pdf.set_font("Helvetica", "B", 18)
+    pdf.cell(0, 10, "Inspection Report", new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.set_font("Helvetica", "", 12)
+    pdf.cell(0, 8, pdf_text(report["title"]), new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.set_font("Helvetica", "", 10)
+    pdf.cell(0, 6, pdf_text(report["period"]), new_x="LMARGIN", new_y="NEXT", align="C")
+
+    _section(pdf, "Severity breakdown")
+    _severity_table(pdf, report)
+
+    _section(pdf, f"Detections per {report['bucket']}")
+    _timeline_chart(pdf, report["timeline"])
+
+    if thumbnails:
+        _section(pdf, f"Latest {len(thumbnails)} detections")
+        _thumbnail_grid(pdf, thumbnails, on_progress)
+
+    pdf.ln(4)
+    pdf.set_font("Helvetica", "I", 9)
+    generated_at = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    pdf.cell(0, 6, f"Generated on {generated_at}", new_x="LMARGIN", new_y="NEXT", align="R")
 
+    return bytes(pdf.output())
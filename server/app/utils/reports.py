@@ -0,0 +1,190 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import and_, func, select
+
+from app.models.blob_rendition import BlobRendition
+from app.models.crack import Crack
+from app.models.crack_group import CrackGroup
+from app.models.group import Group
+from app.models.report import Report
+from app.models.user import User
+from app.services.blob_service import create_rendition
+from app.utils.blob_store import get_blob_store
+from app.utils.pdf import generate_inspection_report
+from config import Config
+
+# Bump when the report layout changes, so reports built with the old one are not reused
+REPORT_LAYOUT_VERSION = 1
+
+SEVERITY_ORDER = ["Severe", "Mild", "None"]
+
+# Longest range charted per day; longer ranges are charted per month
+DAILY_BUCKET_LIMIT_DAYS = 62
+
+
+def date_conditions(date_from: date | None, date_to: date | None) -> list:
+    """detected_at filters for a report's range; date_to includes the whole day."""
+    conditions = []
+    if date_from:
+        conditions.append(Crack.detected_at >= datetime.combine(date_from, time.min))
+    if date_to:
+        conditions.append(Crack.detected_at < datetime.combine(date_to + timedelta(days=1), time.min))
+    return conditions
+
+def scope_conditions(scope: str, scope_id: int, date_from: date | None = None, date_to: date | None = None) -> list:
+    """WHERE conditions selecting the cracks a report covers."""
+    if scope == Report.USER:
+        conditions = [Crack.user_id == scope_id]
+    else:
+        conditions = [Crack.id.in_(select(CrackGroup.crack_id).where(CrackGroup.group_id == scope_id))]
+
+    return conditions + date_conditions(date_from, date_to)
+
+def scope_title_query(scope: str, scope_id: int):
+    if scope == Report.USER:
+        return select(User.first_name + " " + User.last_name).where(User.id == scope_id)
+    return select(Group.name).where(Group.id == scope_id)
+
+def scope_version_query(scope: str, scope_id: int, date_from: date | None, date_to: date | None):
+    """
+    (row count, highest row id) of the links that put cracks in the report.
+    Adding a crack raises the id, removing one lowers the count, so any
+    change to the report's contents changes the pair.
+    """
+    if scope == Report.USER:
+        return select(func.count(Crack.id), func.max(Crack.id)).where(*scope_conditions(scope, scope_id, date_from, date_to))
+
+    return (
+        select(func.count(CrackGroup.id), func.max(CrackGroup.id))
+        .join(Crack, Crack.id == CrackGroup.crack_id)
+        .where(CrackGroup.group_id == scope_id, *date_conditions(date_from, date_to))
+    )
+
+def report_cache_key(scope: str, scope_id: int, date_from, date_to, title: str, version) -> str:
+    payload = [REPORT_LAYOUT_VERSION, scope, scope_id, str(date_from), str(date_to), title, *version]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def describe_period(date_from: date | None, date_to: date | None) -> str:
+    if date_from and date_to:
+        return f"{date_from.isoformat()} to {date_to.isoformat()}"
+    if date_from:
+        return f"Since {date_from.isoformat()}"
+    if date_to:
+        return f"Until {date_to.isoformat()}"
+    return "All time"
+
+def _as_date(value) -> date:
+    # DATE() comes back as a date on MySQL and as a string on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+def _bucket_starts(first: date, last: date, monthly: bool):
+    current = first.replace(day=1) if monthly else first
+    while current <= last:
+        yield current
+        if monthly:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=1)
+
+def collect_report_data(report: Report, db) -> dict:
+    """Aggregate a report's severity breakdown and timeline in SQL."""
+    conditions = scope_conditions(report.scope, report.scope_id, report.date_from, report.date_to)
+
+    breakdown = db.execute(
+        select(Crack.severity, func.count(Crack.id), func.avg(Crack.probability))
+        .where(*conditions)
+        .group_by(Crack.severity)
+    ).all()
+    rank = {severity: index for index, severity in enumerate(SEVERITY_ORDER)}
+    severities = sorted(
+        (
+            {"severity": severity, "count": count, "average_probability": float(average) if average is not None else None}
+            for severity, count, average in breakdown
+        ),
+        key=lambda row: rank.get(row["severity"], len(rank)),
+    )
+
+    day = func.date(Crack.detected_at)
+    daily = db.execute(
+        select(day, Crack.severity, func.count(Crack.id)).where(*conditions).group_by(day, Crack.severity)
+    ).all()
+
+    timeline, bucket = [], "day"
+    if daily:
+        days = [_as_date(row[0]) for row in daily]
+        first, last = report.date_from or min(days), report.date_to or max(days)
+        monthly = (last - first).days > DAILY_BUCKET_LIMIT_DAYS
+        bucket = "month" if monthly else "day"
+
+        counts = {start: {} for start in _bucket_starts(first, last, monthly)}
+        for day_value, severity, count in daily:
+            start = _as_date(day_value)
+            start = start.replace(day=1) if monthly else start
+            bucket_counts = counts.setdefault(start, {})
+            bucket_counts[severity] = bucket_counts.get(severity, 0) + count
+
+        label = "%b %Y" if monthly else "%b %d"
+        timeline = [
+            {"start": start.isoformat(), "label": start.strftime(label), "counts": counts[start]}
+            for start in sorted(counts)
+        ]
+
+    return {
+        "title": db.scalar(scope_title_query(report.scope, report.scope_id)) or "Unknown",
+        "period": describe_period(report.date_from, report.date_to),
+        "total": sum(row["count"] for row in severities),
+        "severities": severities,
+        "bucket": bucket,
+        "timeline": timeline,
+    }
+
+def fetch_report_thumbnails(report: Report, db, on_progress=None) -> list[dict]:
+    """
+    Small renditions of the report's newest cracks. Rendition keys come from
+    one query and the bytes are read in parallel; images stored before
+    renditions existed get theirs generated (and kept) here.
+    """
+    rows = db.execute(
+        select(Crack.id, Crack.severity, Crack.detected_at, Crack.image_key, BlobRendition.blob_key)
+        .outerjoin(BlobRendition, and_(BlobRendition.source_key == Crack.image_key, BlobRendition.name == "small"))
+        .where(*scope_conditions(report.scope, report.scope_id, report.date_from, report.date_to), Crack.image_key.is_not(None))
+        .order_by(Crack.detected_at.desc(), Crack.id.desc())
+        .limit(Config.REPORT_THUMBNAIL_LIMIT)
+    ).all()
+
+    store = get_blob_store()
+    rendition_keys = {}
+    for crack_id, _, _, image_key, rendition_key in rows:
+        if rendition_key is None:
+            source = store.get(image_key)
+            rendition = create_rendition(image_key, "small", source, db) if source else None
+            rendition_key = rendition.key if rendition else None
+        rendition_keys[crack_id] = rendition_key
+    db.commit()
+
+    keys = [key for key in rendition_keys.values() if key]
+    data_by_key = {}
+    with ThreadPoolExecutor(max_workers=Config.REPORT_FETCH_WORKERS) as executor:
+        for done, (key, data) in enumerate(zip(keys, executor.map(store.get, keys)), start=1):
+            data_by_key[key] = data
+            if on_progress:
+                on_progress(done, len(keys))
+
+    return [
+        {"crack_id": crack_id, "severity": severity, "detected_at": detected_at, "data": data_by_key[rendition_keys[crack_id]]}
+        for crack_id, severity, detected_at, _, _ in rows
+        if data_by_key.get(rendition_keys[crack_id])
+    ]
+
+def build_report(report: Report, db, on_progress) -> bytes:
+    """Build a report's PDF. on_progress(percent) is called as each stage advances."""
+    data = collect_report_data(report, db)
+    on_progress(10)
+
+    thumbnails = fetch_report_thumbnails(report, db, lambda done, total: on_progress(10 + 50 * done // total))
+    on_progress(60)
+
+    return generate_inspection_report(data, thumbnails, lambda done, total: on_progress(60 + 35 * done // total))
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+
+class CacheBackend:
+    """
+    Interface for response cache backends. Entries are JSON-serializable
+    values; tags are version counters that writers bump to invalidate every
+    entry read under an older version. Methods are coroutines so network
+    backends never block the event loop.
+    """
+
+    async def get(self, key: str, tags: list[str]):
+        """Return (entry or None, current versions of `tags`) in one round trip."""
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: dict, ttl_seconds: int) -> None:
+        raise NotImplementedError
+
+    async def bump(self, tags: list[str]) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    LRU + TTL cache in process memory. Invalidation only reaches this
+    process, so with several server processes other copies can serve stale
+    entries until their TTL runs out; use the Redis backend there.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # Never evicted: a version that reset to 0 could revalidate a stale entry
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, tags: list[str]):
+        now = time.monotonic()
+        with self._lock:
+            versions = [self._versions.get(tag, 0) for tag in tags]
+            item = self._entries.get(key)
+            if item is None:
+                return None, versions
+
+            expires_at, entry = item
+            if expires_at < now:
+                del self._entries[key]
+                return None, versions
+
+            self._entries.move_to_end(key)
+            return entry, versions
+
+    async def set(self, key: str, entry: dict, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def bump(self, tags: list[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class RedisCacheBackend(CacheBackend):
+    """Entries and tag versions in Redis (or a compatible server), shared by every server process."""
+
+    def __init__(self, url: str, prefix: str = "cache:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("redis is required for CACHE_BACKEND='redis'") from e
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str, tags: list[str]):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self.prefix + key)
+        if tags:
+            pipe.mget([self._tag_key(tag) for tag in tags])
+        results = await pipe.execute()
+
+        versions = [int(v or 0) for v in results[1]] if tags else []
+        entry = json.loads(results[0]) if results[0] is not None else None
+        return entry, versions
+
+    async def set(self, key: str, entry: dict, ttl_seconds: int) -> None:
+        await self.client.set(self.prefix + key, json.dumps(entry, separators=(",", ":")), ex=ttl_seconds)
+
+    async def bump(self, tags: list[str]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(self._tag_key(tag))
+        await pipe.execute()
+
+
+_backend: CacheBackend | None = None
+
+def get_cache_backend() -> CacheBackend | None:
+    """Return the configured cache backend (created once per process), or None if caching is off."""
+    global _backend
+
+    backend = Config.CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+
+    if _backend is None:
+        if backend == "memory":
+            _backend = MemoryCacheBackend(Config.CACHE_MAX_ENTRIES)
+        elif backend == "redis":
+            _backend = RedisCacheBackend(Config.REDIS_URL, prefix=Config.CACHE_REDIS_PREFIX)
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {Config.CACHE_BACKEND}")
+
+    return _backend
+
+async def read_through(key: str, tags: list[str], loader):
+    """
+    Return the cached response for `key`, or await `loader()` and cache its
+    result. Tag versions are read before loading, so a write that commits
+    and bumps a tag while we load leaves our entry already stale.
+    Only successful responses are cached. Treat the result as read-only.
+    """
+    backend = get_cache_backend()
+    if backend is None:
+        return await loader()
+
+    entry, versions = await backend.get(key, tags)
+    if entry is not None and entry["versions"] == versions:
+        return entry["value"]
+
+    value = await loader()
+    if value.get("success"):
+        await backend.set(key, {"versions": versions, "value": value}, Config.CACHE_TTL_SECONDS)
+
+    return value
+
+async def invalidate(tags) -> None:
+    """Invalidate every entry read under these tags. Call after the write commits."""
+    backend = get_cache_backend()
+    tags = list(dict.fromkeys(tags))
+    if backend is not None and tags:
+        await backend.bump(tags)
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
+from app.utils.pagination import parse_datetime
+from config import Config
+
+
+def sync_now() -> datetime:
+    """The current time as stored in DateTime columns (naive UTC)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def sync_checkpoint() -> datetime:
+    """
+    The server_time to return with a response, taken before its queries run.
+    It is set back by SYNC_OVERLAP_SECONDS because a write may stamp its row
+    and commit a moment later; the next delta still covers it. Clients merge
+    by ID, so rows sent twice are harmless.
+    """
+    return sync_now() - timedelta(seconds=Config.SYNC_OVERLAP_SECONDS)
+
+def encode_sync_token(moment: datetime) -> str:
+    """A `since=` value for the next delta request."""
+    return moment.isoformat()
+
+def parse_since(value: str | None) -> datetime | None:
+    """
+    Parse a client's `since=` token. Returns None (meaning: send everything)
+    if it is missing, malformed or older than tombstones are kept.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        return None
+
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    if since < sync_now() - timedelta(days=Config.SYNC_TOMBSTONE_RETENTION_DAYS):
+        return None
+
+    return since
@@ -0,0 +1,64 @@
+import threading
+
+
+class PeriodicWorker:
+    """
+    Runs `run_once` on a daemon thread, then sleeps `interval` seconds or
+    until woken. When `run_once` returns True there is more work waiting and
+    it is called again straight away.
+    """
+
+    name = "worker"
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def run_once(self) -> bool:
+        raise NotImplementedError
+
+    def on_stop(self):
+        """Release resources held between runs (called on the worker thread)."""
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Run the next cycle now instead of waiting for the interval."""
+        self._wake.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep unless stopped first. Returns False if the worker is stopping."""
+        return not self._stop.wait(seconds)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once()
+            except Exception as e:
+                print(f"{self.name}: error:", e)
+                busy = False
+
+            if not busy:
+                self._wake.wait(self.interval)
+            self._wake.clear()
+
+        self.on_stop()
@@ -0,0 +1,151 @@
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+
+from app.database.db import SessionLocal
+from app.models.outbox_email import OutboxEmail
+from app.utils.email import SMTPConnection, build_message
+from app.workers.base import PeriodicWorker
+from config import Config
+
+
+class RateLimiter:
+    """Token bucket allowing `per_minute` sends, with bursts up to that size."""
+
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60
+        self.capacity = max(1, per_minute)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def delay(self) -> float:
+        """Seconds to wait before the next send is allowed (0 means go now)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+
+class EmailSender(PeriodicWorker):
+    """
+    Sends queued outbox messages over a reused SMTP connection.
+
+    A message is claimed by pushing its next_attempt_at forward by a lease,
+    so several server processes can run a sender without double-sending,
+    and a message held by a crashed process is picked up once the lease
+    runs out. Only sends that are actually tried count as attempts, so a
+    lease that expires because the sender stopped costs nothing. Failures
+    are retried with exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS,
+    then marked failed.
+    """
+
+    name = "email-sender"
+
+    def __init__(self):
+        super().__init__(Config.EMAIL_OUTBOX_POLL_SECONDS)
+        self.connection = SMTPConnection()
+        self.limiter = RateLimiter(Config.EMAIL_RATE_PER_MINUTE)
+
+    def claim_batch(self, db) -> list[OutboxEmail]:
+        now = datetime.now(timezone.utc)
+        lease_until = now + timedelta(seconds=Config.EMAIL_OUTBOX_LEASE_SECONDS)
+
+        candidate_ids = db.scalars(
+            select(OutboxEmail.id)
+            .where(OutboxEmail.status == OutboxEmail.PENDING, OutboxEmail.next_attempt_at <= now)
+            .order_by(OutboxEmail.next_attempt_at, OutboxEmail.id)
+            .limit(Config.EMAIL_OUTBOX_BATCH_SIZE)
+        ).all()
+
+        claimed = []
+        for email_id in candidate_ids:
+            result = db.execute(
+                update(OutboxEmail)
+                .where(
+                    OutboxEmail.id == email_id,
+                    OutboxEmail.status == OutboxEmail.PENDING,
+                    OutboxEmail.next_attempt_at <= now,
+                )
+                .values(next_attempt_at=lease_until)
+            )
+            if result.rowcount == 1:
+                claimed.append(email_id)
+        db.commit()
+
+        if not claimed:
+            return []
+
+        return db.scalars(select(OutboxEmail).where(OutboxEmail.id.in_(claimed)).order_by(OutboxEmail.id)).all()
+
+    def send(self, email: OutboxEmail, db):
+        email.attempts += 1  # Saved with the outcome below
+        try:
+            self.connection.send(build_message(email.recipient, email.subject, email.html_body, email.text_body))
+        except Exception as e:
+            self.connection.close()
+            email.last_error = str(e)
+
+            if email.attempts >= Config.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.FAILED
+                print(f"Giving up on email {email.id} to {email.recipient} after {email.attempts} attempts:", e)
+            else:
+                backoff = Config.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (email.attempts - 1)
+                email.next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=backoff)
+                print(f"Error sending email {email.id}, retrying in {backoff}s:", e)
+        else:
+            email.status = OutboxEmail.SENT
+            email.sent_at = datetime.now(timezone.utc)
+            email.last_error = None
+
+        db.commit()
+
+    def wait_for_rate_limit(self) -> bool:
+        delay = self.limiter.delay()
+        while delay:
+            if not self.sleep(delay):
+                return False
+            delay = self.limiter.delay()
+        return True
+
+    def run_once(self) -> bool:
+        db = SessionLocal()
+        try:
+            batch = self.claim_batch(db)
+            for email in batch:
+                if not self.wait_for_rate_limit():
+                    break  # Stopping; unsent messages are retried when their lease runs out
+                self.send(email, db)
+        finally:
+            db.close()
+
+        if not batch:
+            self.connection.close_if_idle()
+
+        return len(batch) == Config.EMAIL_OUTBOX_BATCH_SIZE
+
+    def on_stop(self):
+        self.connection.close()
+
+
+_email_sender: EmailSender | None = None
+
+def start_email_sender():
+    global _email_sender
+
+    if _email_sender is None:
+        _email_sender = EmailSender()
+    _email_sender.start()
+
+def stop_email_sender():
+    if _email_sender is not None:
+        _email_sender.stop()
+
+def wake_email_sender():
+    """Ask the sender to pick up newly committed messages now."""
+    if _email_sender is not None:
+        _email_sender.wake()
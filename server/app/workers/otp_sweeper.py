@@ -0,0 +1,37 @@
+from app.database.db import SessionLocal
+from app.utils.otp_store import get_otp_store
+from app.workers.base import PeriodicWorker
+from config import Config
+
+
+class OTPSweeper(PeriodicWorker):
+    """Deletes expired OTPs in bounded batches so the store never grows unchecked."""
+
+    name = "otp-sweeper"
+
+    def __init__(self):
+        super().__init__(Config.OTP_SWEEP_INTERVAL_SECONDS)
+
+    def run_once(self) -> bool:
+        db = SessionLocal()
+        try:
+            removed = get_otp_store().purge_expired(db, Config.OTP_SWEEP_BATCH_SIZE)
+        finally:
+            db.close()
+
+        # A full batch means more are probably waiting; keep going without holding locks for long
+        return removed == Config.OTP_SWEEP_BATCH_SIZE
+
+
+_otp_sweeper: OTPSweeper | None = None
+
+def start_otp_sweeper():
+    global _otp_sweeper
+
+    if _otp_sweeper is None:
+        _otp_sweeper = OTPSweeper()
+    _otp_sweeper.start()
+
+def stop_otp_sweeper():
+    if _otp_sweeper is not None:
+        _otp_sweeper.stop()
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, and_, select, update
+
+from app.database.db import SessionLocal
+from app.models.report import Report
+from app.services.blob_service import store_blob
+from app.utils.reports import build_report
+from app.workers.base import PeriodicWorker
+from config import Config
+
+
+class ReportBuilder(PeriodicWorker):
+    """
+    Builds queued inspection reports one at a time and stores each PDF in
+    the blob store.
+
+    A report is claimed with a lease like the email outbox, so several
+    server processes can run a builder. Progress updates renew the lease;
+    a report whose builder died is picked up again once it runs out, up to
+    REPORT_MAX_ATTEMPTS tries.
+    """
+
+    name = "report-builder"
+
+    def __init__(self):
+        super().__init__(Config.REPORT_POLL_SECONDS)
+
+    def claim(self, db) -> Report | None:
+        now = datetime.now(timezone.utc)
+        claimable = or_(
+            Report.status == Report.PENDING,
+            and_(Report.status == Report.RUNNING, Report.lease_until < now),
+        )
+
+        # Reports that keep killing their builder are given up on
+        db.execute(
+            update(Report)
+            .where(claimable, Report.attempts >= Config.REPORT_MAX_ATTEMPTS)
+            .values(status=Report.FAILED, error="Report could not be built", lease_until=None, finished_at=now)
+        )
+        db.commit()
+
+        report_id = db.scalar(select(Report.id).where(claimable).order_by(Report.id).limit(1))
+        if report_id is None:
+            return None
+
+        result = db.execute(
+            update(Report)
+            .where(Report.id == report_id, claimable)
+            .values(
+                status=Report.RUNNING,
+                lease_until=now + timedelta(seconds=Config.REPORT_LEASE_SECONDS),
+                attempts=Report.attempts + 1,
+            )
+        )
+        db.commit()
+
+        return db.get(Report, report_id) if result.rowcount == 1 else None
+
+    def build(self, report: Report, db):
+        last_progress = report.progress = 0
+
+        def on_progress(percent: int):
+            nonlocal last_progress
+            if percent - last_progress < 5:
+                return
+
+            last_progress = percent
+            db.execute(
+                update(Report)
+                .where(Report.id == report.id)
+                .values(progress=percent, lease_until=datetime.now(timezone.utc) + timedelta(seconds=Config.REPORT_LEASE_SECONDS))
+            )
+            db.commit()
+
+        try:
+            pdf = build_report(report, db, on_progress)
+            blob = store_blob(pdf, db, mime_type="application/pdf")
+        except Exception as e:
+            db.rollback()
+            report.error = str(e)
+            report.lease_until = None
+            if report.attempts >= Config.REPORT_MAX_ATTEMPTS:
+                report.status = Report.FAILED
+                report.finished_at = datetime.now(timezone.utc)
+            else:
+                report.status = Report.PENDING
+            db.commit()
+            print(f"Error building report {report.id} (attempt {report.attempts}):", e)
+            return
+
+        report.blob_key = blob.key
+        report.status = Report.DONE
+        report.progress = 100
+        report.error = None
+        report.lease_until = None
+        report.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+    def run_once(self) -> bool:
+        db = SessionLocal()
+        try:
+            report = self.claim(db)
+            if report is None:
+                return False
+
+            self.build(report, db)
+        finally:
+            db.close()
+
+        return True
+
+
+_report_builder: ReportBuilder | None = None
+
+def start_report_builder():
+    global _report_builder
+
+    if _report_builder is None:
+        _report_builder = ReportBuilder()
+    _report_builder.start()
+
+def stop_report_builder():
+    if _report_builder is not None:
+        _report_builder.stop()
+
+def wake_report_builder():
+    """Ask the builder to pick up a newly queued report now."""
+    if _report_builder is not None:
+        _report_builder.wake()
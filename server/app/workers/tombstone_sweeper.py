@@ -0,0 +1,47 @@
+from datetime import timedelta
+from sqlalchemy import delete, select
+
+from app.database.db import SessionLocal
+from app.models.sync_tombstone import SyncTombstone
+from app.utils.sync import sync_now
+from app.workers.base import PeriodicWorker
+from config import Config
+
+
+class TombstoneSweeper(PeriodicWorker):
+    """Deletes sync tombstones past the retention; clients with older tokens get full responses instead."""
+
+    name = "tombstone-sweeper"
+
+    def __init__(self):
+        super().__init__(Config.SYNC_SWEEP_INTERVAL_SECONDS)
+
+    def run_once(self) -> bool:
+        cutoff = sync_now() - timedelta(days=Config.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+        db = SessionLocal()
+        try:
+            expired_ids = db.scalars(
+                select(SyncTombstone.id).where(SyncTombstone.deleted_at < cutoff).limit(Config.SYNC_SWEEP_BATCH_SIZE)
+            ).all()
+            if expired_ids:
+                db.execute(delete(SyncTombstone).where(SyncTombstone.id.in_(expired_ids)))
+                db.commit()
+        finally:
+            db.close()
+
+        return len(expired_ids) == Config.SYNC_SWEEP_BATCH_SIZE
+
+
+_tombstone_sweeper: TombstoneSweeper | None = None
+
+def start_tombstone_sweeper():
+    global _tombstone_sweeper
+
+    if _tombstone_sweeper is None:
+        _tombstone_sweeper = TombstoneSweeper()
+    _tombstone_sweeper.start()
+
+def stop_tombstone_sweeper():
+    if _tombstone_sweeper is not None:
+        _tombstone_sweeper.stop()
@@ -0,0 +1,268 @@
+"""
+Latency and throughput benchmark for the hot API endpoints.
+
+Boots the app with uvicorn in-process against a freshly seeded database,
+drives concurrent requests at each endpoint in turn and reports p50/p95/p99
+latency, requests/sec and database queries per request.
+
+Run from the server directory:
+
+    python -m benchmarks.run                                   # scratch SQLite database
+    python -m benchmarks.run --database-url "mysql+pymysql://root:@localhost/crackapp_bench"
+    python -m benchmarks.run --endpoints login,activities --requests 500 --concurrency 32
+
+Record a baseline before a change and compare after it:
+
+    python -m benchmarks.run --json before.json
+    python -m benchmarks.run --compare before.json
+
+--database-url must point at an empty scratch database; the migrations are
+run on it, it is seeded with synthetic rows and never cleaned up.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ["login", "register", "activities", "user-groups", "fetch-cracks", "stats"]
+
+
+@dataclass
+class EndpointResult:
+    endpoint: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    rps: float
+    queries_per_request: float
+
+
+class QueryCounter:
+    """Counts the statements a set of engines execute, across request threads."""
+
+    def __init__(self, *engines):
+        self.count = 0
+        self._lock = threading.Lock()
+
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+    def reset(self) -> int:
+        with self._lock:
+            count, self.count = self.count, 0
+        return count
+
+
+class RequestFactory:
+    """Builds reproducible requests for each endpoint from the seeded data."""
+
+    def __init__(self, data, password: str, rng: random.Random):
+        self.data = data
+        self.password = password
+        self.rng = rng
+        self.registrations = itertools.count()
+
+    def build(self, endpoint: str):
+        rng, data = self.rng, self.data
+
+        if endpoint == "login":
+            return "POST", "/auth/login", {"email": rng.choice(data.emails), "password": self.password}
+        if endpoint == "register":
+            email = f"register{next(self.registrations)}@example.com"
+            return "POST", "/auth/register", {"first_name": "Load", "last_name": "Test", "email": email, "password": self.password}
+        if endpoint == "activities":
+            return "GET", f"/activities/{rng.choice(data.user_ids)}", None
+        if endpoint == "user-groups":
+            return "GET", f"/groups/user-groups/{rng.choice(data.user_ids)}", None
+        if endpoint == "fetch-cracks":
+            return "POST", "/cracks/fetch-cracks", {"group_id": rng.choice(data.group_ids)}
+        if endpoint == "stats":
+            return "GET", f"/stats/{rng.choice(data.user_ids)}", None
+
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def drive(client: httpx.AsyncClient, requests: list, concurrency: int):
+    """Send the requests with `concurrency` workers; returns (latencies in seconds, errors, wall time)."""
+    pending = iter(requests)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for method, path, body in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code == 200 and response.json().get("success", True) is not False
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+async def benchmark_endpoint(base_url: str, endpoint: str, factory: RequestFactory, counter: QueryCounter, args) -> EndpointResult:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await drive(client, [factory.build(endpoint) for _ in range(args.warmup)], args.concurrency)
+
+        requests = [factory.build(endpoint) for _ in range(args.requests)]
+        counter.reset()
+        latencies, errors, elapsed = await drive(client, requests, args.concurrency)
+        queries = counter.reset()
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+
+    return EndpointResult(
+        endpoint=endpoint,
+        requests=len(latencies_ms),
+        errors=errors,
+        p50_ms=round(percentile(latencies_ms, 50), 2),
+        p95_ms=round(percentile(latencies_ms, 95), 2),
+        p99_ms=round(percentile(latencies_ms, 99), 2),
+        mean_ms=round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else 0.0,
+        rps=round(len(latencies_ms) / elapsed, 1) if elapsed else 0.0,
+        queries_per_request=round(queries / len(latencies_ms), 2) if latencies_ms else 0.0,
+    )
+
+
+def print_results(results: list[EndpointResult], baseline: dict | None):
+    header = f"{'endpoint':<14}{'reqs':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for r in results:
+        print(f"{r.endpoint:<14}{r.requests:>7}{r.errors:>8}{r.p50_ms:>10}{r.p95_ms:>10}{r.p99_ms:>10}{r.rps:>10}{r.queries_per_request:>9}")
+
+        before = (baseline or {}).get(r.endpoint)
+        if before:
+            def change(key):
+                old, new = before[key], getattr(r, key)
+                return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+            print(f"{'  vs baseline':<29}{change('p50_ms'):>10}{change('p95_ms'):>10}{change('p99_ms'):>10}{change('rps'):>10}{change('queries_per_request'):>9}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the Cracktify API endpoints.")
+    parser.add_argument("--database-url", help="Empty scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help=f"Comma-separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--groups-per-user", type=int, default=3)
+    parser.add_argument("--cracks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request mix")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Print changes against results saved with --json")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+    # Point the app at the benchmark database before anything imports config
+    workdir = tempfile.mkdtemp(prefix="cracktify-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/bench.db"
+    os.environ["BLOB_STORE_ROOT"] = os.path.join(workdir, "blobs")
+
+    import uvicorn
+    from alembic import command
+    from alembic.config import Config as AlembicConfig
+    import main as server
+    from app.database.db import SessionLocal, async_engine, engine
+    from benchmarks.seed import BENCHMARK_PASSWORD, SeedScale, seed
+
+    rng = random.Random(args.seed)
+    scale = SeedScale(users=args.users, groups=args.groups, groups_per_user=args.groups_per_user, cracks=args.cracks)
+
+    # Tables come from the migrations, as in a real deployment
+    command.upgrade(AlembicConfig(os.path.join(SERVER_DIR, "alembic.ini")), "head")
+
+    print(f"Seeding {engine.url.render_as_string(hide_password=True)}: {scale}")
+    db = SessionLocal()
+    try:
+        data = seed(db, scale, rng)
+    finally:
+        db.close()
+
+    counter = QueryCounter(engine, async_engine)
+    factory = RequestFactory(data, BENCHMARK_PASSWORD, rng)
+
+    port = free_port()
+    uvicorn_server = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=uvicorn_server.run, daemon=True)
+    thread.start()
+    while not uvicorn_server.started:
+        time.sleep(0.05)
+
+    results = []
+    try:
+        for endpoint in endpoints:
+            print(f"Running {endpoint} ({args.requests} requests, concurrency {args.concurrency})")
+            results.append(asyncio.run(benchmark_endpoint(f"http://127.0.0.1:{port}", endpoint, factory, counter, args)))
+    finally:
+        uvicorn_server.should_exit = True
+        thread.join()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["endpoint"]: r for r in json.load(f)["results"]}
+
+    print()
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "database": engine.dialect.name,
+                "scale": asdict(scale),
+                "concurrency": args.concurrency,
+                "results": [asdict(r) for r in results],
+            }, f, indent=2)
+        print(f"\nSaved results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Synthetic users, groups and cracks for benchmark runs."""
+import io
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from PIL import Image
+from sqlalchemy import insert, select
+
+from app.models.crack import Crack
+from app.models.crack_group import CrackGroup
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.models.user import User
+from app.services.blob_service import store_blob, create_renditions
+from app.services.stats_service import rebuild_daily_stats
+from app.utils.password import hash_password
+
+BENCHMARK_PASSWORD = "benchmark-password"
+SEVERITIES = ["Severe", "Mild", "None"]
+INSERT_BATCH = 1000
+
+
+@dataclass
+class SeedScale:
+    users: int = 200
+    groups: int = 20
+    groups_per_user: int = 3
+    cracks: int = 5000
+
+
+@dataclass
+class SeededData:
+    user_ids: list
+    group_ids: list
+    emails: list
+
+
+def _sample_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (120, 120, 120)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+def _insert(db, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_BATCH):
+        db.execute(insert(model), rows[start:start + INSERT_BATCH])
+
+def seed(db, scale: SeedScale, rng: random.Random) -> SeededData:
+    """
+    Insert a reproducible data set (same seed, same rows) and return its IDs.
+    Expects an empty database.
+    """
+    now = datetime.now(timezone.utc)
+
+    # One hash shared by every user: seeding should not pay the PBKDF2 cost per row
+    password_hash = hash_password(BENCHMARK_PASSWORD)
+
+    data = _sample_image()
+    image = store_blob(data, db)
+    create_renditions(image, data, db)
+
+    emails = [f"bench{i}@example.com" for i in range(scale.users)]
+    _insert(db, User, [
+        {
+            "first_name": f"Bench{i}",
+            "last_name": "User",
+            "email": email,
+            "password_hash": password_hash,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i, email in enumerate(emails)
+    ])
+    user_ids = db.scalars(select(User.id).where(User.email.in_(emails)).order_by(User.id)).all()
+
+    _insert(db, Group, [
+        {"name": f"Bench Group {i:05d}", "pin": "1234", "admin_id": rng.choice(user_ids), "created_at": now}
+        for i in range(scale.groups)
+    ])
+    group_ids = db.scalars(select(Group.id).where(Group.name.like("Bench Group %")).order_by(Group.id)).all()
+
+    memberships = {}
+    for user_id in user_ids:
+        for group_id in rng.sample(group_ids, min(scale.groups_per_user, len(group_ids))):
+            memberships[(group_id, user_id)] = {"group_id": group_id, "user_id": user_id, "joined_at": now}
+    _insert(db, GroupMember, list(memberships.values()))
+
+    members_of = {}
+    for group_id, user_id in memberships:
+        members_of.setdefault(user_id, []).append(group_id)
+
+    first_crack_id = (db.scalar(select(Crack.id).order_by(Crack.id.desc()).limit(1)) or 0) + 1
+    cracks, links = [], []
+    for i in range(scale.cracks):
+        user_id = rng.choice(user_ids)
+        cracks.append({
+            "user_id": user_id,
+            "image_key": image.key,
+            "probability": round(rng.random(), 3),
+            "severity": rng.choice(SEVERITIES),
+            "detected_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+        })
+        for group_id in members_of.get(user_id, []):
+            links.append({"crack_id": first_crack_id + i, "group_id": group_id, "added_at": now})
+
+    _insert(db, Crack, [dict(row, id=first_crack_id + i) for i, row in enumerate(cracks)])
+    _insert(db, CrackGroup, links)
+    rebuild_daily_stats(db)  # Rows were inserted directly, not through add_crack_service
+    db.commit()
+
+    return SeededData(user_ids=list(user_ids), group_ids=list(group_ids), emails=emails)
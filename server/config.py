@@ -12,16 +12,112 @@ class Config:
     DB_NAME = os.getenv("DB_NAME")
     DB_PORT = int(os.getenv("DB_PORT", 3306))
 
-    # SQLAlchemy connection string
-    SQLALCHEMY_DATABASE_URI = (
+    # SQLAlchemy connection string (DATABASE_URL overrides the DB_* settings, e.g. for benchmarks)
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL") or (
         f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
 
+    # Async driver URL for request handlers; derived from the URI above when unset
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+    # Engine profile: "development", "production" or "test". Pool settings below override the profile.
+    APP_ENV = os.getenv("APP_ENV", "development")
+    SQLALCHEMY_ECHO = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+    DB_POOL_SIZE = os.getenv("DB_POOL_SIZE")
+    DB_MAX_OVERFLOW = os.getenv("DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT = os.getenv("DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE = os.getenv("DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING")
+
     # Email settings
     EMAIL_SENDER = os.getenv("EMAIL_SENDER", "")
     EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "")
+    EMAIL_DEFAULT_LOCALE = os.getenv("EMAIL_DEFAULT_LOCALE", "en")  # Must match a file in app/templates/locales
+    EMAIL_SMTP_HOST = os.getenv("EMAIL_SMTP_HOST", "smtp.gmail.com")
+    EMAIL_SMTP_PORT = int(os.getenv("EMAIL_SMTP_PORT", 587))
+    EMAIL_SMTP_STARTTLS = os.getenv("EMAIL_SMTP_STARTTLS", "true").lower() == "true"
+    EMAIL_SMTP_TIMEOUT = int(os.getenv("EMAIL_SMTP_TIMEOUT", 30))
+    EMAIL_SMTP_IDLE_SECONDS = int(os.getenv("EMAIL_SMTP_IDLE_SECONDS", 60))  # Close the reused connection after this long unused
+
+    # Email outbox (messages are queued in the database and sent by a background worker)
+    EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "true").lower() == "true"  # Run the sender in this process
+    EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 5))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 20))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    EMAIL_OUTBOX_RETRY_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_SECONDS", 30))  # Doubles after each failed attempt
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 120))
+    EMAIL_RATE_PER_MINUTE = int(os.getenv("EMAIL_RATE_PER_MINUTE", 60))
 
     # JWT Settings
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "secretjwtkey")
 
-    DEFAULT_BASE64_AVATAR = os.getenv("DEFAULT_BASE64_AVATAR", "")
\ No newline at end of file
+    # Password hashing (PBKDF2-SHA256). Changing the cost rehashes each user on their next login.
+    PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 100000))
+    PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process")  # "process" or "thread"
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+    # OTP storage ("database", "memory" or "redis") and the expired-OTP sweeper
+    OTP_STORE_BACKEND = os.getenv("OTP_STORE_BACKEND", "database")
+    OTP_SWEEP_ENABLED = os.getenv("OTP_SWEEP_ENABLED", "true").lower() == "true"  # Run the sweeper in this process
+    OTP_SWEEP_INTERVAL_SECONDS = float(os.getenv("OTP_SWEEP_INTERVAL_SECONDS", 300))
+    OTP_SWEEP_BATCH_SIZE = int(os.getenv("OTP_SWEEP_BATCH_SIZE", 500))
+    OTP_REDIS_PREFIX = os.getenv("OTP_REDIS_PREFIX", "otp:")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Response cache for group info, group lists and activity feeds ("memory", "redis" or "none")
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))  # Memory backend only
+    CACHE_REDIS_PREFIX = os.getenv("CACHE_REDIS_PREFIX", "cache:")
+
+    # Delta sync (`since=`): tombstones older than the retention make older tokens fall back to a full response
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", 30))
+    SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", 5))
+    SYNC_SWEEP_ENABLED = os.getenv("SYNC_SWEEP_ENABLED", "true").lower() == "true"  # Prune old tombstones in this process
+    SYNC_SWEEP_INTERVAL_SECONDS = float(os.getenv("SYNC_SWEEP_INTERVAL_SECONDS", 3600))
+    SYNC_SWEEP_BATCH_SIZE = int(os.getenv("SYNC_SWEEP_BATCH_SIZE", 1000))
+
+    # Inspection reports, built by a background worker and kept in the blob store
+    REPORT_BUILDER_ENABLED = os.getenv("REPORT_BUILDER_ENABLED", "true").lower() == "true"  # Build reports in this process
+    REPORT_POLL_SECONDS = float(os.getenv("REPORT_POLL_SECONDS", 30))
+    REPORT_LEASE_SECONDS = int(os.getenv("REPORT_LEASE_SECONDS", 300))  # A report held longer than this is rebuilt
+    REPORT_MAX_ATTEMPTS = int(os.getenv("REPORT_MAX_ATTEMPTS", 3))
+    REPORT_THUMBNAIL_LIMIT = int(os.getenv("REPORT_THUMBNAIL_LIMIT", 48))  # Newest cracks shown as thumbnails
+    REPORT_FETCH_WORKERS = int(os.getenv("REPORT_FETCH_WORKERS", 8))  # Parallel thumbnail reads from the blob store
+
+    # Server-side crack classification with the client's TFLite model (off by default)
+    INFERENCE_ENABLED = os.getenv("INFERENCE_ENABLED", "false").lower() == "true"  # Load the model in this process
+    INFERENCE_MODEL_PATH = os.getenv("INFERENCE_MODEL_PATH", os.path.join(os.path.dirname(__file__), "..", "askcrack-project", "src", "assets", "crackAI.tflite"))
+    INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", 2))  # Interpreter threads per worker process
+    INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 16))
+    INFERENCE_BATCH_WINDOW_MS = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", 10))  # How long the first request waits for company
+    INFERENCE_MAX_IMAGES_PER_REQUEST = int(os.getenv("INFERENCE_MAX_IMAGES_PER_REQUEST", 32))
+    INFERENCE_SEVERE_THRESHOLD = float(os.getenv("INFERENCE_SEVERE_THRESHOLD", 0.7))
+    INFERENCE_MILD_THRESHOLD = float(os.getenv("INFERENCE_MILD_THRESHOLD", 0.4))
+
+    # Bulk import: cracks accepted per POST /cracks/bulk-add request
+    BULK_ADD_MAX_CRACKS = int(os.getenv("BULK_ADD_MAX_CRACKS", 50))
+
+    # Largest crack annotation record (outlines and boxes, as JSON) kept per crack
+    ANNOTATIONS_MAX_BYTES = int(os.getenv("ANNOTATIONS_MAX_BYTES", 65536))
+
+    DEFAULT_BASE64_AVATAR = os.getenv("DEFAULT_BASE64_AVATAR", "")
+
+    # Blob storage ("local" or "s3")
+    BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local")
+    BLOB_STORE_ROOT = os.getenv("BLOB_STORE_ROOT", os.path.join(os.path.dirname(__file__), "storage", "blobs"))
+    BLOB_CACHE_MAX_AGE = int(os.getenv("BLOB_CACHE_MAX_AGE", 31536000))
+
+    # Image renditions (longest side in pixels)
+    RENDITION_SMALL_SIZE = int(os.getenv("RENDITION_SMALL_SIZE", 160))
+    RENDITION_MEDIUM_SIZE = int(os.getenv("RENDITION_MEDIUM_SIZE", 640))
+    RENDITION_JPEG_QUALITY = int(os.getenv("RENDITION_JPEG_QUALITY", 80))
+
+    # S3-compatible storage (only used when BLOB_STORE_BACKEND="s3")
+    S3_BUCKET = os.getenv("S3_BUCKET", "")
+    S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+    S3_REGION = os.getenv("S3_REGION") or None
+    S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID") or None
+    S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY") or None
+    S3_PREFIX = os.getenv("S3_PREFIX", "blobs/")
\ No newline at end of file
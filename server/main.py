@@ -1,11 +1,43 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.db import engine, Base
-from app.routes import otp_routes, auth_routes, profile_routes, group_routes, activity_routes, crack_routes
+from app.database.db import async_engine
+from app.routes import otp_routes, auth_routes, profile_routes, group_routes, activity_routes, crack_routes, blob_routes, metrics_routes, report_routes, stats_routes, inference_routes
+
+from app.utils.inference import start_inference, stop_inference
+from app.utils.password import shutdown_password_executor
+from app.workers.email_sender import start_email_sender, stop_email_sender
+from app.workers.otp_sweeper import start_otp_sweeper, stop_otp_sweeper
+from app.workers.report_builder import start_report_builder, stop_report_builder
+from app.workers.tombstone_sweeper import start_tombstone_sweeper, stop_tombstone_sweeper
+from config import Config
 
 import app.models 
 
-app = FastAPI(title="Cracktify API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if Config.EMAIL_OUTBOX_ENABLED:
+        start_email_sender()
+    if Config.OTP_SWEEP_ENABLED:
+        start_otp_sweeper()
+    if Config.SYNC_SWEEP_ENABLED:
+        start_tombstone_sweeper()
+    if Config.REPORT_BUILDER_ENABLED:
+        start_report_builder()
+    if Config.INFERENCE_ENABLED:
+        start_inference()
+
+    yield
+
+    await stop_inference()
+    stop_report_builder()
+    stop_tombstone_sweeper()
+    stop_otp_sweeper()
+    stop_email_sender()
+    shutdown_password_executor()
+    await async_engine.dispose()
+
+app = FastAPI(title="Cracktify API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,12 +47,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
 app.include_router(otp_routes.router, prefix="/otp", tags=["OTP"])
 app.include_router(auth_routes.router, prefix="/auth", tags=["Auth"])
 app.include_router(profile_routes.router, prefix="/profile", tags=["Profile"])
 app.include_router(group_routes.router, prefix="/groups", tags=["Groups"])
 app.include_router(activity_routes.router, prefix="/activities", tags=["Activities"])
-app.include_router(crack_routes.router, prefix="/cracks", tags=["Cracks"])
\ No newline at end of file
+app.include_router(crack_routes.router, prefix="/cracks", tags=["Cracks"])
+app.include_router(blob_routes.router, prefix="/blobs", tags=["Blobs"])
+app.include_router(stats_routes.router, prefix="/stats", tags=["Stats"])
+app.include_router(report_routes.router, prefix="/reports", tags=["Reports"])
+app.include_router(inference_routes.router, prefix="/inference", tags=["Inference"])
+app.include_router(metrics_routes.router, prefix="/metrics", tags=["Metrics"])
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Check that the group listing services issue a fixed number of queries,
+however many groups and members there are.
+
+Run from the server directory; it builds its own scratch SQLite database:
+
+    python -m scripts.check_query_counts
+
+Exits with status 1 if any service's query count grows with the data.
+"""
+import asyncio
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models
+from app.database.db import Base
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.models.user import User
+from config import Config
+from app.services.group_service import (
+    fetch_group_info_service,
+    fetch_groups_service,
+    fetch_user_groups_service,
+)
+
+
+class QueryCounter:
+    """Counts the statements an engine executes."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def seed(db, groups: int, members_per_group: int):
+    """Create users and groups; user 1 is in half of the groups."""
+    now = datetime.now(timezone.utc)
+    users = [
+        User(first_name=f"User{i}", last_name="Test", email=f"user{i}@example.com", password_hash="x", created_at=now)
+        for i in range(members_per_group + 1)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    for i in range(groups):
+        group = Group(name=f"Group {i}", pin="1234", admin_id=users[0].id, created_at=now)
+        db.add(group)
+        db.flush()
+
+        members = users[1:] if i % 2 else users[:members_per_group]
+        db.add_all(GroupMember(group_id=group.id, user_id=u.id, joined_at=now) for u in members)
+
+    db.commit()
+    return users[0].id
+
+
+async def count_queries(groups: int, members_per_group: int) -> dict:
+    path = f"{tempfile.mkdtemp()}/query_counts.db"
+
+    # Seed with a sync session; the services run on an async one, as in the app
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as seed_db:
+        user_id = seed(seed_db, groups, members_per_group)
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    counter = QueryCounter(async_engine.sync_engine)
+    counts = {}
+
+    async with async_sessionmaker(bind=async_engine)() as db:
+        for name, call in (
+            ("fetch_user_groups_service", lambda: fetch_user_groups_service(user_id, db)),
+            ("fetch_groups_service", lambda: fetch_groups_service(user_id, db)),
+            ("fetch_group_info_service", lambda: fetch_group_info_service(1, db)),
+        ):
+            db.expunge_all()  # Start cold, as a fresh request session would
+            counter.count = 0
+            await call()
+            counts[name] = counter.count
+
+    await async_engine.dispose()
+    return counts
+
+
+def main():
+    # Measure the queries themselves, not response cache hits
+    Config.CACHE_BACKEND = "none"
+
+    small = asyncio.run(count_queries(groups=2, members_per_group=2))
+    large = asyncio.run(count_queries(groups=40, members_per_group=15))
+    failures = 0
+
+    for name in small:
+        status = "ok  " if large[name] == small[name] else "FAIL"
+        failures += status == "FAIL"
+        print(f"{status}  {name}: {small[name]} queries (small), {large[name]} queries (large)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
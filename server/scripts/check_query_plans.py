@@ -0,0 +1,156 @@
+"""
+Check that the hot crack/group/OTP queries are served by indexes.
+
+Run from the server directory against the configured database:
+
+    python -m scripts.check_query_plans
+
+or against a scratch SQLite database built from the models:
+
+    python -m scripts.check_query_plans --database-url sqlite:///plan_check.db --create-schema
+
+Exits with status 1 if any checked table would be read with a full scan.
+"""
+import argparse
+import sys
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, select, text
+
+import app.models
+from app.database.db import Base
+from app.models.crack import Crack
+from app.models.crack_daily_stat import CrackDailyStat
+from app.models.crack_group import CrackGroup
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.models.otp import OTP
+from config import Config
+
+
+def hot_queries():
+    """(name, statement, tables that must be read through an index)"""
+    member_groups = select(GroupMember.group_id).where(GroupMember.user_id == 1)
+
+    return [
+        (
+            "fetch_cracks page",
+            select(Crack.id, Crack.detected_at)
+            .join(CrackGroup, CrackGroup.crack_id == Crack.id)
+            .where(CrackGroup.group_id == 1)
+            .order_by(Crack.detected_at.desc(), Crack.id.desc())
+            .limit(31),
+            ["crack_groups"],
+        ),
+        (
+            "recent activity",
+            select(Crack.id)
+            .join(CrackGroup, CrackGroup.crack_id == Crack.id)
+            .where(CrackGroup.group_id.in_(member_groups))
+            .order_by(Crack.detected_at.desc())
+            .limit(20),
+            ["crack_groups", "group_members"],
+        ),
+        (
+            "user groups",
+            select(Group.id, Group.name)
+            .join(GroupMember, GroupMember.group_id == Group.id)
+            .where(GroupMember.user_id == 1),
+            ["group_members"],
+        ),
+        (
+            "group members",
+            select(GroupMember.user_id).where(GroupMember.group_id == 1),
+            ["group_members"],
+        ),
+        (
+            "membership check",
+            select(GroupMember.id).where(GroupMember.user_id == 1, GroupMember.group_id == 1),
+            ["group_members"],
+        ),
+        (
+            "crack link lookup",
+            select(CrackGroup.id).where(CrackGroup.crack_id == 1, CrackGroup.group_id == 1),
+            ["crack_groups"],
+        ),
+        (
+            "cracks by uploader",
+            select(Crack.id).where(Crack.user_id == 1),
+            ["cracks"],
+        ),
+        (
+            "daily stats range",
+            select(CrackDailyStat.day, CrackDailyStat.crack_count)
+            .where(CrackDailyStat.scope == "group", CrackDailyStat.scope_id == 1, CrackDailyStat.day >= date(2026, 1, 1))
+            .order_by(CrackDailyStat.day),
+            ["crack_daily_stats"],
+        ),
+        (
+            "latest OTP",
+            select(OTP.id).where(OTP.email == "user@example.com").order_by(OTP.created_at.desc()).limit(1),
+            ["otps"],
+        ),
+        (
+            "expired OTP sweep",
+            select(OTP.id).where(OTP.expires_at < datetime(2000, 1, 1)).limit(500),
+            ["otps"],
+        ),
+    ]
+
+
+def full_scans_sqlite(conn, sql: str, tables: list[str]) -> list[str]:
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    details = [row[-1] for row in rows]
+
+    return [
+        detail for detail in details
+        if detail.startswith("SCAN ")
+        and detail.split()[1] in tables
+        and "USING" not in detail
+    ]
+
+
+def full_scans_mysql(conn, sql: str, tables: list[str]) -> list[str]:
+    rows = conn.execute(text(f"EXPLAIN {sql}")).mappings().fetchall()
+
+    # MySQL may still pick a scan on tiny tables; only fail when no index is even usable
+    return [
+        f"{row['table']}: type={row['type']} possible_keys={row['possible_keys']}"
+        for row in rows
+        if row["table"] in tables and row["type"] == "ALL" and not row["possible_keys"]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use indexes.")
+    parser.add_argument("--database-url", default=Config.SQLALCHEMY_DATABASE_URI)
+    parser.add_argument("--create-schema", action="store_true", help="Create tables from the models first")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+
+    check = full_scans_mysql if engine.dialect.name == "mysql" else full_scans_sqlite
+    failures = 0
+
+    with engine.connect() as conn:
+        for name, statement, tables in hot_queries():
+            sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+            scans = check(conn, sql, tables)
+
+            if scans:
+                failures += 1
+                print(f"FAIL  {name}")
+                for scan in scans:
+                    print(f"        {scan}")
+            else:
+                print(f"ok    {name}")
+
+    if failures:
+        print(f"{failures} hot query(s) would scan a full table")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
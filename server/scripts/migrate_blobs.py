@@ -0,0 +1,72 @@
+"""
+Move legacy base64 images out of the database and into the blob store.
+
+Run from the server directory, after `alembic upgrade head`:
+
+    python -m scripts.migrate_blobs --batch-size 200
+
+Each batch is committed on its own, so the tool can be stopped and re-run at
+any time; rows that already point at a blob are skipped.
+"""
+import argparse
+import time
+
+import app.models
+from app.database.db import SessionLocal
+from app.models.crack import Crack
+from app.models.user import User
+from app.services.blob_service import store_base64_blob, store_image_base64
+
+
+def migrate_rows(model, base64_column, key_column, store, batch_size: int, limit: int | None):
+    """Move one model's base64 column into the blob store, batch by batch."""
+    moved = 0
+    failed_ids = set()
+
+    while limit is None or moved < limit:
+        db = SessionLocal()
+        try:
+            size = batch_size if limit is None else min(batch_size, limit - moved)
+            query = db.query(model).filter(base64_column.isnot(None), key_column.is_(None))
+            if failed_ids:
+                query = query.filter(~model.id.in_(failed_ids))
+
+            rows = query.order_by(model.id).limit(size).all()
+            if not rows:
+                break
+
+            for row in rows:
+                blob = store(getattr(row, base64_column.key), db)
+                if not blob:
+                    failed_ids.add(row.id)
+                    print(f"Skipping {model.__tablename__}.id={row.id}: invalid base64 data")
+                    continue
+
+                setattr(row, key_column.key, blob.key)
+                setattr(row, base64_column.key, None)
+                moved += 1
+
+            db.commit()
+            print(f"{model.__tablename__}: moved {moved} row(s) so far")
+        finally:
+            db.close()
+
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move base64 images from the database into the blob store.")
+    parser.add_argument("--batch-size", type=int, default=200, help="Rows per transaction (default: 200)")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many rows per table")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Crack images also get their small/medium renditions; avatars are already small
+    cracks = migrate_rows(Crack, Crack.image_base64, Crack.image_key, store_image_base64, args.batch_size, args.limit)
+    users = migrate_rows(User, User.avatar_base64, User.avatar_key, store_base64_blob, args.batch_size, args.limit)
+
+    print(f"Done: {cracks} crack image(s) and {users} avatar(s) moved in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
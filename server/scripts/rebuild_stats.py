@@ -0,0 +1,33 @@
+"""
+Recompute the daily crack statistics (crack_daily_stats) from the cracks table.
+
+The rollup is kept up to date as cracks are added and removed; run this
+after importing or editing cracks directly in the database. Run from the
+server directory:
+
+    python -m scripts.rebuild_stats
+"""
+import time
+
+import app.models
+from app.database.db import SessionLocal
+from app.models.crack_daily_stat import CrackDailyStat
+from app.services.stats_service import rebuild_daily_stats
+
+
+def main():
+    started = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        rebuild_daily_stats(db)
+        db.commit()
+        rows = db.query(CrackDailyStat).count()
+    finally:
+        db.close()
+
+    print(f"Rebuilt {rows} daily statistics rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Run the background workers outside the API processes.
+
+Use this when the API runs with EMAIL_OUTBOX_ENABLED=false,
+OTP_SWEEP_ENABLED=false, SYNC_SWEEP_ENABLED=false and
+REPORT_BUILDER_ENABLED=false (for example with many uvicorn workers). Run from the server directory:
+
+    python -m scripts.run_workers
+"""
+import signal
+import threading
+
+import app.models
+from app.workers.email_sender import start_email_sender, stop_email_sender
+from app.workers.otp_sweeper import start_otp_sweeper, stop_otp_sweeper
+from app.workers.report_builder import start_report_builder, stop_report_builder
+from app.workers.tombstone_sweeper import start_tombstone_sweeper, stop_tombstone_sweeper
+
+
+def main():
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    start_email_sender()
+    start_otp_sweeper()
+    start_tombstone_sweeper()
+    start_report_builder()
+    print("Workers running; press Ctrl+C to stop.")
+
+    stopped.wait()
+    stop_report_builder()
+    stop_tombstone_sweeper()
+    stop_otp_sweeper()
+    stop_email_sender()
+
+
+if __name__ == "__main__":
+    main()